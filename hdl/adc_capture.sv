@@ -0,0 +1,129 @@
+`default_nettype none
+
+// Synchronized capture from NUM_CHANNELS SPI ADCs sharing one SCLK and one CS.
+//
+// A trigger starts one conversion on every ADC at once; the SCLK/CS timing is spi_con's,
+// so each channel's bit is shifted in on the clock edge that raises SCLK. When the last
+// bit is in, the kept slice of every channel's word is written to a FIFO as one beat,
+// together with the cycle count at which CS fell (the ADCs' sampling instant). The FIFO
+// lets downstream stages stall with ready_in; a conversion finishing on a full FIFO is
+// dropped and flagged on overflow_out.
+module adc_capture #(
+    parameter integer NUM_CHANNELS = 2,         // ADCs sharing SCLK and CS
+    parameter integer DATA_WIDTH = 16,          // SCLK periods per conversion
+    parameter integer DATA_CLK_PERIOD = 5,      // Clock cycles per SCLK period, rounded down to even (2 is the fastest)
+    parameter integer SAMPLE_MSB = 11,          // Bits of each ADC word kept in the beat
+    parameter integer SAMPLE_LSB = 2,
+    parameter integer TIMESTAMP_WIDTH = 32,     // Width of the cycle counter timestamping each beat
+    parameter integer FIFO_DEPTH = 16           // Beats held while ready_in is low, a power of two
+) (
+    input wire clk_in,                                  // System clock
+    input wire rst_in,                                  // Synchronous reset
+    input wire trigger_in,                              // Start a conversion, ignored while one runs
+    input wire [NUM_CHANNELS-1:0] cipo_in,              // Serial data of each ADC
+    output logic sclk_out,                              // Shared serial clock
+    output logic cs_out,                                // Shared chip select, active low
+    output logic [NUM_CHANNELS*(SAMPLE_MSB-SAMPLE_LSB+1)-1:0] samples_out,  // Channel i in [i*SAMPLE_WIDTH +: SAMPLE_WIDTH]
+    output logic [TIMESTAMP_WIDTH-1:0] timestamp_out,   // Cycles since reset when CS fell for this beat
+    output logic valid_out,                             // A beat is on samples_out / timestamp_out
+    input wire ready_in,                                // Beat taken on a cycle with valid_out high
+    output logic overflow_out                           // One cycle per beat dropped on a full FIFO
+);
+
+    localparam integer PERIOD = DATA_CLK_PERIOD - DATA_CLK_PERIOD % 2;
+    localparam integer PERIOD_WIDTH = $clog2(PERIOD) + 1;
+    localparam integer BIT_COUNT_WIDTH = $clog2(DATA_WIDTH) + 1;
+    localparam logic [PERIOD_WIDTH-1:0] RISE_COUNT = PERIOD_WIDTH'(PERIOD / 2 - 1);
+    localparam logic [PERIOD_WIDTH-1:0] FALL_COUNT = PERIOD_WIDTH'(PERIOD - 1);
+    localparam logic [BIT_COUNT_WIDTH-1:0] LAST_BIT = BIT_COUNT_WIDTH'(DATA_WIDTH);
+    localparam integer SAMPLE_WIDTH = SAMPLE_MSB - SAMPLE_LSB + 1;
+    localparam integer BEAT_WIDTH = TIMESTAMP_WIDTH + NUM_CHANNELS * SAMPLE_WIDTH;
+    localparam integer FIFO_INDEX_WIDTH = $clog2(FIFO_DEPTH);
+
+    // Shared SCLK/CS timing generator and one shift register per ADC
+    logic [PERIOD_WIDTH-1:0] period_count;
+    logic [BIT_COUNT_WIDTH-1:0] bit_count;
+    logic [DATA_WIDTH-1:0] shift_data [NUM_CHANNELS-1:0];
+    logic [TIMESTAMP_WIDTH-1:0] cycle_count;
+    logic [TIMESTAMP_WIDTH-1:0] conversion_start;
+    logic conversion_done;                      // every shift register holds a complete word
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            sclk_out <= 0;
+            cs_out <= 1;
+            period_count <= 0;
+            bit_count <= 0;
+            cycle_count <= 0;
+            conversion_start <= 0;
+            conversion_done <= 0;
+        end else begin
+            cycle_count <= cycle_count + 1;
+            conversion_done <= 0;
+
+            if (trigger_in && cs_out) begin
+                cs_out <= 0;
+                period_count <= 0;
+                bit_count <= 0;
+                conversion_start <= cycle_count;
+            end else if (!cs_out) begin
+                period_count <= (period_count == FALL_COUNT) ? 0 : period_count + 1;
+
+                // on rising edge
+                if (period_count == RISE_COUNT) begin
+                    for (int i = 0; i < NUM_CHANNELS; i++) begin
+                        shift_data[i] <= {shift_data[i][DATA_WIDTH-2:0], cipo_in[i]};
+                    end
+                    sclk_out <= 1;
+                    bit_count <= bit_count + 1;
+
+                // on falling edge
+                end else if (period_count == FALL_COUNT) begin
+                    sclk_out <= 0;
+                    if (bit_count == LAST_BIT) begin
+                        cs_out <= 1;
+                        conversion_done <= 1;
+                    end
+                end
+            end
+        end
+    end
+
+    // Sample FIFO: the extra pointer bit tells a full FIFO from an empty one
+    logic [BEAT_WIDTH-1:0] fifo [FIFO_DEPTH-1:0];
+    logic [FIFO_INDEX_WIDTH:0] write_pointer;
+    logic [FIFO_INDEX_WIDTH:0] read_pointer;
+    logic [NUM_CHANNELS*SAMPLE_WIDTH-1:0] beat_samples;
+    logic fifo_full;
+    logic fifo_read;
+    logic fifo_write;
+
+    always_comb begin
+        for (int i = 0; i < NUM_CHANNELS; i++) begin
+            beat_samples[i*SAMPLE_WIDTH +: SAMPLE_WIDTH] = shift_data[i][SAMPLE_MSB:SAMPLE_LSB];
+        end
+        fifo_full = write_pointer == {~read_pointer[FIFO_INDEX_WIDTH], read_pointer[FIFO_INDEX_WIDTH-1:0]};
+        valid_out = write_pointer != read_pointer;
+        fifo_read = valid_out && ready_in;
+        fifo_write = conversion_done && (!fifo_full || fifo_read);   // a full FIFO takes a beat while one leaves
+        {timestamp_out, samples_out} = fifo[read_pointer[FIFO_INDEX_WIDTH-1:0]];
+    end
+
+    always_ff @(posedge clk_in) begin
+        if (fifo_write) begin
+            fifo[write_pointer[FIFO_INDEX_WIDTH-1:0]] <= {conversion_start, beat_samples};
+        end
+        if (rst_in) begin
+            write_pointer <= 0;
+            read_pointer <= 0;
+            overflow_out <= 0;
+        end else begin
+            write_pointer <= write_pointer + fifo_write;
+            read_pointer <= read_pointer + fifo_read;
+            overflow_out <= conversion_done && !fifo_write;
+        end
+    end
+
+endmodule
+
+`default_nettype wire
@@ -0,0 +1,167 @@
+`default_nettype none
+
+// Bank of time-multiplexed Goertzel resonators covering only the Doppler search
+// band. Drop-in alternative to fft_wrapper: its ports plus busy_out/overflow_out,
+// same one frame per reset. Each incoming sample is pushed through every bin
+// sequentially (one bin per clock), so samples must be spaced at least
+// NUM_BINS + 1 clocks apart (top_level samples every 100 clocks); a ce while
+// busy_out is high is dropped and flagged on overflow_out. One multiplier serves
+// the resonators and, three clocks per bin, the power search after the frame.
+module goertzel_bank #(
+    parameter SAMPLE_RATE = 1000000,    // Sampling rate in Hz
+    parameter FFT_SIZE = 2048,          // Number of samples per frame
+    parameter BIN_LOW = 41,             // First bin of the search band (fft_wrapper: > 40)
+    parameter BIN_HIGH = 119,           // Last bin of the search band (fft_wrapper: < 120)
+    parameter COEFF_FRAC_BITS = 16,     // Fractional bits of the 2cos(w) coefficients
+    parameter STATE_WIDTH = 30          // Resonator state width: |s| <= FFT_SIZE * 2^15 * (2/pi) / sin(2*pi*BIN_LOW/FFT_SIZE) < 2^29
+) (
+    input wire                   clk_in,            // System clock
+    input wire                   rst_in,            // Synchronous rst_in
+    input wire                   ce,                // Clock enable for sample input
+    input wire [31:0]            sample_in,         // Packed real and imaginary input (imaginary ignored)
+    output logic [31:0]          peak_frequency,    // Peak frequency in Hz
+    output logic                 peak_valid,        // Valid signal for peak frequency
+    output logic                 busy_out,          // Bins are being updated or searched, ce is ignored
+    output logic                 overflow_out       // One cycle per sample dropped by a ce while busy_out
+);
+
+    localparam NUM_BINS = BIN_HIGH - BIN_LOW + 1;
+    localparam BIN_WIDTH = $clog2(NUM_BINS);
+    localparam FRAME_WIDTH = $clog2(FFT_SIZE);
+    localparam COEFF_WIDTH = COEFF_FRAC_BITS + 3;   // 2cos(w) lies in (-2, 2]
+    localparam OPERAND_WIDTH = STATE_WIDTH + 1;     // holds 2cos(w) * s1 and s2 - 2cos(w) * s1
+    localparam POWER_WIDTH = 2 * OPERAND_WIDTH;
+    localparam real PI = 3.14159265358979323846;
+
+    // Coefficient ROM: round(2cos(2*pi*k/FFT_SIZE) * 2^COEFF_FRAC_BITS) per bin
+    logic signed [COEFF_WIDTH-1:0] coeff_rom [NUM_BINS-1:0];
+    genvar k;
+    generate
+        for (k = 0; k < NUM_BINS; k++) begin : GEN_COEFF
+            localparam integer COEFF = $rtoi($floor(
+                2.0 * $cos(2.0 * PI * (BIN_LOW + k) / FFT_SIZE) * (1 << COEFF_FRAC_BITS) + 0.5));
+            assign coeff_rom[k] = COEFF;
+        end
+    endgenerate
+
+    // Resonator state s[n-1] and s[n-2] for every bin
+    logic signed [STATE_WIDTH-1:0] s1_mem [NUM_BINS-1:0];
+    logic signed [STATE_WIDTH-1:0] s2_mem [NUM_BINS-1:0];
+
+    typedef enum {WAITING, UPDATING, SEARCHING, DONE} state_t;
+    state_t state;
+
+    logic [FRAME_WIDTH-1:0]        sample_idx;      // Sample of the frame being processed
+    logic [BIN_WIDTH-1:0]          bin_idx;         // Bin being updated / searched
+    logic [1:0]                    search_phase;    // Multiplier pass of the bin being searched
+    logic signed [15:0]            sample_reg;      // Latched real part of the current sample
+    logic [FRAME_WIDTH-1:0]        max_index;       // FFT bin index of the peak
+    logic signed [POWER_WIDTH-1:0] max_power;       // Power of the peak
+    logic signed [OPERAND_WIDTH-1:0] search_feedback; // 2cos(w) * s1 of the bin being searched
+    logic signed [POWER_WIDTH-1:0] s1_squared;      // s1 * s1 of the bin being searched
+
+    // One resonator step: s[n] = x[n] + 2cos(w) * s[n-1] - s[n-2]
+    // State is never cleared; the first sample of a frame reads zeros instead.
+    logic signed [COEFF_WIDTH-1:0]             coeff;
+    logic signed [STATE_WIDTH-1:0]             s1_prev, s2_prev;
+    logic signed [OPERAND_WIDTH-1:0]           mult_a, mult_b;
+    logic signed [POWER_WIDTH-1:0]             product;
+    logic signed [STATE_WIDTH+COEFF_WIDTH-1:0] feedback;
+    logic signed [STATE_WIDTH-1:0]             s_next;
+    logic signed [POWER_WIDTH-1:0]             power;
+
+    always_comb begin
+        coeff = coeff_rom[bin_idx];
+        s1_prev = (sample_idx == 0 && state == UPDATING)? 0: s1_mem[bin_idx];
+        s2_prev = (sample_idx == 0 && state == UPDATING)? 0: s2_mem[bin_idx];
+
+        // The one multiplier: 2cos(w) * s1 while updating and in the first pass of a
+        // search, then s1 * s1 and s2 * (s2 - 2cos(w) * s1)
+        if (state == SEARCHING && search_phase == 1) begin
+            mult_a = s1_prev;
+            mult_b = s1_prev;
+        end else if (state == SEARCHING && search_phase == 2) begin
+            mult_a = s2_prev;
+            mult_b = s2_prev - search_feedback;
+        end else begin
+            mult_a = s1_prev;
+            mult_b = coeff;
+        end
+        product = mult_a * mult_b;
+        feedback = product >>> COEFF_FRAC_BITS;
+        s_next = sample_reg + feedback - s2_prev;
+
+        // |X[k]|^2 = s1^2 + s2^2 - 2cos(w) * s1 * s2 = s1^2 + s2 * (s2 - 2cos(w) * s1)
+        power = s1_squared + product;
+        peak_frequency = (max_index * SAMPLE_RATE) >> FRAME_WIDTH;
+        busy_out = state == UPDATING || state == SEARCHING;
+    end
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            state <= WAITING;
+            sample_idx <= 0;
+            bin_idx <= 0;
+            search_phase <= 0;
+            sample_reg <= 0;
+            max_index <= 0;
+            max_power <= 0;
+            search_feedback <= 0;
+            s1_squared <= 0;
+            peak_valid <= 0;
+        end
+        else if (state == WAITING) begin
+            if (ce) begin
+                sample_reg <= $signed(sample_in[31:16]);
+                bin_idx <= 0;
+                state <= UPDATING;
+            end
+        end
+        else if (state == UPDATING) begin
+            s1_mem[bin_idx] <= s_next;
+            s2_mem[bin_idx] <= s1_prev;
+            if (bin_idx == NUM_BINS - 1) begin
+                bin_idx <= 0;
+                if (sample_idx == FFT_SIZE - 1) begin
+                    state <= SEARCHING;
+                end else begin
+                    sample_idx <= sample_idx + 1;
+                    state <= WAITING;
+                end
+            end else begin
+                bin_idx <= bin_idx + 1;
+            end
+        end
+        else if (state == SEARCHING) begin
+            if (search_phase == 0) begin
+                search_feedback <= feedback;
+                search_phase <= 1;
+            end else if (search_phase == 1) begin
+                s1_squared <= product;
+                search_phase <= 2;
+            end else begin
+                search_phase <= 0;
+                if (power > max_power) begin
+                    max_power <= power;
+                    max_index <= BIN_LOW + bin_idx;
+                end
+                if (bin_idx == NUM_BINS - 1) begin
+                    peak_valid <= 1;
+                    state <= DONE;
+                end else begin
+                    bin_idx <= bin_idx + 1;
+                end
+            end
+        end
+        else begin // state == DONE
+            peak_valid <= 0;
+        end
+    end
+
+    always_ff @(posedge clk_in) begin
+        overflow_out <= !rst_in && ce && busy_out;
+    end
+
+endmodule
+
+`default_nettype wire
@@ -0,0 +1,149 @@
+`default_nettype none
+
+// Per-pulse latency and busy-cycle statistics.
+// Stage counter i measures the cycles from the first start_in[i] to the first following
+// stop_in[i] within a pulse. Busy counter j counts the cycles busy_in[j] is high during a
+// pulse and is recorded when the next pulse starts. Every counter keeps last/min/max/sum/count.
+//
+// Read map (registered, one cycle latency): read_addr = {counter, field}
+//   counter 0..NUM_STAGES-1                      stage latencies
+//   counter NUM_STAGES..NUM_STAGES+NUM_BUSY-1    busy cycles
+//   counter NUM_STAGES+NUM_BUSY                  field 0: pulses seen
+//   field 0 last, 1 min, 2 max, 3 sum[31:0], 4 sum[63:32], 5 count
+module perf_counters #(
+    parameter NUM_STAGES = 3,                // Number of start -> stop latency stages
+    parameter NUM_BUSY = 2,                  // Number of busy-cycle counters
+    parameter COUNT_WIDTH = 32,              // Width of a single measurement
+    parameter SUM_WIDTH = 64,                // Width of the running sums
+    parameter ADDR_WIDTH = $clog2(NUM_STAGES + NUM_BUSY + 1) + 3
+)(
+    input wire                        clk_in,         // System clock
+    input wire                        rst_in,         // Clears all statistics
+    input wire                        pulse_start,    // Opens a new measurement window (burst_start)
+    input wire [NUM_STAGES-1:0]       start_in,       // Stage start events
+    input wire [NUM_STAGES-1:0]       stop_in,        // Stage stop events
+    input wire [NUM_BUSY-1:0]         busy_in,        // Busy levels to count
+    input wire [ADDR_WIDTH-1:0]       read_addr,      // Readout address
+    output logic [31:0]               read_data       // Readout data
+);
+
+    localparam NUM_COUNTERS = NUM_STAGES + NUM_BUSY;
+
+    // Per pulse measurement state
+    logic [NUM_STAGES-1:0]  timing;                        // start seen, stop pending
+    logic [NUM_STAGES-1:0]  done;                          // stage measured this pulse
+    logic [COUNT_WIDTH-1:0] elapsed [NUM_STAGES-1:0];      // cycles since stage start
+    logic [COUNT_WIDTH-1:0] busy_count [NUM_BUSY-1:0];     // busy cycles this pulse
+    logic                   pulse_seen;                    // a pulse window is open
+    logic [31:0]            pulse_count;
+
+    // Statistics
+    logic [COUNT_WIDTH-1:0] stat_last [NUM_COUNTERS-1:0];
+    logic [COUNT_WIDTH-1:0] stat_min [NUM_COUNTERS-1:0];
+    logic [COUNT_WIDTH-1:0] stat_max [NUM_COUNTERS-1:0];
+    logic [SUM_WIDTH-1:0]   stat_sum [NUM_COUNTERS-1:0];
+    logic [31:0]            stat_count [NUM_COUNTERS-1:0];
+
+    // Measurements completing this cycle
+    logic [NUM_COUNTERS-1:0] record_valid;
+    logic [COUNT_WIDTH-1:0]  record_value [NUM_COUNTERS-1:0];
+
+    always_comb begin
+        for (int i = 0; i < NUM_STAGES; i++) begin
+            record_valid[i] = !pulse_start && !done[i] && stop_in[i] && (timing[i] || start_in[i]);
+            record_value[i] = (timing[i])? elapsed[i] + 1: 0;
+        end
+        for (int j = 0; j < NUM_BUSY; j++) begin
+            record_valid[NUM_STAGES + j] = pulse_start && pulse_seen;
+            record_value[NUM_STAGES + j] = busy_count[j];
+        end
+    end
+
+    // Measurement windows
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            timing <= 0;
+            done <= 0;
+            pulse_seen <= 0;
+            pulse_count <= 0;
+            for (int i = 0; i < NUM_STAGES; i++) elapsed[i] <= 0;
+            for (int j = 0; j < NUM_BUSY; j++) busy_count[j] <= 0;
+        end else if (pulse_start) begin
+            timing <= 0;
+            done <= 0;
+            pulse_seen <= 1;
+            pulse_count <= pulse_count + 1;
+            for (int i = 0; i < NUM_STAGES; i++) elapsed[i] <= 0;
+            for (int j = 0; j < NUM_BUSY; j++) busy_count[j] <= 0;
+        end else if (pulse_seen) begin
+            for (int i = 0; i < NUM_STAGES; i++) begin
+                if (record_valid[i]) begin
+                    timing[i] <= 0;
+                    done[i] <= 1;
+                end else if (timing[i]) begin
+                    elapsed[i] <= elapsed[i] + 1;
+                end else if (start_in[i] && !done[i]) begin
+                    timing[i] <= 1;
+                    elapsed[i] <= 0;
+                end
+            end
+            for (int j = 0; j < NUM_BUSY; j++) begin
+                if (busy_in[j]) busy_count[j] <= busy_count[j] + 1;
+            end
+        end
+    end
+
+    // Statistics accumulation
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            for (int c = 0; c < NUM_COUNTERS; c++) begin
+                stat_last[c] <= 0;
+                stat_min[c] <= {COUNT_WIDTH{1'b1}};
+                stat_max[c] <= 0;
+                stat_sum[c] <= 0;
+                stat_count[c] <= 0;
+            end
+        end else begin
+            for (int c = 0; c < NUM_COUNTERS; c++) begin
+                if (record_valid[c]) begin
+                    stat_last[c] <= record_value[c];
+                    if (record_value[c] < stat_min[c]) stat_min[c] <= record_value[c];
+                    if (record_value[c] > stat_max[c]) stat_max[c] <= record_value[c];
+                    stat_sum[c] <= stat_sum[c] + record_value[c];
+                    stat_count[c] <= stat_count[c] + 1;
+                end
+            end
+        end
+    end
+
+    // Readout
+    logic [ADDR_WIDTH-4:0] read_counter;
+    logic [2:0]            read_field;
+    logic [SUM_WIDTH+31:0] read_sum;    // padded so the upper word always exists
+    assign read_counter = read_addr[ADDR_WIDTH-1:3];
+    assign read_field = read_addr[2:0];
+    assign read_sum = stat_sum[read_counter];
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            read_data <= 0;
+        end else if (read_counter == NUM_COUNTERS) begin
+            read_data <= (read_field == 0)? pulse_count: 0;
+        end else if (read_counter > NUM_COUNTERS) begin
+            read_data <= 0;
+        end else begin
+            case (read_field)
+                3'd0: read_data <= stat_last[read_counter];
+                3'd1: read_data <= stat_min[read_counter];
+                3'd2: read_data <= stat_max[read_counter];
+                3'd3: read_data <= read_sum[31:0];
+                3'd4: read_data <= read_sum[63:32];
+                3'd5: read_data <= stat_count[read_counter];
+                default: read_data <= 0;
+            endcase
+        end
+    end
+
+endmodule
+
+`default_nettype wire
@@ -32,13 +32,27 @@ module receive_beamformer #(
 
 
     // Internal Signals
-    logic [15:0] wave_buffer [NUM_RECEIVERS-1:0][BUFFER_SIZE-1:0]; // Buffers for each receiver
-    logic [INDEX_WIDTH-1:0] next_write_index;                                 // Write index for the circular buffer (5-bit for up to 32 entries)
-    logic [INDEX_WIDTH-1:0] curr_read_index [NUM_RECEIVERS-1:0];              // Read indices for each receiver
+    // The buffers have no reset, so they map to block RAM: after a reset, fill_count counts
+    // the samples written since, and older (stale) entries read as zero. Buffers are read
+    // on the clock edge, at the indices the cycle after it needs.
+    logic [INDEX_WIDTH-1:0] next_write_index;                                 // Write index for the circular buffer
+    logic [INDEX_WIDTH:0] fill_count;                                         // Samples written since reset, up to BUFFER_SIZE
+    logic [INDEX_WIDTH-1:0] write_index_after;                                // next_write_index after this clock edge
+    logic [INDEX_WIDTH:0] fill_count_after;                                   // fill_count after this clock edge
+    logic [INDEX_WIDTH-1:0] read_index [NUM_RECEIVERS-1:0];                   // Read indices for each receiver, for the next cycle
+    logic [15:0] delayed_sample [NUM_RECEIVERS-1:0];                          // Each receiver's delayed sample, zero if stale
     logic [31:0] combined_waveform;                   // Summation of delayed signals (32-bit to handle overflow)
 
     logic [DELAY_WIDTH-1:0] delay_samples [NUM_RECEIVERS-1:0];
     always_comb begin
+        if (rst_in) begin
+            write_index_after = 0;
+            fill_count_after = 0;
+        end else begin
+            write_index_after = (data_valid_in) ? next_write_index + 1 : next_write_index; // wraps at BUFFER_SIZE
+            fill_count_after = (data_valid_in && fill_count != BUFFER_SIZE) ? fill_count + 1 : fill_count;
+        end
+
         for (int i = 0; i < NUM_RECEIVERS; i++) begin
             if (sign_bit) begin // if receiving wave from left, delay left most receiver most
                 delay_samples[i] = ((SAMPLE_DELAY_PER_RECEIVER_COMP * (NUM_RECEIVERS - i - 1) * sin_theta) >> (SIN_WIDTH - 1)) & (BUFFER_SIZE - 1);
@@ -46,48 +60,44 @@ module receive_beamformer #(
                 delay_samples[i] = ((SAMPLE_DELAY_PER_RECEIVER_COMP * i * sin_theta) >> (SIN_WIDTH - 1)) & (BUFFER_SIZE - 1);
             end
 
-
-            // can be sequential
-            if (next_write_index > delay_samples[i]) begin
-                curr_read_index[i] = next_write_index - delay_samples[i] - 1;
-            end else begin
-                curr_read_index[i] = BUFFER_SIZE + next_write_index - delay_samples[i] - 1;
-            end
+            // the sample written delay_samples[i] + 1 samples before the next write
+            read_index[i] = write_index_after - INDEX_WIDTH'(delay_samples[i]) - 1;
         end
 
         // ------------------- HARDCODED ----------------------------
         combined_waveform = (
-                wave_buffer[0][curr_read_index[0]] + 
-                wave_buffer[1][curr_read_index[1]]
+                delayed_sample[0] +
+                delayed_sample[1]
             ) >> 1; // >> 1 is division by 2 because of 2 receivers
         // ------------------- HARDCODED ----------------------------
-        aggregated_waveform = combined_waveform;
+        aggregated_waveform = combined_waveform[15:0];
     end
 
-
-    // Always block for writing ADC inputs to their respective buffers
     always_ff @(posedge clk_in) begin
-        if (rst_in) begin
-            next_write_index <= 5'd0;
-            for (int i = 0; i < NUM_RECEIVERS; i++) begin
-                for (int j = 0; j < BUFFER_SIZE; j++) begin
-                    wave_buffer[i][j] = 0; // clears the wave buffer for next cycle
+        next_write_index <= write_index_after;
+        fill_count <= fill_count_after;
+    end
+
+    // One simple dual-port buffer per receiver: written at next_write_index, read at read_index
+    genvar r;
+    generate
+        for (r = 0; r < NUM_RECEIVERS; r++) begin : GEN_BUFFER
+            logic [15:0] wave_buffer [BUFFER_SIZE-1:0];
+            logic [15:0] read_data;
+            logic read_valid;
+
+            always_ff @(posedge clk_in) begin
+                if (data_valid_in) begin
+                    wave_buffer[next_write_index] <= adc_in[r];
                 end
+                // a zero delay reads the sample written on this edge
+                read_data <= (data_valid_in && read_index[r] == next_write_index) ? adc_in[r] : wave_buffer[read_index[r]];
+                read_valid <= fill_count_after > delay_samples[r];
             end
-        end else begin
-            if (data_valid_in) begin
-                // Write the current adc_in values to their respective buffers
-                for (int i = 0; i < NUM_RECEIVERS; i++) begin // keep in always ff
-                    wave_buffer[i][next_write_index] <= adc_in[i];
-                end
 
-                if (next_write_index == BUFFER_SIZE - 1)
-                    next_write_index <= 5'd0;
-                else
-                    next_write_index <= next_write_index + 1;
-            end
+            assign delayed_sample[r] = (read_valid) ? read_data : 16'd0;
         end
-    end
+    endgenerate
 
 endmodule
 
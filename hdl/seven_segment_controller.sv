@@ -9,6 +9,8 @@ module seven_segment_controller #(parameter COUNT_PERIOD = 100000)
     input wire [15:0] velocity_in,       // Velocity in m/s (absolute value)
     input wire towards_observer,         // Direction of velocity: 1 for "-", 0 for "+"
     input wire signed [7:0] angle_in,           // Angle value in degrees (0-360)
+    input wire hex_mode_in,              // Show hex_value_in on all eight digits instead
+    input wire [31:0] hex_value_in,      // Word shown in hex, digit 0 = bits [3:0]
     output logic [6:0] cat_out,          // Segment control output for a-g segments
     output logic [7:0] an_out            // Anode control output for selecting display
   );
@@ -51,8 +53,18 @@ module seven_segment_controller #(parameter COUNT_PERIOD = 100000)
   //Note that x_in is a 4 bit input, and val_in is 32 bits wide
   //Adjust accordingly, based on what you know re. which digits
   //are displayed when...
+  // digit selected by the one-hot segment_state, for hex_mode_in
+  logic [2:0] hex_digit;
   always_comb begin
-    case (segment_state)
+    hex_digit = 0;
+    for (int i = 0; i < 8; i++) begin
+      if (segment_state[i]) hex_digit = i;
+    end
+  end
+
+  always_comb begin
+    if (hex_mode_in) sel_values = {1'b0, hex_value_in[4*hex_digit +: 4]};
+    else case (segment_state)
       8'b0000_0001: sel_values = lower_angle_bits;
       8'b0000_0010: sel_values = upper_angle_bits;
       8'b0000_0100: sel_values = empty_sel_value; // should always be set to a point
@@ -76,7 +88,7 @@ module seven_segment_controller #(parameter COUNT_PERIOD = 100000)
       state <= LOADING;
     end else begin
       if (state == LOADING) begin
-        if (tof_trigger_in || velocity_trigger_in) begin
+        if (tof_trigger_in || velocity_trigger_in || hex_mode_in) begin
           state <= READY;
           segment_state <= 8'b0000_0001;
         end
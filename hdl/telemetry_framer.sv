@@ -0,0 +1,153 @@
+`default_nettype none
+
+// Streams one binary telemetry frame per pulse over a UART.
+//
+// Frame layout (multi-byte fields little-endian), decoded by sim/telemetry.py:
+//   0      0xA5            sync
+//   1      0x5A            sync
+//   2      sequence        increments on every frame sent
+//   3      flags           bit 0 range valid, bit 1 velocity valid, bit 2 towards observer
+//   4-5    range           cm
+//   6-7    velocity        m/s (magnitude)
+//   8      angle           signed degrees off boresight
+//   9      NUM_SAMPLES
+//   10-    samples         NUM_SAMPLES x 16 bit, every DECIMATION-th sample of the pulse
+//   last   checksum        XOR of bytes 2 .. last-1
+//
+// Samples are captured into one bank while the previous pulse's bank is sent.
+module telemetry_framer #(
+    parameter NUM_SAMPLES = 16,               // Decimated waveform samples per frame (0 disables)
+    parameter DECIMATION = 64,                // Keep every DECIMATION-th sample
+    parameter CLKS_PER_BIT = 868              // 100 MHz / 115200 baud
+)(
+    input wire                clk_in,             // System clock
+    input wire                rst_in,             // Active-high reset signal
+    input wire                trigger_in,         // Latch results and send a frame (burst_start)
+    input wire                range_valid_in,
+    input wire [15:0]         range_in,           // cm
+    input wire                velocity_valid_in,
+    input wire [15:0]         velocity_in,        // m/s
+    input wire                towards_observer_in,
+    input wire signed [7:0]   angle_in,           // degrees off boresight
+    input wire [15:0]         sample_in,          // Waveform sample to decimate
+    input wire                sample_valid_in,
+    output logic              busy_out,           // Frame in flight; triggers are dropped
+    output logic              tx_out              // UART serial output
+);
+
+    localparam SAMPLE_BYTES = 2 * NUM_SAMPLES;
+    localparam FRAME_BYTES = 11 + SAMPLE_BYTES;
+    localparam BANK_SIZE = (NUM_SAMPLES > 0)? NUM_SAMPLES: 1;
+    localparam BYTE_IDX_WIDTH = $clog2(FRAME_BYTES);
+    localparam SAMPLE_IDX_WIDTH = $clog2(BANK_SIZE + 1);
+    localparam DECIM_WIDTH = $clog2(DECIMATION + 1);
+
+    // Decimated sample capture, two banks
+    logic [15:0]                  sample_bank [1:0][BANK_SIZE-1:0];
+    logic                         write_bank;
+    logic [SAMPLE_IDX_WIDTH-1:0]  write_count;
+    logic [DECIM_WIDTH-1:0]       decim_count;
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in || trigger_in) begin
+            // a dropped trigger restarts capture without taking the bank being sent
+            write_bank <= (rst_in)? 0: (busy_out)? write_bank: !write_bank;
+            write_count <= 0;
+            decim_count <= 0;
+        end else if (sample_valid_in && write_count < NUM_SAMPLES) begin
+            if (decim_count == 0) begin
+                sample_bank[write_bank][write_count] <= sample_in;
+                write_count <= write_count + 1;
+            end
+            decim_count <= (decim_count == DECIMATION - 1)? 0: decim_count + 1;
+        end
+    end
+
+    // Latched frame contents
+    logic [7:0]   sequence_num;
+    logic [7:0]   flags;
+    logic [15:0]  range_reg;
+    logic [15:0]  velocity_reg;
+    logic [7:0]   angle_reg;
+    logic [7:0]   checksum;
+    logic [BYTE_IDX_WIDTH-1:0] byte_idx;
+
+    // Byte currently on offer to the UART
+    logic [7:0]   frame_byte;
+    logic [15:0]  frame_sample;
+    logic [BYTE_IDX_WIDTH-1:0] sample_byte_idx;
+
+    always_comb begin
+        sample_byte_idx = byte_idx - 10;
+        frame_sample = sample_bank[!write_bank][sample_byte_idx >> 1];
+        case (byte_idx)
+            0: frame_byte = 8'hA5;
+            1: frame_byte = 8'h5A;
+            2: frame_byte = sequence_num;
+            3: frame_byte = flags;
+            4: frame_byte = range_reg[7:0];
+            5: frame_byte = range_reg[15:8];
+            6: frame_byte = velocity_reg[7:0];
+            7: frame_byte = velocity_reg[15:8];
+            8: frame_byte = angle_reg;
+            9: frame_byte = NUM_SAMPLES;
+            default: begin
+                if (byte_idx == FRAME_BYTES - 1) begin
+                    frame_byte = checksum;
+                end else begin
+                    frame_byte = (sample_byte_idx[0])? frame_sample[15:8]: frame_sample[7:0];
+                end
+            end
+        endcase
+    end
+
+    logic uart_busy;
+    logic uart_valid;
+    assign uart_valid = busy_out && !uart_busy;
+
+    uart_tx #(
+        .CLKS_PER_BIT(CLKS_PER_BIT)
+    ) uart (
+        .clk_in(clk_in),
+        .rst_in(rst_in),
+        .data_in(frame_byte),
+        .data_valid_in(uart_valid),
+        .busy_out(uart_busy),
+        .tx_out(tx_out)
+    );
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            busy_out <= 0;
+            sequence_num <= 0;
+            flags <= 0;
+            range_reg <= 0;
+            velocity_reg <= 0;
+            angle_reg <= 0;
+            checksum <= 0;
+            byte_idx <= 0;
+        end else if (!busy_out) begin
+            if (trigger_in) begin
+                busy_out <= 1;
+                flags <= {5'b0, towards_observer_in, velocity_valid_in, range_valid_in};
+                range_reg <= range_in;
+                velocity_reg <= velocity_in;
+                angle_reg <= angle_in;
+                checksum <= 0;
+                byte_idx <= 0;
+            end
+        end else if (uart_valid) begin
+            // uart_tx accepts frame_byte on this edge
+            if (byte_idx >= 2) checksum <= checksum ^ frame_byte;
+            if (byte_idx == FRAME_BYTES - 1) begin
+                busy_out <= 0;
+                sequence_num <= sequence_num + 1;
+            end else begin
+                byte_idx <= byte_idx + 1;
+            end
+        end
+    end
+
+endmodule
+
+`default_nettype wire
@@ -6,7 +6,8 @@ module time_of_flight (
     input wire        clk_in,              // 100 MHz clock for precise timing
     input wire        rst_in,              // Active-high reset signal
     output logic [15:0] range_out,           // Calculated distance output in centimeters
-    output logic        valid_out           // Output validity flag
+    output logic        valid_out,          // Output validity flag
+    output logic        divider_busy        // Range divider busy
 );
 
     // Parameters
@@ -49,7 +50,7 @@ module time_of_flight (
         .remainder_out(),             // Ignored remainder
         .data_valid_out(div_valid_out),
         .error_out(error_out),
-        .busy_out()
+        .busy_out(divider_busy)
     );
 
 endmodule
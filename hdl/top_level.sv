@@ -16,7 +16,8 @@ module top_level (
   output wire cs0,
   output wire cs1,
   output logic [2:0]  rgb0,
-  output logic [2:0]  rgb1
+  output logic [2:0]  rgb1,
+  output logic uart_txd                    // Telemetry to host
 );
 
   localparam PERIOD_DURATION = 16777216;   // 2^24 in clock cycles a little under 2 tenths of seconds
@@ -121,7 +122,8 @@ module top_level (
       .SIN_WIDTH(SIN_WIDTH),
       .ANGLE_WIDTH(ANGLE_WIDTH)
   ) sin_lookup (
-      .angle(beam_angle), // degrees off boresight
+      .clk_in(clk_100mhz),
+      .angle(beam_angle), // degrees off boresight, outputs follow 3 cycles later
       .sin_value(sin_value),
       .sign_bit(sign_bit) // high if value is negative, low otw
   );
@@ -135,6 +137,7 @@ module top_level (
     .rst_in(burst_start), // conditions to stop transmitting
     .sin_value(sin_value),
     .sign_bit(sign_bit),
+    .delays_ready(),
     .tx_out(tx_out)
   );
 
@@ -158,53 +161,50 @@ module top_level (
 
   assign spi_trigger = spi_trigger_count == 0 && !active_pulse;
 
-  logic [ADC_DATA_WIDTH-1:0] spi_read_data_0;
-  logic [ADC_DATA_WIDTH-1:0] spi_read_data_1;
-  logic                      spi_read_data_valid_0;
-  logic                      spi_read_data_valid_1;
-
-
-  spi_con
-  #(  .DATA_WIDTH(ADC_DATA_WIDTH),
-      .DATA_CLK_PERIOD(ADC_DATA_CLK_PERIOD)
-  ) spi_controller_0
-  (  
-    .clk_in(clk_100mhz),
-    .rst_in(burst_start),
-    .trigger_in(spi_trigger),
-    .data_in(),
-    .data_out(spi_read_data_0),
-    .data_valid_out(spi_read_data_valid_0),
-    .chip_data_out(),
-    .chip_data_in(cipo0), // sdata on adc
-    .chip_clk_out(dclk0), // sclk on adc
-    .chip_sel_out(cs0)
-  );   // CS on adc
-
-  spi_con
-  #(  .DATA_WIDTH(ADC_DATA_WIDTH),
-      .DATA_CLK_PERIOD(ADC_DATA_CLK_PERIOD)
-  ) spi_controller_1
-  (   
+  localparam ADC_SAMPLE_MSB = 11;          // adc_in keeps bits [11:2] of every ADC word
+  localparam ADC_SAMPLE_LSB = 2;
+  localparam ADC_SAMPLE_WIDTH = ADC_SAMPLE_MSB - ADC_SAMPLE_LSB + 1;
+
+  logic [NUM_TRANSMITTERS*ADC_SAMPLE_WIDTH-1:0] adc_samples;   // one conversion of every ADC
+  logic                                          adc_samples_valid;
+  logic                                          adc_sclk;
+  logic                                          adc_cs;
+
+  // Both ADCs share one SCLK/CS, so their samples are taken on the same edge
+  adc_capture
+  #(  .NUM_CHANNELS(NUM_TRANSMITTERS),
+      .DATA_WIDTH(ADC_DATA_WIDTH),
+      .DATA_CLK_PERIOD(ADC_DATA_CLK_PERIOD),
+      .SAMPLE_MSB(ADC_SAMPLE_MSB),
+      .SAMPLE_LSB(ADC_SAMPLE_LSB)
+  ) adc_capture_inst
+  (
     .clk_in(clk_100mhz),
     .rst_in(burst_start),
     .trigger_in(spi_trigger),
-    .data_in(),
-    .data_out(spi_read_data_1),
-    .data_valid_out(spi_read_data_valid_1),
-    .chip_data_out(),
-    .chip_data_in(cipo1), // sdata on adc
-    .chip_clk_out(dclk1), // sclk on adc
-    .chip_sel_out(cs1)
-  );   // CS on adc
+    .cipo_in({cipo1, cipo0}), // sdata on adcs
+    .sclk_out(adc_sclk),
+    .cs_out(adc_cs),
+    .samples_out(adc_samples),
+    .timestamp_out(),         // cycles since burst_start of each sample
+    .valid_out(adc_samples_valid),
+    .ready_in(1'b1),          // the beamformer takes a sample every cycle
+    .overflow_out()
+  );
+
+  assign dclk0 = adc_sclk; // sclk on adc
+  assign dclk1 = adc_sclk;
+  assign cs0 = adc_cs;     // CS on adc
+  assign cs1 = adc_cs;
 
   // Receive Beamforming Signals
-  logic [15:0] adc_in [NUM_TRANSMITTERS-1:0];        // Digital inputs from the 2 ADCs
+  logic [15:0] adc_in [NUM_TRANSMITTERS-1:0];        // Digital inputs from the ADCs
 
-  // ------------------- HARDCODED ----------------------------
-  assign adc_in[0] = {6'b0, spi_read_data_0[11:2]};
-  assign adc_in[1] = {6'b0, spi_read_data_1[11:2]};
-  // ------------------- HARDCODED ----------------------------
+  generate
+    for (genvar i = 0; i < NUM_TRANSMITTERS; i++) begin : GEN_ADC_IN
+      assign adc_in[i] = {{(16-ADC_SAMPLE_WIDTH){1'b0}}, adc_samples[i*ADC_SAMPLE_WIDTH +: ADC_SAMPLE_WIDTH]};
+    end
+  endgenerate
 
   logic [15:0] aggregated_waveform; // Aggregated output waveform from the receivers
 
@@ -215,7 +215,7 @@ module top_level (
     .adc_in(adc_in),
     .sin_theta(sin_value),
     .sign_bit(sign_bit),
-    .data_valid_in(spi_read_data_valid_0), // should tech be in sync w other read data valid
+    .data_valid_in(adc_samples_valid),
     .aggregated_waveform(aggregated_waveform)
   );
 
@@ -240,6 +240,7 @@ module top_level (
   
   logic [15:0] range_out;
   logic tof_valid_out;
+  logic tof_divider_busy;
 
   time_of_flight tof (
     .time_since_emission(time_since_emission),
@@ -247,20 +248,61 @@ module top_level (
     .clk_in(clk_100mhz),
     .rst_in(burst_start),
     .range_out(range_out),
-    .valid_out(tof_valid_out)
+    .valid_out(tof_valid_out),
+    .divider_busy(tof_divider_busy)
   );
 
+  // buffered_aggregated_waveform settles two cycles after the ADC sample is valid
+  logic [1:0] velocity_valid_pipe;
+
+  always_ff @(posedge clk_100mhz) begin
+    if (burst_start) begin
+      velocity_valid_pipe <= 0;
+    end else begin
+      velocity_valid_pipe <= {velocity_valid_pipe[0], adc_samples_valid};
+    end
+  end
+
   logic ready_velocity;
   logic [15:0] velocity_result;
   logic towards_observer;
+  logic velocity_peak_valid;
+  logic velocity_divider_busy;
 
   velocity velocity_calculator_inst (
     .clk_in(clk_100mhz),
     .rst_in(burst_start),
+    .receiver_data_valid_in(velocity_valid_pipe[1]),
     .receiver_data(buffered_aggregated_waveform),
     .doppler_ready(ready_velocity),
     .velocity_result(velocity_result),
-    .stored_towards_observer(towards_observer)
+    .stored_towards_observer(towards_observer),
+    .peak_valid(velocity_peak_valid),
+    .divider_busy(velocity_divider_busy)
+  );
+
+  // Pipeline latency counters, one window per pulse, read on the seven-segment display:
+  // with sw[15] up it shows the word at perf_counters address sw[5:0] in hex
+  //   stage 0: burst -> echo_detected
+  //   stage 1: echo_detected -> ToF valid_out
+  //   stage 2: first Doppler input sample -> peak_valid
+  //   busy 0/1: ToF / velocity divider busy cycles
+  localparam PERF_ADDR_WIDTH = 6;
+  logic [31:0] perf_read_data;
+
+  perf_counters #(
+    .NUM_STAGES(3),
+    .NUM_BUSY(2),
+    .ADDR_WIDTH(PERF_ADDR_WIDTH)
+  ) perf (
+    .clk_in(clk_100mhz),
+    .rst_in(sys_rst),
+    .pulse_start(burst_start),
+    .start_in({velocity_valid_pipe[1], echo_detected, active_pulse}),
+    .stop_in({velocity_peak_valid, tof_valid_out, echo_detected}),
+    .busy_in({velocity_divider_busy, tof_divider_busy}),
+    .read_addr(sw[PERF_ADDR_WIDTH-1:0]),
+    .read_data(perf_read_data)
   );
 
   logic stored_tof_ready;
@@ -289,6 +331,26 @@ module top_level (
     end
   end
 
+  // Telemetry: one frame per pulse, sent as the next burst starts
+  telemetry_framer #(
+    .NUM_SAMPLES(16),
+    .DECIMATION(64)
+  ) telemetry (
+    .clk_in(clk_100mhz),
+    .rst_in(sys_rst),
+    .trigger_in(burst_start),
+    .range_valid_in(stored_tof_ready),
+    .range_in(stored_tof_range_out),
+    .velocity_valid_in(stored_velocity_ready),
+    .velocity_in(stored_velocity_result),
+    .towards_observer_in(stored_towards_observer),
+    .angle_in(beam_angle),
+    .sample_in(buffered_aggregated_waveform),
+    .sample_valid_in(velocity_valid_pipe[1]),
+    .busy_out(),
+    .tx_out(uart_txd)
+  );
+
   logic ss_trigger_in = stored_tof_ready && stored_velocity_ready;
 
   logic [6:0] ss_c;
@@ -323,6 +385,8 @@ module top_level (
     .velocity_in(stored_velocity_result),  // TODO: replace for ...(stored_velocity_result)      // Velocity in m/s (absolute value)
     .towards_observer(stored_towards_observer), // TODO: replace for ...(stored_towards_observer)        // Direction of velocity: 1 for "-", 0 for "+"
     .angle_in(beam_angle),           // Angle value in degrees (0-360)
+    .hex_mode_in(sw[15]),            // perf counter readout
+    .hex_value_in(perf_read_data),
     .cat_out(ss_c),          // Segment control output for a-g segments
     .an_out({ss0_an, ss1_an})            // Anode control output for selecting display
   );
@@ -14,6 +14,7 @@ module transmit_beamformer #(
     input wire rst_in,                            // Active-low reset signal
     input wire [SIN_WIDTH-1:0] sin_value, // Sine value for beam_angle
     input wire sign_bit,
+    output logic delays_ready,                      // Delay table matches the steering input
     output logic [NUM_TRANSMITTERS-1:0] tx_out       // Output signals for transmitters
 );
 
@@ -23,33 +24,77 @@ module transmit_beamformer #(
     localparam ULTRA_SONIC_WAVE_PERIOD_IN_CLOCK_CYCLES = 2500;
     localparam ULTRA_SONIC_WAVE_HALF_PERIOD_IN_CLOCK_CYCLES = 1250;
 
-    localparam DELAY_PER_TRANSMITTER_COMP = (ELEMENT_SPACING * CLK_FREQ / SPEED_OF_SOUND) % ULTRA_SONIC_WAVE_PERIOD_IN_CLOCK_CYCLES;
+    localparam DELAY_PER_TRANSMITTER_COMP = ELEMENT_SPACING * CLK_FREQ / SPEED_OF_SOUND;   // reduced modulo the period per element
 
 
-    logic [NUM_TRANSMITTERS-1:0] counting;
+    localparam ELEMENT_DELAY_WIDTH = $clog2(DELAY_PER_TRANSMITTER_COMP * NUM_TRANSMITTERS + 1);
+    localparam PRODUCT_WIDTH = ELEMENT_DELAY_WIDTH + SIN_WIDTH;
+    localparam INDEX_WIDTH = (NUM_TRANSMITTERS > 1)? $clog2(NUM_TRANSMITTERS): 1;
+
+    // Per-element delay table, recomputed one element per step with a single shared multiplier
+    // whenever the steering input changes (and on every reset). Offsets only take effect when
+    // the pwm counters are loaded, so all counters are realigned once the new table is complete.
+    // tx_out is held low until then (delays_ready), so a burst never starts with a runt pulse
+    // from counters that are about to be reloaded.
     logic [DELAY_WIDTH-1:0] default_offset [NUM_TRANSMITTERS-1:0];
 
-    // //  -------------------------- HARD CODED ----------------------------------
-    // logic [DELAY_WIDTH-1:0] default_offset_0_sign;
-    // logic [DELAY_WIDTH-1:0] default_offset_1_sign;
-    // logic [DELAY_WIDTH-1:0] default_offset_0_no_sign;
-    // logic [DELAY_WIDTH-1:0] default_offset_0_no_sign;
-    // //  -------------------------- HARD CODED ----------------------------------
+    typedef enum {IDLE, MULTIPLY, REDUCE} table_state_t;
+    table_state_t table_state;
+
+    logic [SIN_WIDTH-1:0]           table_sin_value;   // steering input the table is built for
+    logic                           table_sign_bit;
+    logic [INDEX_WIDTH-1:0]         table_index;
+    logic [ELEMENT_DELAY_WIDTH-1:0] element_delay;     // DELAY_PER_TRANSMITTER_COMP * element position
+    logic [PRODUCT_WIDTH-1:0]       product;
+    logic                           reload;            // load the new offsets into every pwm counter
+
+    always_ff @(posedge clk_in) begin
+        reload <= 0;
+        if (rst_in || {sign_bit, sin_value} != {table_sign_bit, table_sin_value}) begin
+            table_state <= MULTIPLY;
+            table_sin_value <= sin_value;
+            table_sign_bit <= sign_bit;
+            table_index <= 0;
+            // if propogating angle to left, trigger rightmost transmitter first
+            element_delay <= (sign_bit)? DELAY_PER_TRANSMITTER_COMP * (NUM_TRANSMITTERS - 1): 0;
+            delays_ready <= 0;
+        end else begin
+            case (table_state)
+                MULTIPLY: begin
+                    product <= (element_delay * table_sin_value) >> (SIN_WIDTH - 1);
+                    element_delay <= (table_sign_bit)? element_delay - DELAY_PER_TRANSMITTER_COMP:
+                                                       element_delay + DELAY_PER_TRANSMITTER_COMP;
+                    table_state <= REDUCE;
+                end
+                REDUCE: begin
+                    // offset modulo one ultrasonic period, so arrays wider than one wavelength wrap
+                    if (product >= ULTRA_SONIC_WAVE_PERIOD_IN_CLOCK_CYCLES) begin
+                        product <= product - ULTRA_SONIC_WAVE_PERIOD_IN_CLOCK_CYCLES;
+                    end else begin
+                        default_offset[table_index] <= product;
+                        if (table_index == NUM_TRANSMITTERS - 1) begin
+                            table_state <= IDLE;
+                            reload <= 1;
+                        end else begin
+                            table_index <= table_index + 1;
+                            table_state <= MULTIPLY;
+                        end
+                    end
+                end
+                default: begin
+                    delays_ready <= delays_ready || reload;
+                end
+            endcase
+        end
+    end
 
     // Generate PWM instances for each transmitter
+    logic [NUM_TRANSMITTERS-1:0] wave;
+    assign tx_out = (delays_ready)? wave: 0;
+
     genvar i;
     generate
-        for (i = 0; i < NUM_TRANSMITTERS; i++) begin : GEN_TRANSMITTER            
-            // Calculate delay based on sine value
-            // if want to propogate to left vs right. the ordering of which transmitter goes first toggles
-            always_comb begin
-                // Calculate delay based on sine value and sign_bit
-                if (sign_bit) begin // if propogating angle to left. trigger rightmost transmitter first
-                    default_offset[i] = ((DELAY_PER_TRANSMITTER_COMP * (NUM_TRANSMITTERS - i - 1) * sin_value) >> (SIN_WIDTH-1)); // multiplying by 59 dividing by 60. maybe increase the bit width of sin_value and incrase vals by 1
-                end else begin // if propogating angle to right. trigger left most transmitter first
-                    default_offset[i] = ((DELAY_PER_TRANSMITTER_COMP * i * sin_value) >> (SIN_WIDTH-1)); // potentially dangerous. shouldnt be to many operations because a and b are relatively closde
-                end
-            end
+        for (i = 0; i < NUM_TRANSMITTERS; i++) begin : GEN_TRANSMITTER
             // Instantiate PWM module
             // Need to actually wiggle the wave high low at 40 khz freq
             pwm #(
@@ -57,9 +102,9 @@ module transmit_beamformer #(
                 .DUTY_CYCLE_ON(ULTRA_SONIC_WAVE_HALF_PERIOD_IN_CLOCK_CYCLES)
             ) wave_generator (
                 .clk_in(clk_in),
-                .rst_in(rst_in),
+                .rst_in(rst_in || reload),
                 .default_offset(default_offset[i]),
-                .sig_out(tx_out[i])
+                .sig_out(wave[i])
             );
         end
     endgenerate
@@ -0,0 +1,52 @@
+`default_nettype none
+
+// 8N1 UART transmitter
+module uart_tx #(
+    parameter CLKS_PER_BIT = 868              // 100 MHz / 115200 baud
+)(
+    input wire         clk_in,                // System clock
+    input wire         rst_in,                // Active-high reset signal
+    input wire [7:0]   data_in,               // Byte to send
+    input wire         data_valid_in,         // Starts sending data_in (ignored while busy)
+    output logic       busy_out,              // High while a byte is on the line
+    output logic       tx_out                 // Serial output, idles high
+);
+
+    logic [9:0]                        shift_reg;     // {stop, data, start}, LSB first
+    logic [3:0]                        bit_count;
+    logic [$clog2(CLKS_PER_BIT)-1:0]   clk_count;
+
+    always_ff @(posedge clk_in) begin
+        if (rst_in) begin
+            shift_reg <= 10'h3FF;
+            bit_count <= 0;
+            clk_count <= 0;
+            busy_out <= 0;
+            tx_out <= 1;
+        end else if (!busy_out) begin
+            if (data_valid_in) begin
+                shift_reg <= {1'b1, data_in, 1'b0};
+                bit_count <= 0;
+                clk_count <= 0;
+                busy_out <= 1;
+                tx_out <= 0; // start bit
+            end
+        end else begin
+            if (clk_count == CLKS_PER_BIT - 1) begin
+                clk_count <= 0;
+                if (bit_count == 9) begin
+                    busy_out <= 0; // stop bit done
+                    tx_out <= 1;
+                end else begin
+                    bit_count <= bit_count + 1;
+                    tx_out <= shift_reg[bit_count + 1];
+                end
+            end else begin
+                clk_count <= clk_count + 1;
+            end
+        end
+    end
+
+endmodule
+
+`default_nettype wire
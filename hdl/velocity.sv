@@ -1,7 +1,8 @@
 `default_nettype none
 
 module velocity #(
-    parameter EMITTED_FREQUENCY = 40000
+    parameter EMITTED_FREQUENCY = 40000,
+    parameter USE_GOERTZEL = 0              // 1: goertzel_bank Doppler engine, 0: fft_wrapper
 ) (
     input        wire clk_in,                 // System clock
     input        wire rst_in,                 // System reset
@@ -9,7 +10,9 @@ module velocity #(
     input        wire [15:0] receiver_data,   // 16-bit real receiver input
     output       logic doppler_ready,          // Ready signal for doppler_velocity module
     output       logic [15:0] velocity_result,  // Output velocity from doppler_velocity
-    output       logic stored_towards_observer
+    output       logic stored_towards_observer,
+    output       logic peak_valid,             // Doppler engine result strobe
+    output       logic divider_busy            // Velocity divider busy
 );
     // ./fftgen -n 16 -m 36 -f 2048
 
@@ -27,19 +30,33 @@ module velocity #(
     logic        processing_done;     // Indicates end of FFT processing
     logic [48:0] magnitude;
     logic [31:0] peak_frequency;
-    logic peak_valid;
 
     assign fft_input = {receiver_data, 16'h0000};
  
 
-    fft_wrapper fft (
-        .clk_in(clk_in),           
-        .rst_in(rst_in),         
-        .ce(receiver_data_valid_in),            
-        .sample_in(fft_input),     
-        .peak_frequency(peak_frequency),
-        .peak_valid(peak_valid)     
-    );
+    generate
+        if (USE_GOERTZEL) begin : GEN_GOERTZEL
+            goertzel_bank goertzel (
+                .clk_in(clk_in),
+                .rst_in(rst_in),
+                .ce(receiver_data_valid_in),
+                .sample_in(fft_input),
+                .peak_frequency(peak_frequency),
+                .peak_valid(peak_valid),
+                .busy_out(),            // samples at least NUM_BINS + 1 clocks apart never find it busy
+                .overflow_out()
+            );
+        end else begin : GEN_FFT
+            fft_wrapper fft (
+                .clk_in(clk_in),
+                .rst_in(rst_in),
+                .ce(receiver_data_valid_in),
+                .sample_in(fft_input),
+                .peak_frequency(peak_frequency),
+                .peak_valid(peak_valid)
+            );
+        end
+    endgenerate
 
     // Internal register to store velocity
     logic error_out;
@@ -71,7 +88,7 @@ module velocity #(
         .remainder_out(),
         .data_valid_out(doppler_ready),
         .error_out(error_out),
-        .busy_out()
+        .busy_out(divider_busy)
     );
     
     assign velocity_result = velocity_calc[15:0];
@@ -0,0 +1,267 @@
+import asyncio
+import concurrent.futures
+import errno
+import sys
+import time
+
+import numpy as np
+
+from sonic_sight import doppler_shift_analysis
+from telemetry import decode_frames, signed_velocity
+
+
+# Decimated aggregated_waveform samples in a frame: 1 MHz ADC rate / telemetry_framer DECIMATION
+FRAME_SAMPLE_RATE = 1000000 / 64
+
+
+# Byte sources
+async def file_source(path, chunk_size=4096, follow=False, poll_interval=0.01):
+    """
+    Yields chunks read from a file, named pipe, pty or serial device node.
+
+    Reads run in a worker thread so a blocking device never stalls the event loop.
+    With follow=True the file is tailed like `tail -f` instead of ending at EOF.
+    Serial ports must be configured beforehand, e.g. `stty -F /dev/ttyUSB1 115200 raw`.
+    """
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            try:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+            except OSError as e:
+                if e.errno == errno.EIO:  # pty whose writer hung up
+                    return
+                raise
+            if chunk:
+                yield chunk
+            elif follow:
+                await asyncio.sleep(poll_interval)
+            else:
+                return
+
+
+async def stream_source(reader, chunk_size=4096):
+    """Yields chunks from an asyncio.StreamReader (TCP bridge, serial-over-network, ...)."""
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+# Post-processing run in the worker pool
+def summarize_batch(frames, sample_rate=FRAME_SAMPLE_RATE):
+    """
+    Converts a batch of decoded frames into column arrays.
+
+    Frames carrying waveform samples also get the peak frequency of the decimated
+    waveform from simulation.doppler_shift_analysis.
+    """
+    result = {
+        "sequence": frames["sequence"].astype(np.int64),
+        "range": frames["range"] / 100.0,                   # cm -> m
+        "velocity": signed_velocity(frames).astype(float),   # m/s, towards observer negative
+        "angle": frames["angle"].astype(float),
+        "flags": frames["flags"].copy(),
+    }
+    samples = frames["samples"]
+    if samples.shape[1] > 1:
+        peaks = np.empty(len(frames))
+        for i, waveform in enumerate(samples.astype(float)):
+            freqs, magnitude = doppler_shift_analysis(waveform - waveform.mean(), sampling_rate=sample_rate)
+            peaks[i] = freqs[np.argmax(magnitude)]
+        result["waveform_peak_frequency"] = peaks
+    return result
+
+
+class TelemetryService:
+    """
+    Reads telemetry frames from a byte source, batches them and post-processes the batches
+    in a thread pool, publishing results to any number of subscribers.
+
+    The reader never waits on consumers: when a subscriber's queue is full its oldest result
+    is dropped. When the processing queue is full the oldest pending batch is dropped as well,
+    unless lossless=True (file replay), in which case the reader waits and the time spent
+    blocked is reported. Drops, waits, link sequence gaps and duplicates are counted in stats().
+
+    A batch holds at most batch_size frames. Frames are submitted once batch_size of them are
+    pending, or batch_timeout seconds after the first of them arrived, even if the source
+    delivers nothing more.
+    """
+
+    def __init__(self, source, processor=summarize_batch, batch_size=32, batch_timeout=0.05,
+                 queue_size=8, workers=2, num_samples=None, lossless=False):
+        self.source = source
+        self.processor = processor
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.num_samples = num_samples
+        self.workers = workers
+        self.lossless = lossless
+        self._batches = asyncio.Queue(maxsize=queue_size)
+        self._subscribers = []
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._counters = dict(
+            bytes_read=0,
+            bytes_discarded=0,
+            frames_received=0,
+            frames_lost=0,             # sequence gaps on the link
+            frames_duplicated=0,       # repeated sequence numbers
+            batches_processed=0,
+            frames_dropped=0,          # processing backpressure
+            backpressure_time=0.0,     # reader blocked on a full queue (lossless only)
+            results_published=0,
+            results_dropped=0,         # slow subscribers
+            queue_high_water=0,
+            processing_time=0.0,
+        )
+        self._last_sequence = None
+
+    def subscribe(self, maxsize=16):
+        """Returns a queue receiving every published result; the oldest entries are dropped if it fills."""
+        queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def stats(self):
+        stats = dict(self._counters)
+        stats["queue_depth"] = self._batches.qsize()
+        return stats
+
+    async def run(self):
+        """Runs until the source is exhausted and every batch has been processed and published."""
+        processing = asyncio.create_task(self._process())
+        try:
+            await self._read()
+        finally:
+            await self._batches.put(None)
+            await processing
+            self._executor.shutdown(wait=False)
+
+    async def _read(self):
+        # The next chunk is awaited in its own task so the batch deadline can fire while a
+        # live link is silent; cancelling the source's __anext__ would close the generator.
+        source = aiter(self.source)
+        buffer = bytearray()
+        pending = []
+        deadline = None
+        next_chunk = None
+        try:
+            while True:
+                next_chunk = next_chunk or asyncio.ensure_future(anext(source))
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+                if not done:
+                    pending = await self._flush(pending, partial=True)
+                    deadline = None
+                    continue
+                task, next_chunk = next_chunk, None
+                try:
+                    chunk = task.result()
+                except StopAsyncIteration:
+                    break
+                self._counters["bytes_read"] += len(chunk)
+                buffer += chunk
+                frames, consumed = decode_frames(bytes(buffer), self.num_samples)
+                self._counters["bytes_discarded"] += consumed - frames.nbytes
+                del buffer[:consumed]
+                if len(frames):
+                    if self.num_samples is None:
+                        self.num_samples = frames["samples"].shape[1]
+                    self._count_sequence(frames)
+                    pending.append(frames)
+                    deadline = deadline or time.monotonic() + self.batch_timeout
+                if pending and time.monotonic() >= deadline:
+                    pending, deadline = await self._flush(pending, partial=True), None
+                else:
+                    pending = await self._flush(pending, partial=False)
+                    if not pending:
+                        deadline = None
+            await self._flush(pending, partial=True)
+        finally:
+            if next_chunk is not None:
+                next_chunk.cancel()
+
+    async def _flush(self, pending, partial):
+        """Submits the pending frames in batches of at most batch_size; returns the frames left pending."""
+        if not pending:
+            return pending
+        frames = np.concatenate(pending)
+        end = len(frames) if partial else len(frames) - len(frames) % self.batch_size
+        for start in range(0, end, self.batch_size):
+            await self._submit(frames[start:min(start + self.batch_size, end)])
+        return [frames[end:]] if end < len(frames) else []
+
+    def _count_sequence(self, frames):
+        sequence = frames["sequence"].astype(np.int64)
+        if self._last_sequence is not None:
+            sequence = np.concatenate([[self._last_sequence], sequence])
+        step = np.diff(sequence) % 256
+        # a repeated sequence number is a duplicate (e.g. a retransmitted chunk), not 255 lost frames
+        self._counters["frames_duplicated"] += int(np.sum(step == 0))
+        self._counters["frames_lost"] += int(np.sum(np.maximum(step - 1, 0)))
+        self._counters["frames_received"] += len(frames)
+        self._last_sequence = int(sequence[-1])
+
+    async def _submit(self, batch):
+        if self._batches.full():
+            if self.lossless:
+                start = time.perf_counter()
+                await self._batches.put(batch)
+                self._counters["backpressure_time"] += time.perf_counter() - start
+                return
+            dropped = self._batches.get_nowait()
+            self._counters["frames_dropped"] += len(dropped)
+        self._batches.put_nowait(batch)
+        self._counters["queue_high_water"] = max(self._counters["queue_high_water"], self._batches.qsize())
+
+    async def _process(self):
+        # Up to `workers` batches run concurrently; results are published in arrival order
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Queue(maxsize=self.workers)
+        publisher = asyncio.create_task(self._publish(in_flight))
+        while (batch := await self._batches.get()) is not None:
+            start = time.perf_counter()
+            future = loop.run_in_executor(self._executor, self.processor, batch)
+            await in_flight.put((future, start))
+        await in_flight.put(None)
+        await publisher
+
+    async def _publish(self, in_flight):
+        while (item := await in_flight.get()) is not None:
+            future, start = item
+            result = await future
+            self._counters["processing_time"] += time.perf_counter() - start
+            self._counters["batches_processed"] += 1
+            for queue in self._subscribers:
+                if queue.full():
+                    queue.get_nowait()
+                    self._counters["results_dropped"] += 1
+                queue.put_nowait(result)
+            self._counters["results_published"] += 1
+
+
+def _format(result):
+    return (f"seq {result['sequence'][0]:3d}..{result['sequence'][-1]:3d}  "
+            f"range {np.mean(result['range']):7.2f} m  velocity {np.mean(result['velocity']):7.2f} m/s")
+
+
+async def main(path, follow=False):
+    # replaying a file should not lose frames; a live link should never stall
+    service = TelemetryService(file_source(path, follow=follow), lossless=not follow)
+    results = service.subscribe()
+
+    async def printer():
+        while True:
+            print(_format(await results.get()))
+
+    printing = asyncio.create_task(printer())
+    await service.run()
+    printing.cancel()
+    while not results.empty():
+        print(_format(results.get_nowait()))
+    print(service.stats())
+
+
+if __name__ == "__main__":
+    # python host_pipeline.py <capture file | pty | serial device> [--follow]
+    asyncio.run(main(sys.argv[1], follow="--follow" in sys.argv))
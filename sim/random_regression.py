@@ -0,0 +1,157 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sonic_sight.coverage import merge, report
+from sonic_sight.waves import failed_tests
+
+
+SIM_PATH = Path(__file__).resolve().parent
+
+# Module -> (cocotb test module, constrained-random test in it)
+MODULES = {
+    "divider": ("test_divider", "test_divider_random"),
+    "time_of_flight": ("test_time_of_flight", "test_time_of_flight_random"),
+    "sin_lut": ("test_sin_lut", "test_sin_lut_random"),
+    "transmit_beamformer": ("test_transmit_beamformer", "test_transmit_random_steering"),
+    "receive_beamformer": ("test_receive_beamformer", "test_receive_beamform_random"),
+}
+
+
+def shard_seeds(start, stop, shards):
+    """Splits seeds [start, stop) into at most shards contiguous (first, count) ranges."""
+    total = stop - start
+    shards = max(1, min(shards, total))
+    bounds = [start + total * i // shards for i in range(shards + 1)]
+    return [(first, last - first) for first, last in zip(bounds, bounds[1:])]
+
+
+def run_shard(test_module, test, first, count, work_dir, failures_path, coverage_dir, num_vectors=None,
+              timeout=None, build=None):
+    """
+    Runs one random test over seeds [first, first + count) in its own simulator process.
+
+    The test module's runner() builds and runs in work_dir; the seed range, vectors per seed,
+    the failure file and the coverage directory reach the test through the environment, and
+    build (a replayed seed's build directory) limits the runner to that build. The failure
+    rerun of sonic_sight.waves is off: it would run the failing seeds again and record them
+    twice. WAVES=1 still dumps every run.
+
+
+    Returns:
+    - result: dict with test, first, count, seconds, and status "pass", "fail" or "error".
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, TESTCASE=test, SONIC_SIGHT_SEED_START=str(first), SONIC_SIGHT_SEEDS=str(count),
+               SONIC_SIGHT_FAILED_SEEDS=str(failures_path.resolve()), SONIC_SIGHT_COVERAGE=str(coverage_dir.resolve()),
+               WAVES="1" if os.getenv("WAVES") == "1" else "0")
+    if num_vectors is not None:
+        env["SONIC_SIGHT_VECTORS"] = str(num_vectors)
+    if build is not None:
+        env["SONIC_SIGHT_BUILD"] = build
+    for stale in work_dir.glob("sim_build*/results.xml"):
+        stale.unlink()
+
+    start = time.perf_counter()
+    try:
+        process = subprocess.run([sys.executable, str(SIM_PATH / f"{test_module}.py")], cwd=work_dir, env=env,
+                                 capture_output=True, text=True, timeout=timeout)
+        (work_dir / "log.txt").write_text(process.stdout + process.stderr)
+    except subprocess.TimeoutExpired:
+        status = "error"
+    else:
+        results_xmls = list(work_dir.glob("sim_build*/results.xml"))
+        status = ("error" if not results_xmls else
+                  "fail" if any(failed_tests(results_xml) for results_xml in results_xmls) else "pass")
+    return dict(test=test, first=first, count=count, seconds=time.perf_counter() - start, status=status)
+
+
+def load_failures(path):
+    """Failing seeds recorded by the random tests, one dict per line of path."""
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def _seeds(text):
+    """"stop" or "start:stop"."""
+    if ":" in text:
+        start, stop = text.split(":")
+        return int(start), int(stop)
+    return 0, int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded, sharded constrained-random regression of the arithmetic modules.")
+    parser.add_argument("modules", nargs="*", help=f"modules to run (default: {', '.join(MODULES)})")
+    parser.add_argument("--seeds", type=_seeds, default=(0, 16), help="seed range, N or START:STOP (default 16)")
+    parser.add_argument("--shards", type=int, default=None, help="processes per module (default: CPU count)")
+    parser.add_argument("--jobs", type=int, default=None, help="shards run at once (default: CPU count)")
+    parser.add_argument("--vectors", type=int, default=None, help="vectors per seed (default: each test's own)")
+    parser.add_argument("--timeout", type=int, default=None, help="seconds per shard")
+    parser.add_argument("--out", type=Path, default=Path("random_regression"), help="work directory")
+    parser.add_argument("--replay", type=Path, default=None,
+                        help="rerun every seed recorded in this failures file, each in its own simulation")
+    args = parser.parse_args(argv)
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    failures_path = args.out / "failures.jsonl"
+    if args.replay:
+        by_test = {test: test_module for test_module, test in MODULES.values()}
+        jobs = [(record["test_module"], record["test"], record["seed"], 1,
+                 args.out / f"replay-{record['test']}-{record.get('build', 'all')}-{record['seed']}",
+                 record["vectors"], record.get("build"))
+                for record in load_failures(args.replay) if record["test"] in by_test]
+        failures_path = args.out / "replay_failures.jsonl"
+    else:
+        unknown = [module for module in args.modules if module not in MODULES]
+        if unknown:
+            parser.error(f"unknown modules {unknown}; choose from {list(MODULES)}")
+        jobs = []
+        for module in args.modules or MODULES:
+            test_module, test = MODULES[module]
+            for index, (first, count) in enumerate(shard_seeds(*args.seeds, args.shards or os.cpu_count())):
+                jobs.append((test_module, test, first, count, args.out / module / f"shard-{index:03d}", args.vectors,
+                             None))
+    failures_path.unlink(missing_ok=True)
+    coverage_dir = args.out / "coverage"
+    for stale in coverage_dir.glob("*.npz"):
+        stale.unlink()
+
+    start = time.perf_counter()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs or os.cpu_count()) as pool:
+        futures = [pool.submit(run_shard, test_module, test, first, count, work_dir, failures_path, coverage_dir,
+                               num_vectors, args.timeout, build)
+                   for test_module, test, first, count, work_dir, num_vectors, build in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"{result['test']:<32} seeds {result['first']}..{result['first'] + result['count'] - 1}: "
+                  f"{result['status']} in {result['seconds']:.0f} s", flush=True)
+    elapsed = time.perf_counter() - start
+
+    if any(coverage_dir.glob("*.npz")):
+        print(report(merge([coverage_dir])))
+    failures = load_failures(failures_path)
+    for record in failures:
+        print(f"FAIL {record['test']} seed {record['seed']} ({record.get('build', 'sim_build')}, {record['vectors']} vectors): "
+              f"{record['message']}")
+    errors = [result for result in results if result["status"] == "error"]
+    for result in errors:
+        print(f"ERROR {result['test']} seeds {result['first']}..{result['first'] + result['count'] - 1}: "
+              "simulation did not finish, see its log.txt")
+    seeds = sum(result["count"] for result in results)
+    print(f"{seeds} seeds in {elapsed:.0f} s ({seeds / elapsed if elapsed > 0 else 0.0:.1f} seeds/s), "
+          f"{len(failures)} failing" + (f", recorded in {failures_path}; replay with --replay {failures_path}"
+                                        if failures else ""))
+    return 1 if failures or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""
+Python models of the Sonic Sight signal chain, shared by the cocotb tests and host tools.
+
+Only NumPy is imported eagerly. scipy (doppler_shift_analysis) and matplotlib
+(sonic_sight.plotting) are imported on first use, so `import sonic_sight` from a cocotb
+test stays cheap; see `python -m sonic_sight.benchmark`.
+"""
+from .models import (
+    BIT_RESOLUTION,
+    OBJECT_VELOCITY,
+    PULSE_FREQUENCY,
+    SAMPLING_RATE,
+    SPEED_OF_SOUND,
+    TIME_DELAY,
+    adc_simulation,
+    calculate_distance,
+    calculate_velocity,
+    distort_frequency,
+    doppler_shift_analysis,
+    generate_doppler_shifted_pulse,
+    generate_pulse,
+    goertzel_peak_frequency,
+    goertzel_power,
+)
+from .waveforms import adc_waveforms, pack_complex, receiver_delays, sine_waveform
@@ -0,0 +1,233 @@
+import argparse
+import time
+
+import numpy as np
+
+
+# Array geometry and timing of transmit_beamformer.sv / receive_beamformer.sv
+ELEMENT_SPACING = 9              # mm
+SPEED_OF_SOUND = 343000          # mm/s
+CLK_FREQ = 100000000             # Hz, transmit offsets are in clock cycles
+SAMPLING_RATE = 1000000          # Hz, receive delays are in ADC samples
+PERIOD_IN_CLOCK_CYCLES = 2500    # transmit offsets wrap at one 40 kHz period
+SIN_WIDTH = 17
+PULSE_FREQUENCY = 40000
+
+DELAY_PER_TRANSMITTER_COMP = ELEMENT_SPACING * CLK_FREQ // SPEED_OF_SOUND
+SAMPLE_DELAY_PER_RECEIVER_COMP = ELEMENT_SPACING * SAMPLING_RATE // SPEED_OF_SOUND
+
+
+def sin_code(angle, sin_width=SIN_WIDTH, angle_frac_bits=0):
+    """
+    sin_lut outputs for angles in degrees, vectorized.
+
+    The angle is first rounded to the sin_lut input code (angle_frac_bits fractional bits),
+    then looked up in the whole-degree ROM and linearly interpolated exactly as the HDL does.
+
+
+    Returns:
+    - sin_value: int64 ndarray, |sin(angle)| with sin(90) = 2^(sin_width-1).
+    - sign_bit: bool ndarray, high for negative angles.
+    """
+    code = np.round(np.asarray(angle, dtype=float) * (1 << angle_frac_bits)).astype(np.int64)
+    magnitude = np.minimum(np.abs(code), 90 << angle_frac_bits)
+    degree = magnitude >> angle_frac_bits
+    frac = magnitude & ((1 << angle_frac_bits) - 1)
+    rom = np.floor(np.sin(np.radians(np.arange(92))) * (1 << (sin_width - 1)) + 0.5).astype(np.int64)
+    delta = np.where(degree == 90, 0, rom[np.minimum(degree + 1, 91)] - rom[degree])
+    step = (delta * frac + ((1 << angle_frac_bits) >> 1)) >> angle_frac_bits
+    return rom[degree] + step, code < 0
+
+
+def transmit_offsets(steering, num_transmitters=2, sin_width=SIN_WIDTH, quantized=True):
+    """
+    pwm default_offset of every transmitter, in clock cycles, for each steering angle.
+
+    Quantized offsets follow transmit_beamformer: the element delay times the sin_lut value,
+    shifted down by SIN_WIDTH-1 and reduced modulo one ultrasonic period. Unquantized offsets
+    are the ideal real-valued element delays without the modulo.
+
+
+    Returns:
+    - offsets: ndarray of shape (num_steering, num_transmitters), clock cycles.
+    """
+    steering = np.atleast_1d(np.asarray(steering, dtype=float))
+    position = np.arange(num_transmitters)
+    if not quantized:
+        return (ELEMENT_SPACING * CLK_FREQ / SPEED_OF_SOUND) * np.abs(np.sin(np.radians(steering)))[:, None] * \
+            np.where(steering[:, None] < 0, num_transmitters - 1 - position, position)
+    sin_value, sign_bit = sin_code(steering, sin_width)
+    # if propagating to the left, the rightmost transmitter gets the largest offset
+    element = np.where(sign_bit[:, None], num_transmitters - 1 - position, position)
+    product = (DELAY_PER_TRANSMITTER_COMP * element * sin_value[:, None]) >> (sin_width - 1)
+    return product % PERIOD_IN_CLOCK_CYCLES
+
+
+def receive_delays(steering, num_receivers=2, sin_width=SIN_WIDTH, quantized=True, element_spacing=ELEMENT_SPACING):
+    """
+    delay_samples of every receiver, in ADC samples, for each steering angle.
+
+    Quantized delays follow receive_beamformer: whole samples, masked to the buffer size.
+    Unquantized delays are the ideal real-valued element delays. element_spacing is the
+    receive_beamformer ELEMENT_SPACING parameter, in mm; it also sets the buffer size.
+
+
+    Returns:
+    - delays: ndarray of shape (num_steering, num_receivers), samples.
+    """
+    steering = np.atleast_1d(np.asarray(steering, dtype=float))
+    position = np.arange(num_receivers)
+    if not quantized:
+        return (element_spacing * SAMPLING_RATE / SPEED_OF_SOUND) * np.abs(np.sin(np.radians(steering)))[:, None] * \
+            np.where(steering[:, None] < 0, num_receivers - 1 - position, position)
+    sin_value, sign_bit = sin_code(steering, sin_width)
+    # if receiving from the left, the leftmost receiver is delayed most
+    element = np.where(sign_bit[:, None], num_receivers - 1 - position, position)
+    sample_delay = element_spacing * SAMPLING_RATE // SPEED_OF_SOUND
+    return ((sample_delay * element * sin_value[:, None]) >> (sin_width - 1)) & (buffer_size(num_receivers, element_spacing) - 1)
+
+
+def buffer_size(num_receivers=2, element_spacing=ELEMENT_SPACING):
+    """receive_beamformer BUFFER_SIZE: the largest delay in samples, rounded up to a power of two."""
+    max_delay = element_spacing * SAMPLING_RATE // SPEED_OF_SOUND * (num_receivers - 1)
+    return 1 << int(np.ceil(np.log2(max(max_delay, 2))))
+
+
+def array_factor(element_delays, angles, frequencies, element_spacing=ELEMENT_SPACING,
+                 speed_of_sound=SPEED_OF_SOUND):
+    """
+    Normalized array factor of a uniform line array over a steering x frequency x angle grid.
+
+    Element i sits at i * element_spacing, so a plane wave from a positive angle reaches the
+    highest index first. element_delays is the time each element's signal is delayed by
+    before summation (receive) or the negative of its emission lead (transmit), in seconds.
+    Per frequency this is one (steering x elements) @ (elements x angles) complex product.
+
+
+    Parameters:
+    - element_delays: ndarray (num_steering, num_elements), seconds.
+    - angles: ndarray (num_angles,), directions to evaluate, degrees off boresight.
+    - frequencies: ndarray (num_frequencies,), Hz.
+
+
+    Returns:
+    - pattern: complex ndarray (num_steering, num_frequencies, num_angles), 1 at full coherence.
+    """
+    element_delays = np.atleast_2d(element_delays)
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    num_elements = element_delays.shape[1]
+    # arrival time of a plane wave at each element relative to element 0
+    arrival = -element_spacing * np.arange(num_elements)[:, None] * np.sin(np.radians(angles))[None, :] / speed_of_sound
+    omega = 2j * np.pi * frequencies
+    steer = np.exp(-omega[None, :, None] * element_delays[:, None, :])     # (S, F, N)
+    geometry = np.exp(-omega[:, None, None] * arrival[None, :, :])           # (F, N, A)
+    return np.matmul(steer, geometry) / num_elements
+
+
+def beam_patterns(steering, angles, frequencies=PULSE_FREQUENCY, num_elements=2, sin_width=SIN_WIDTH,
+                  quantized=True):
+    """
+    Transmit, receive and two-way beam patterns of the HDL beamformers.
+
+    The transmit offsets make element i lead by offset cycles, which the array factor sees
+    as a delay of -offset / CLK_FREQ; receive delays are delays of delay / SAMPLING_RATE.
+
+
+    Returns:
+    - patterns: dict of magnitude ndarrays (num_steering, num_frequencies, num_angles) under
+      "transmit", "receive" and "two_way".
+    """
+    tx_delay = -transmit_offsets(steering, num_elements, sin_width, quantized) / CLK_FREQ
+    rx_delay = receive_delays(steering, num_elements, sin_width, quantized) / SAMPLING_RATE
+    transmit = np.abs(array_factor(tx_delay, angles, frequencies))
+    receive = np.abs(array_factor(rx_delay, angles, frequencies))
+    return {"transmit": transmit, "receive": receive, "two_way": transmit * receive}
+
+
+def main_lobe(pattern, angles, steering):
+    """
+    Direction of the pattern maximum, degrees, over the last axis.
+
+    Grating lobes of a sparse array can be exactly as strong as the main lobe; among maxima
+    within 1e-6 of the peak the one closest to the steering angle is taken.
+    """
+    angles = np.asarray(angles)
+    peak = pattern >= pattern.max(axis=-1, keepdims=True) * (1 - 1e-6)
+    distance = np.abs(angles - np.reshape(steering, np.shape(steering) + (1,) * (pattern.ndim - np.ndim(steering))))
+    return angles[np.argmin(np.where(peak, distance, np.inf), axis=-1)]
+
+
+def count_lobes(pattern, level_db=-1.0):
+    """
+    Number of local maxima within level_db of the pattern maximum, over the last axis.
+
+    A count above one means grating lobes (or an ambiguous, flat pattern) as strong as the
+    main lobe.
+    """
+    floor = pattern.max(axis=-1, keepdims=True) * 10 ** (level_db / 20)
+    padded = np.pad(pattern, [(0, 0)] * (pattern.ndim - 1) + [(1, 1)], constant_values=-np.inf)
+    peak = (pattern >= padded[..., :-2]) & (pattern > padded[..., 2:]) & (pattern >= floor)
+    return peak.sum(axis=-1)
+
+
+def pointing_report(steering, angles, frequencies=PULSE_FREQUENCY, **options):
+    """
+    Main-lobe direction, pointing error and lobe count of every pattern, per steering angle.
+
+
+    Returns:
+    - report: structured ndarray (num_steering, num_frequencies).
+    """
+    steering = np.atleast_1d(np.asarray(steering, dtype=float))
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    patterns = beam_patterns(steering, angles, frequencies, **options)
+    fields = [("steering", "f8"), ("frequency", "f8")]
+    for name in patterns:
+        fields += [(f"{name}_peak", "f8"), (f"{name}_error", "f8"), (f"{name}_lobes", "i4")]
+    report = np.zeros((len(steering), len(frequencies)), dtype=fields)
+    report["steering"] = steering[:, None]
+    report["frequency"] = frequencies[None, :]
+    for name, pattern in patterns.items():
+        report[f"{name}_peak"] = main_lobe(pattern, angles, steering)
+        report[f"{name}_error"] = report[f"{name}_peak"] - steering[:, None]
+        report[f"{name}_lobes"] = count_lobes(pattern)
+    return report
+
+
+def _floats(text):
+    return [float(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Beam patterns of the quantized transmit/receive beamformers.")
+    parser.add_argument("--steering", type=_floats, default=[-45.0, -30.0, -15.0, 0.0, 15.0, 30.0, 45.0],
+                        help="degrees, comma separated (use --steering=-30,0,30)")
+    parser.add_argument("--frequency", type=_floats, default=[PULSE_FREQUENCY], help="Hz, comma separated")
+    parser.add_argument("--elements", type=int, default=2)
+    parser.add_argument("--sin-width", type=int, default=SIN_WIDTH)
+    parser.add_argument("--resolution", type=float, default=0.1, help="angle grid step, degrees")
+    parser.add_argument("--ideal", action="store_true", help="unquantized delays")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N",
+                        help="also time N steering angles over the same grid")
+    args = parser.parse_args(argv)
+
+    angles = np.arange(-90, 90 + args.resolution / 2, args.resolution)
+    options = dict(num_elements=args.elements, sin_width=args.sin_width, quantized=not args.ideal)
+    report = pointing_report(args.steering, angles, args.frequency, **options)
+    print(f"{'steer':>6} {'freq':>7} " + " ".join(f"{name:>22}" for name in ("transmit", "receive", "two_way")))
+    for row in report.reshape(-1):
+        print(f"{row['steering']:6.1f} {row['frequency']:7.0f} " + " ".join(
+            f"{row[f'{name}_peak']:7.1f} {row[f'{name}_error']:7.1f} {row[f'{name}_lobes']:6d}"
+            for name in ("transmit", "receive", "two_way")))
+
+    if args.benchmark:
+        steering = np.linspace(-90, 90, args.benchmark)
+        start = time.perf_counter()
+        beam_patterns(steering, angles, args.frequency, **options)
+        elapsed = time.perf_counter() - start
+        print(f"{args.benchmark} steering x {len(args.frequency)} frequencies x {len(angles)} angles "
+              f"in {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+SIM_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("scipy", "matplotlib")
+
+
+def import_time(statement, repeat=5):
+    """
+    Best-of-repeat wall time in seconds of running statement in a fresh interpreter.
+
+    Each run happens in its own process so nothing is served from sys.modules.
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - start)"
+    )
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=SIM_DIR, check=True,
+                             capture_output=True, text=True).stdout
+        times.append(float(out.split()[-1]))
+    return min(times)
+
+
+def heavy_modules_loaded(statement):
+    """Returns which of HEAVY_MODULES are in sys.modules after running statement."""
+    code = f"import sys; {statement}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=SIM_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    return out.split()
+
+
+def main(repeat=5):
+    numpy_time = import_time("import numpy", repeat)
+    package_time = import_time("import numpy; import sonic_sight", repeat)
+    print(f"import numpy:              {numpy_time * 1e3:7.1f} ms")
+    print(f"import numpy, sonic_sight: {package_time * 1e3:7.1f} ms "
+          f"(sonic_sight itself {(package_time - numpy_time) * 1e3:.1f} ms)")
+    print(f"scipy + matplotlib:        {import_time('import scipy.fft, matplotlib.pyplot', repeat) * 1e3:7.1f} ms "
+          "(deferred until first use)")
+    loaded = heavy_modules_loaded("import sonic_sight")
+    if loaded:
+        raise SystemExit(f"`import sonic_sight` pulled in {', '.join(loaded)}")
+
+
+if __name__ == "__main__":
+    main()
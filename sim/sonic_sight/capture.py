@@ -0,0 +1,346 @@
+"""
+Raw ADC capture files and their replay into the Python model of the receive chain.
+
+A capture is a 64-byte little-endian header followed by interleaved int16 samples, one
+row of `channels` ADC codes per sample period:
+
+    offset  type     field
+    0       char[8]  magic, b"SSCAPTR1"
+    8       uint16   channels
+    10      uint16   bit_width      ADC resolution, codes as read from the ADC
+    12      uint32   header_size    offset of the first sample (64)
+    16      float64  sample_rate    Hz
+    24      float64  angle          steering angle the capture was taken at, degrees
+    32      uint64   num_samples    sample periods; 0 while a recording is still open
+    40      -        reserved, zero
+
+Captures are opened with np.memmap, so slicing a multi-gigabyte recording only pages in
+the samples that are read.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .array_factor import receive_delays, sin_code
+from .models import calculate_velocity, doppler_shift_analysis
+
+
+MAGIC = b"SSCAPTR1"
+HEADER_SIZE = 64
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"), ("channels", "<u2"), ("bit_width", "<u2"), ("header_size", "<u4"),
+    ("sample_rate", "<f8"), ("angle", "<f8"), ("num_samples", "<u8"),
+])
+SAMPLE_DTYPE = np.dtype("<i2")
+
+# Receive chain of top_level.sv
+ADC_IN_BITS = 10           # adc_in = bits [11:2] of every ADC word (adc_capture SAMPLE_MSB:SAMPLE_LSB)
+ECHO_THRESHOLD = 200       # top_level ECHO_THRESHOLD, aggregated waveform counts
+FFT_SIZE = 2048
+BIN_LOW = 41
+BIN_HIGH = 119
+PULSE_FREQUENCY = 40000
+SPEED_OF_SOUND = 343
+
+
+def _header(channels, bit_width, sample_rate, angle, num_samples):
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (MAGIC, channels, bit_width, HEADER_SIZE, sample_rate, angle, num_samples)
+    return header.tobytes().ljust(HEADER_SIZE, b"\0")
+
+
+class CaptureWriter:
+    """
+    Appends samples to a new capture file; usable as a context manager.
+
+    num_samples is written into the header on close, so a recording that is cut short still
+    opens (open_capture falls back to the file size).
+    """
+
+    def __init__(self, path, channels, sample_rate, bit_width=12, angle=0.0):
+        self.path = Path(path)
+        self.channels = channels
+        self.num_samples = 0
+        self._file = open(self.path, "wb")
+        self._file.write(_header(channels, bit_width, sample_rate, angle, 0))
+        self._num_samples_offset = HEADER_DTYPE.fields["num_samples"][1]
+
+    def write(self, samples):
+        """Appends samples of shape (n, channels), ADC codes."""
+        samples = np.asarray(samples)
+        if samples.ndim != 2 or samples.shape[1] != self.channels:
+            raise ValueError(f"expected samples of shape (n, {self.channels}), got {samples.shape}")
+        self._file.write(np.ascontiguousarray(samples, dtype=SAMPLE_DTYPE).tobytes())
+        self.num_samples += len(samples)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(self._num_samples_offset)
+        self._file.write(np.uint64(self.num_samples).astype("<u8").tobytes())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_capture(path, samples, sample_rate, bit_width=12, angle=0.0):
+    """Writes samples of shape (num_samples, channels) as a capture file."""
+    samples = np.asarray(samples)
+    with CaptureWriter(path, samples.shape[1], sample_rate, bit_width, angle) as writer:
+        writer.write(samples)
+
+
+class Capture:
+    """
+    An open capture file.
+
+    Attributes:
+    - path, channels, bit_width, sample_rate, angle, num_samples: from the header.
+    - samples: read-only np.memmap of shape (num_samples, channels), int16 ADC codes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        header = np.fromfile(self.path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{self.path} is not a capture file")
+        header = header[0]
+        self.channels = int(header["channels"])
+        self.bit_width = int(header["bit_width"])
+        self.sample_rate = float(header["sample_rate"])
+        self.angle = float(header["angle"])
+        header_size = int(header["header_size"])
+
+        # a recording that was not closed has num_samples 0: trust the file size instead
+        available = (os.path.getsize(self.path) - header_size) // (SAMPLE_DTYPE.itemsize * self.channels)
+        self.num_samples = min(int(header["num_samples"]), available) or available
+        self.samples = np.memmap(self.path, dtype=SAMPLE_DTYPE, mode="r", offset=header_size,
+                                 shape=(self.num_samples, self.channels))
+
+    def __len__(self):
+        return self.num_samples
+
+    def __repr__(self):
+        return (f"Capture({str(self.path)!r}, channels={self.channels}, bit_width={self.bit_width}, "
+                f"sample_rate={self.sample_rate:g}, angle={self.angle:g}, num_samples={self.num_samples})")
+
+    def channel(self, index):
+        """Strided, zero-copy view of one channel."""
+        return self.samples[:, index]
+
+    def blocks(self, start=0, stop=None, size=65536):
+        """Yields (offset, samples) views of at most size sample periods over [start, stop)."""
+        stop = self.num_samples if stop is None else min(stop, self.num_samples)
+        for offset in range(start, stop, size):
+            yield offset, self.samples[offset:min(offset + size, stop)]
+
+
+def open_capture(path):
+    """Opens a capture file for memory-mapped reading."""
+    return Capture(path)
+
+
+def synthetic_capture(path, num_samples=20000, angle=20.0, velocity=10.0, amplitude=0.6, arrival=3000,
+                      snr=40.0, channels=2, sample_rate=1000000, bit_width=12, seed=0):
+    """
+    Writes a capture of a Doppler-shifted echo arriving at the given angle, for tests and demos.
+
+    The echo (simulation.py convention, positive velocity is towards the observer) starts at
+    sample arrival on the receiver it reaches first, the others delayed by the array
+    geometry; codes are offset binary around mid-scale like the ADC's.
+
+
+    Returns:
+    - capture: the written file, opened with open_capture.
+    """
+    rng = np.random.default_rng(seed)
+    frequency = PULSE_FREQUENCY * SPEED_OF_SOUND / (SPEED_OF_SOUND - velocity)
+    # a wave from the right (positive angle) reaches the highest receiver first
+    element_delay = -9 * sample_rate / 343000 * np.sin(np.radians(angle)) * np.arange(channels)
+    element_delay -= element_delay.min()
+    t = np.arange(num_samples)[:, None] - arrival - element_delay[None, :]
+    echo = amplitude * np.sin(2 * np.pi * frequency * t / sample_rate) * (t >= 0)
+    noise = rng.normal(0, amplitude / np.sqrt(2) / 10 ** (snr / 20), echo.shape)
+    full_scale = 1 << (bit_width - 1)
+    codes = np.clip(np.round((echo + noise + 1) * full_scale), 0, 2 * full_scale - 1)
+    write_capture(path, codes, sample_rate, bit_width, angle)
+    return open_capture(path)
+
+
+# Replay into the model of top_level's receive chain
+def adc_in(samples, bit_width):
+    """top_level's adc_in: the ADC_IN_BITS most significant bits of every code."""
+    return np.asarray(samples, dtype=np.int64) >> (bit_width - ADC_IN_BITS)
+
+
+def aggregate(samples, delays, fill=0):
+    """
+    receive_beamformer output for a block of adc_in samples.
+
+    Output n is the average of receiver i at sample n - delays[i], truncated to 16 bits;
+    samples before the block start read as fill: zero, as after a reset, by default.
+
+
+    Parameters:
+    - samples: ndarray (n, num_receivers) of adc_in values.
+    - delays: ndarray (num_receivers,), whole samples.
+    - fill: adc_in value of the samples before the block.
+    """
+    n, num_receivers = samples.shape
+    index = np.arange(n)[:, None] - np.asarray(delays)[None, :]
+    aligned = np.where(index >= 0, np.take_along_axis(samples, np.maximum(index, 0), axis=0), fill)
+    return (aligned.sum(axis=1) // num_receivers) & 0xFFFF
+
+
+def doppler(frame, sample_rate=1000000, bin_low=BIN_LOW, bin_high=BIN_HIGH):
+    """
+    fft_wrapper / velocity result for one FFT_SIZE frame of receiver_data.
+
+
+    Returns:
+    - peak_frequency: int, Hz, as fft_wrapper reports it.
+    - velocity_result: int, |velocity| in m/s as the velocity divider computes it.
+    - towards_observer: bool.
+    """
+    peak_frequency, velocity_result, towards_observer = doppler_frames(np.asarray(frame)[None], sample_rate,
+                                                                       bin_low, bin_high)
+    return int(peak_frequency[0]), int(velocity_result[0]), bool(towards_observer[0])
+
+
+def doppler_frames(frames, sample_rate=1000000, bin_low=BIN_LOW, bin_high=BIN_HIGH):
+    """
+    doppler() of every row of frames, (num_frames, FFT_SIZE), with one batched FFT.
+
+
+    Returns:
+    - peak_frequency, velocity_result, towards_observer: ndarrays (num_frames,).
+    """
+    data = np.asarray(frames, dtype=np.int64).astype(np.int16)    # fftmain reads signed samples
+    spectrum = np.abs(np.fft.fft(data, FFT_SIZE, axis=-1)[:, bin_low:bin_high + 1])
+    peak_frequency = ((bin_low + np.argmax(spectrum, axis=-1)) * int(sample_rate)) >> 11
+    towards_observer = peak_frequency < PULSE_FREQUENCY
+    velocity_result = np.abs(PULSE_FREQUENCY - peak_frequency) * SPEED_OF_SOUND // peak_frequency
+    return peak_frequency, velocity_result, towards_observer
+
+
+def aggregated_window(capture, start, stop, sin_width=17, after_reset=False):
+    """
+    Modelled receive_beamformer output for samples [start, stop) of a capture.
+
+    Receivers are delay-and-summed with the HDL's delays for the capture's angle. The
+    longest delay's worth of samples before start is read as history, unless after_reset,
+    which models a beamformer reset just before start (empty buffers, read as zero).
+    History before the first sample of the capture reads as mid-scale, a quiet input.
+    """
+    delays = receive_delays(capture.angle, capture.channels, sin_width)[0]
+    first = start if after_reset else max(start - int(delays.max()), 0)
+    block = adc_in(capture.samples[first:stop], capture.bit_width)
+    fill = 0 if after_reset else 1 << (ADC_IN_BITS - 1)
+    return aggregate(block, delays, fill)[start - first:]
+
+
+REPLAY_DTYPE = np.dtype([
+    ("start", "i8"), ("echo_index", "i8"), ("onset_index", "i8"), ("peak_frequency", "i8"),
+    ("velocity_result", "i8"), ("towards_observer", "?"),
+    ("model_frequency", "f8"), ("model_velocity", "f8"),
+])
+
+
+def replay_model(capture, start=0, stop=None, frame_size=FFT_SIZE, echo_threshold=ECHO_THRESHOLD,
+                 onset_threshold=ECHO_THRESHOLD, sin_width=17):
+    """
+    Streams a capture through the modelled receive chain, one FFT frame at a time.
+
+    Each frame is an aggregated_window read straight from the memory map, so memory stays
+    bounded by one frame however long the capture is.
+
+    Every frame gets two echo detectors. echo_index is top_level's: the zero-extended
+    aggregate compared as aggregated_waveform > ECHO_THRESHOLD (active_pulse, which gates
+    it, is not in a capture). ADC codes are offset binary, so on a quiet input idling at
+    mid-scale it fires on a frame's first sample. onset_index is not the RTL's: the first
+    sample whose aggregate lies more than onset_threshold from mid-scale, which finds where
+    an echo starts in a capture.
+
+    Every frame gets two Doppler results: the HDL's (fft_wrapper's integer peak over
+    BIN_LOW..BIN_HIGH and the velocity divider, as the RTL replay tests check), and the
+    floating-point chain of simulation.py (models.doppler_shift_analysis, a windowed FFT
+    over the whole spectrum, and models.calculate_velocity, positive towards the observer).
+
+
+    Returns:
+    - frames: structured ndarray of REPLAY_DTYPE, one row per whole frame in [start, stop):
+      frame start sample, first sample of the frame each echo detector fires on (-1 if
+      none), the HDL Doppler result and the model's peak frequency and velocity.
+    """
+    midscale = 1 << (ADC_IN_BITS - 1)
+    stop = capture.num_samples if stop is None else min(stop, capture.num_samples)
+    starts = range(start, stop - frame_size + 1, frame_size)
+    frames = np.zeros(len(starts), dtype=REPLAY_DTYPE)
+    for row, frame_start in zip(frames, starts):
+        frame = aggregated_window(capture, frame_start, frame_start + frame_size, sin_width)
+        over = np.flatnonzero(frame > echo_threshold)
+        onset = np.flatnonzero(np.abs(frame - midscale) > onset_threshold)
+        row["start"] = frame_start
+        row["echo_index"] = frame_start + over[0] if len(over) else -1
+        row["onset_index"] = frame_start + onset[0] if len(onset) else -1
+        row["peak_frequency"], row["velocity_result"], row["towards_observer"] = doppler(frame, capture.sample_rate)
+        freqs, magnitude = doppler_shift_analysis(frame - midscale, sampling_rate=capture.sample_rate)
+        row["model_frequency"] = freqs[np.argmax(magnitude)]
+        row["model_velocity"] = calculate_velocity(row["model_frequency"] - PULSE_FREQUENCY)
+    return frames
+
+
+def steering_inputs(capture, sin_width=17):
+    """(sin_value, sign_bit) that sin_lut gives receive_beamformer for the capture's angle."""
+    sin_value, sign_bit = sin_code(round(capture.angle), sin_width)
+    return int(sin_value), int(sign_bit)
+
+
+def replay_source(cache_dir=None, **synthetic):
+    """
+    The capture replay tests run on: $SONIC_SIGHT_CAPTURE if set, otherwise a
+    synthetic_capture(**synthetic) written to cache_dir (default: the golden vector cache).
+    """
+    path = os.getenv("SONIC_SIGHT_CAPTURE")
+    if path:
+        return open_capture(path)
+    from .golden import CACHE_DIR, cache_key
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"synthetic-{cache_key('synthetic_capture', synthetic)}.sscap"
+    if not path.exists():
+        staging = path.with_suffix(f".{os.getpid()}.tmp")
+        synthetic_capture(staging, **synthetic)
+        os.replace(staging, path)
+    return open_capture(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a raw ADC capture through the modelled receive chain.")
+    parser.add_argument("path", help="capture file")
+    parser.add_argument("--start", type=int, default=0, help="first sample")
+    parser.add_argument("--stop", type=int, default=None, help="last sample (exclusive)")
+    parser.add_argument("--echo-threshold", type=int, default=ECHO_THRESHOLD, help="top_level's ECHO_THRESHOLD")
+    parser.add_argument("--onset-threshold", type=int, default=ECHO_THRESHOLD,
+                        help="distance from mid-scale that marks an echo onset")
+    args = parser.parse_args(argv)
+
+    capture = open_capture(args.path)
+    print(capture)
+    print(f"{'start':>10} {'echo':>10} {'onset':>10} {'peak_hz':>8} {'m/s':>5} {'towards':>7} {'model_hz':>9} "
+          f"{'model_m/s':>9}")
+    for row in replay_model(capture, args.start, args.stop, echo_threshold=args.echo_threshold,
+                            onset_threshold=args.onset_threshold):
+        print(f"{row['start']:10d} {row['echo_index']:10d} {row['onset_index']:10d} {row['peak_frequency']:8d} "
+              f"{row['velocity_result']:5d} {int(row['towards_observer']):7d} {row['model_frequency']:9.1f} "
+              f"{row['model_velocity']:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Functional coverage: hit counts over fixed bins, sampled once per transaction.
+
+A Covergroup holds Coverpoints, each an int64 array of hit counts over bin edges, and
+crosses of two points as 2-D arrays. sample() takes scalars or whole arrays of
+transactions (for example one seed's operands) and updates every count with one
+np.bincount, so tests sample at transaction boundaries only, never per clock.
+
+Groups register themselves on creation. save() writes every registered group to
+$SONIC_SIGHT_COVERAGE/<test module>-<pid>.npz when that directory is set; install()
+has it run once, when the simulation's Python exits, and sonic_sight.testbench calls
+install() on import, so tests only sample. Files from parallel runs merge by adding
+counts (merge()), and
+
+    python -m sonic_sight.coverage <files or directories> [--out merged.npz]
+
+prints the coverage of every point and cross and lists its holes.
+"""
+import argparse
+import atexit
+import os
+from pathlib import Path
+
+import cocotb
+import numpy as np
+
+
+GROUPS = {}
+_installed = False
+
+
+class Coverpoint:
+    """
+    Hit counts of one sampled value.
+
+
+    Parameters:
+    - name: value name, the keyword sample() takes it by.
+    - edges: ascending bin edges; bin i counts values in [edges[i], edges[i + 1]).
+      Values outside every bin are not counted.
+    """
+
+    def __init__(self, name, edges):
+        self.name = name
+        self.edges = np.asarray(edges, dtype=float)
+        self.hits = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def bins(self, values):
+        """Bin index of every value, -1 outside the bins."""
+        index = np.searchsorted(self.edges, np.asarray(values, dtype=float), side="right") - 1
+        return np.where(index < len(self.hits), index, -1)
+
+    def labels(self):
+        """One label per bin: the value for unit-wide integer bins, the range otherwise."""
+        def number(x):
+            return str(int(x)) if x == int(x) else f"{x:g}"
+        return [number(low) if high - low == 1 and low == int(low) else f"[{number(low)}, {number(high)})"
+                for low, high in zip(self.edges[:-1], self.edges[1:])]
+
+
+class Covergroup:
+    """
+    Coverpoints sampled together, and crosses between pairs of them.
+
+
+    Parameters:
+    - name: group name, unique among registered groups.
+    - points: Coverpoints.
+    - crosses: (point name, point name) pairs whose bin combinations are counted.
+    """
+
+    def __init__(self, name, *points, crosses=()):
+        self.name = name
+        self.points = {point.name: point for point in points}
+        self.crosses = {pair: np.zeros((len(self.points[pair[0]].hits), len(self.points[pair[1]].hits)),
+                                       dtype=np.int64) for pair in crosses}
+        GROUPS[name] = self
+
+    def sample(self, **values):
+        """Counts one transaction per element of the values, given as scalars or equal-length arrays."""
+        index = {name: np.atleast_1d(self.points[name].bins(value)) for name, value in values.items()}
+        for name, bins in index.items():
+            hits = self.points[name].hits
+            hits += np.bincount(bins[bins >= 0], minlength=len(hits))
+        for (first, second), hits in self.crosses.items():
+            if first in index and second in index:
+                a, b = np.broadcast_arrays(index[first], index[second])
+                both = (a >= 0) & (b >= 0)
+                hits += np.bincount(a[both] * hits.shape[1] + b[both], minlength=hits.size).reshape(hits.shape)
+
+    def arrays(self):
+        """Counts and bin edges as a flat dict of arrays, keyed "group/point" and "group/point/edges"."""
+        arrays = {}
+        for name, point in self.points.items():
+            arrays[f"{self.name}/{name}"] = point.hits
+            arrays[f"{self.name}/{name}/edges"] = point.edges
+        for (first, second), hits in self.crosses.items():
+            arrays[f"{self.name}/{first}*{second}"] = hits
+        return arrays
+
+
+# Bins over the signals the testbenches drive and observe
+STEERING = Covergroup(
+    "steering",
+    Coverpoint("magnitude", np.append(np.arange(0, 91, 10), 91)),   # |angle|, degrees; 90 on its own
+    Coverpoint("sign_bit", [0, 1, 2]),
+    crosses=[("magnitude", "sign_bit")],
+)
+FFT_PEAK = Covergroup(
+    "fft_peak",
+    Coverpoint("bin", np.arange(41, 121)),                              # BIN_LOW..BIN_HIGH
+)
+DIVIDER = Covergroup(
+    "divider",
+    Coverpoint("quotient", np.concatenate(([0], 2.0 ** np.arange(33)))),  # 0, then one bin per bit length
+    Coverpoint("remainder_zero", [0, 1, 2]),
+    Coverpoint("error", [0, 1, 2]),
+    crosses=[("quotient", "remainder_zero")],
+)
+EVT_COUNTER = Covergroup(
+    "evt_counter",
+    Coverpoint("wrap", [0, 1, 2]),                                      # event that wraps to zero
+    Coverpoint("offset", [0, 1, 2 ** 32]),                              # reset offset zero / non-zero
+)
+
+
+def steering_magnitude(sin_value, sin_width=17):
+    """|angle| in degrees of a sin_lut sin_value, for STEERING."""
+    return np.degrees(np.arcsin(np.minimum(np.asarray(sin_value) / (1 << (sin_width - 1)), 1)))
+
+
+def peak_bin(frequency, sample_rate=1000000, fft_size=2048):
+    """FFT bin of a peak frequency, for FFT_PEAK."""
+    return np.round(np.asarray(frequency) * fft_size / sample_rate).astype(np.int64)
+
+
+def save(directory=None):
+    """Writes every registered group to <directory or $SONIC_SIGHT_COVERAGE>/<test module>-<pid>.npz."""
+    directory = directory or os.getenv("SONIC_SIGHT_COVERAGE")
+    if not directory:
+        return None
+    path = Path(directory) / f"{os.getenv('MODULE', 'coverage')}-{os.getpid()}.npz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {}
+    for group in GROUPS.values():
+        arrays.update(group.arrays())
+    np.savez(path.with_suffix(".tmp.npz"), **arrays)
+    os.replace(path.with_suffix(".tmp.npz"), path)
+    return path
+
+
+def install():
+    """
+    Registers save() to run at interpreter exit, after the last test of the simulation.
+
+    Does nothing outside a simulator: the runner process imports the test module too.
+    """
+    global _installed
+    if not _installed and cocotb.SIM_NAME:
+        _installed = True
+        atexit.register(save)
+
+
+def merge(paths):
+    """
+    Adds up coverage files, expanding directories to the .npz files in them.
+
+
+    Returns:
+    - arrays: dict like Covergroup.arrays(), counts summed over every file.
+    """
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.glob("*.npz")) if path.is_dir() else [path]
+    merged = {}
+    for path in files:
+        with np.load(path) as data:
+            for key in data.files:
+                if key not in merged:
+                    merged[key] = data[key].copy()
+                elif key.endswith("/edges"):
+                    if not np.array_equal(merged[key], data[key]):
+                        raise ValueError(f"{path}: bins of {key[:-len('/edges')]} differ from the other files")
+                else:
+                    merged[key] += data[key]
+    return merged
+
+
+def _labels(arrays, group, point):
+    edges = arrays[f"{group}/{point}/edges"]
+    return Coverpoint(point, edges).labels()
+
+
+def report(arrays, max_holes=20):
+    """Coverage of every point and cross, and the first max_holes empty bins of each."""
+    rows = []
+    sampled = {key.split("/")[0] for key, hits in arrays.items() if not key.endswith("/edges") and hits.any()}
+    for key, hits in arrays.items():
+        if key.endswith("/edges"):
+            continue
+        group, name = key.split("/")
+        if group not in sampled:
+            if f"{group}: not sampled" not in rows:
+                rows.append(f"{group}: not sampled")
+            continue
+        if "*" in name:
+            first, second = name.split("*")
+            first_labels, second_labels = _labels(arrays, group, first), _labels(arrays, group, second)
+            holes = [f"{first}={first_labels[i]} {second}={second_labels[j]}" for i, j in np.argwhere(hits == 0)]
+        else:
+            labels = _labels(arrays, group, name)
+            holes = [labels[i] for i in np.flatnonzero(hits == 0)]
+        covered = hits.size - len(holes)
+        rows.append(f"{key:<32} {covered:>5}/{hits.size:<5} {100 * covered / hits.size:6.1f}%  {int(hits.sum())} hits")
+        if holes:
+            rows.append("    holes: " + ", ".join(holes[:max_holes]) +
+                        (f", ... {len(holes) - max_holes} more" if len(holes) > max_holes else ""))
+    return "\n".join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merges functional coverage files and reports holes.")
+    parser.add_argument("paths", nargs="+", help=".npz coverage files or directories of them")
+    parser.add_argument("--out", type=Path, default=None, help="write the merged coverage here")
+    parser.add_argument("--max-holes", type=int, default=20, help="holes listed per point or cross")
+    args = parser.parse_args(argv)
+
+    arrays = merge(args.paths)
+    if args.out:
+        np.savez(args.out, **arrays)
+    print(report(arrays, args.max_holes))
+
+
+if __name__ == "__main__":
+    main()
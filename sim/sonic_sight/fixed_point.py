@@ -0,0 +1,265 @@
+import argparse
+import itertools
+import math
+
+import numpy as np
+
+from .array_factor import sin_code
+
+
+# Widths of the current design
+BASELINE = dict(
+    adc_bits=12,          # ADC resolution (simulation.BIT_RESOLUTION)
+    adc_keep=10,          # bits kept by top_level's ADC_SAMPLE_MSB:ADC_SAMPLE_LSB = [11:2] slice
+    sin_width=17,         # sin_lut / beamformer SIN_WIDTH
+    aggregate_width=16,   # receive_beamformer aggregated_waveform
+    fft_in=16,            # fft_wrapper input (real part of sample_in)
+    fft_out=22,           # fftmain output per component
+)
+
+ADC_RATE = 1000000
+FFT_SIZE = 2048
+BIN_LOW = 41
+BIN_HIGH = 119
+PULSE_FREQUENCY = 40000
+SPEED_OF_SOUND = 343
+ECHO_THRESHOLD = 200       # top_level ECHO_THRESHOLD, counts of the kept ADC bits
+ALIGNMENTS = ("rtl", "msb")
+SAMPLE_DELAY_PER_RECEIVER = 9 * ADC_RATE / 343000   # element spacing in samples, receive_beamformer
+NUM_RECEIVERS = 2
+BIN_VELOCITY = ADC_RATE / FFT_SIZE * SPEED_OF_SOUND / PULSE_FREQUENCY  # m/s per FFT bin
+
+# DSP48E1 multiplier port widths and BRAM18 size on the Spartan-7
+DSP_A = 25
+DSP_B = 18
+BRAM18_BITS = 18432
+
+
+def quantize(x, bits):
+    """Signed, rounded, saturating quantization of x in [-1, 1] to bits."""
+    full_scale = 2 ** (bits - 1) - 1
+    return np.clip(np.round(x * full_scale), -full_scale - 1, full_scale).astype(np.int64)
+
+
+def wrap(x, bits):
+    """Two's complement truncation of integers to bits, as assigning to a narrower logic does."""
+    half = 1 << (bits - 1)
+    return ((x + half) & ((1 << bits) - 1)) - half
+
+
+def offset_binary(x, bits):
+    """ADC codes of x in [-1, 1]: rounded, offset binary around mid-scale, saturating at 0 and 2^bits - 1."""
+    full_scale = 1 << (bits - 1)
+    return np.clip(np.round((x + 1) * full_scale), 0, 2 * full_scale - 1).astype(np.int64)
+
+
+def rescale(x, from_bits, to_bits):
+    """Moves integers from a from_bits to a to_bits word, dropping LSBs when narrowing."""
+    shift = from_bits - to_bits
+    return x >> shift if shift >= 0 else x << -shift
+
+
+def make_trials(num_trials=256, seed=0, snr=30.0, max_velocity=40.0, max_angle=45.0,
+                amplitude=(0.2, 0.9), max_delay=1000):
+    """
+    Draws random targets and the analog two-receiver waveforms they produce.
+
+
+    Returns:
+    - trials: dict with arrays velocity (m/s, towards positive), angle (deg), amplitude,
+      arrival (samples) and received, shape (num_trials, NUM_RECEIVERS, max_delay + 2 FFT_SIZE).
+    """
+    rng = np.random.default_rng(seed)
+    velocity = rng.uniform(-max_velocity, max_velocity, num_trials)
+    angle = rng.uniform(-max_angle, max_angle, num_trials)
+    gain = rng.uniform(*amplitude, num_trials)
+    arrival = rng.uniform(0, max_delay, num_trials)
+
+    frequency = PULSE_FREQUENCY * SPEED_OF_SOUND / (SPEED_OF_SOUND - velocity)
+    num_samples = max_delay + 2 * FFT_SIZE
+    element_delay = SAMPLE_DELAY_PER_RECEIVER * np.sin(np.radians(angle))[:, None] * np.arange(NUM_RECEIVERS)
+    t = np.arange(num_samples)[None, None, :] - (arrival[:, None] + element_delay)[:, :, None]
+    echo = gain[:, None, None] * np.sin(2 * np.pi * frequency[:, None, None] * t / ADC_RATE) * (t >= 0)
+    noise = rng.normal(0, amplitude[1] / np.sqrt(2) / 10 ** (snr / 20), echo.shape)
+    return dict(velocity=velocity, angle=angle, amplitude=gain, arrival=arrival,
+                received=np.clip(echo + noise, -1, 1))
+
+
+def run_chain(trials, adc_bits, adc_keep, sin_width, aggregate_width, fft_in, fft_out,
+              echo_threshold=ECHO_THRESHOLD, alignment="rtl", bin_low=BIN_LOW, bin_high=BIN_HIGH):
+    """
+    Fixed-point model of ADC -> receive beamformer -> echo detection -> FFT Doppler search,
+    vectorized over trials.
+
+    alignment "rtl" is top_level as built: offset-binary ADC codes, the kept slice
+    zero-extended into aggregate_width (GEN_ADC_IN), an echo where the unsigned aggregate
+    exceeds echo_threshold, and the aggregate read as signed by the FFT. "msb" is the
+    alternative of removing mid-scale and MSB-aligning the kept bits in aggregate_width;
+    its echo is |aggregate| over echo_threshold scaled by the same alignment.
+
+    The FFT is modelled as exact arithmetic on its quantized input followed by keeping the
+    fft_out most significant bits of the full log2(FFT_SIZE) growth; internal stage rounding
+    and twiddle precision are not modelled.
+
+
+    Returns:
+    - measured_range_error: ndarray (num_trials,), metres, NaN where nothing was detected.
+    - measured_velocity: ndarray (num_trials,), m/s, NaN where nothing was detected.
+    """
+    received = trials["received"]
+    num_trials, num_receivers, num_samples = received.shape
+
+    # ADC and the [adc_bits-1 : adc_bits-adc_keep] slice
+    if alignment == "rtl":
+        samples = offset_binary(received, adc_bits) >> (adc_bits - adc_keep)
+    else:
+        samples = rescale(quantize(received, adc_bits), adc_bits, adc_keep)
+
+    # Steering delays from the sin_lut value, then delay-and-sum
+    sin_q, _ = sin_code(trials["angle"], sin_width)
+    delay_comp = int(SAMPLE_DELAY_PER_RECEIVER)
+    delays = (delay_comp * np.arange(num_receivers)[None, :] * sin_q[:, None]) >> (sin_width - 1)
+    delays = np.where(trials["angle"][:, None] < 0, -delays, delays)
+    delays -= delays.min(axis=1, keepdims=True)
+    index = np.minimum(np.arange(num_samples)[None, None, :] + delays[:, :, None], num_samples - 1)
+    aligned = np.take_along_axis(samples, index, axis=2)
+    if alignment == "rtl":
+        aggregated = (aligned.sum(axis=1) // num_receivers) & ((1 << aggregate_width) - 1)
+        over = aggregated > echo_threshold
+    else:
+        aggregated = wrap(rescale(aligned.sum(axis=1) // num_receivers, adc_keep, aggregate_width), aggregate_width)
+        over = np.abs(aggregated) > rescale(echo_threshold, adc_keep, aggregate_width)
+    detected = over.any(axis=1)
+    first = np.argmax(over, axis=1)
+    range_error = (first - trials["arrival"]) / ADC_RATE * SPEED_OF_SOUND / 2
+    range_error = np.where(detected, range_error, np.nan)
+
+    # FFT over the frame following detection, output kept to fft_out bits
+    frame_index = np.minimum(first[:, None] + np.arange(FFT_SIZE)[None, :], num_samples - 1)
+    frame = rescale(np.take_along_axis(aggregated, frame_index, axis=1), aggregate_width, fft_in)
+    frame = wrap(frame, fft_in)
+    spectrum = np.fft.fft(frame, axis=1)[:, bin_low:bin_high + 1]
+    growth_bits = fft_in + int(math.log2(FFT_SIZE))
+    scale = 2.0 ** (growth_bits - fft_out)
+    limit = 2 ** (fft_out - 1) - 1
+    real = np.clip(np.round(spectrum.real / scale), -limit - 1, limit)
+    imag = np.clip(np.round(spectrum.imag / scale), -limit - 1, limit)
+    peak_bin = bin_low + np.argmax(real * real + imag * imag, axis=1)
+    peak_frequency = (peak_bin * ADC_RATE) >> int(math.log2(FFT_SIZE))
+    velocity = (peak_frequency - PULSE_FREQUENCY) * SPEED_OF_SOUND / peak_frequency
+    return range_error, np.where(detected, velocity, np.nan)
+
+
+def resource_estimate(adc_bits, adc_keep, sin_width, aggregate_width, fft_in, fft_out,
+                      num_receivers=NUM_RECEIVERS, fft_size=FFT_SIZE, twiddle_bits=16):
+    """
+    Rough DSP48 and memory cost of the width-dependent datapath.
+
+    Multipliers: one shared transmit delay multiplier and one receive delay multiplier per
+    receiver (delay constant x sin), three real multipliers per radix-2 FFT stage with the
+    data width growing linearly from fft_in to fft_out, and the two magnitude squares.
+    Memory: receive delay buffers, FFT input buffer and per-stage delay lines.
+    """
+    def dsps(a, b):
+        a, b = max(a, b), min(a, b)
+        return math.ceil(a / DSP_A) * math.ceil(b / DSP_B)
+
+    stages = int(math.log2(fft_size))
+    stage_width = [round(fft_in + (fft_out - fft_in) * s / (stages - 1)) for s in range(stages)]
+    delay_bits = 12
+    dsp = (dsps(delay_bits, sin_width)                                    # transmit_beamformer
+           + num_receivers * dsps(8, sin_width)                            # receive_beamformer
+           + sum(3 * dsps(w, twiddle_bits) for w in stage_width[:-1])      # FFT butterflies
+           + 2 * dsps(fft_out, fft_out))                                   # magnitude squared
+    receive_buffer = 1 << math.ceil(math.log2(int(SAMPLE_DELAY_PER_RECEIVER) * (num_receivers - 1)))
+    memory = {
+        "receive_buffers": num_receivers * receive_buffer * adc_keep,
+        "fft_input": fft_size * 2 * fft_in,
+        "fft_stages": sum((fft_size >> (s + 1)) * 2 * w for s, w in enumerate(stage_width)),
+    }
+    memory_bits = sum(memory.values())
+    bram18 = sum(math.ceil(bits / BRAM18_BITS) for bits in memory.values())
+    return dict(dsp=dsp, memory_bits=memory_bits, bram18=bram18)
+
+
+def width_grid(**choices):
+    """Every consistent combination of the given width choices, other widths at BASELINE."""
+    names = list(BASELINE)
+    values = [choices.get(name, [BASELINE[name]]) for name in names]
+    configs = [dict(zip(names, combo)) for combo in itertools.product(*values)]
+    return [config for config in configs if config["adc_keep"] <= config["adc_bits"]]
+
+
+def explore(configs, trials=None, velocity_tolerance=BIN_VELOCITY, alignments=("rtl",), **chain_options):
+    """
+    Evaluates every width configuration, in every alignment of run_chain, on the same trials.
+
+
+    Returns:
+    - table: structured ndarray, one row per config and alignment with its widths, the
+      alignment, detection rate, range RMS error (m), velocity RMS error (m/s), fraction of
+      velocities within velocity_tolerance (default one FFT bin) and the resource_estimate
+      columns.
+    """
+    trials = trials or make_trials()
+    fields = [(name, "i4") for name in BASELINE] + [("alignment", "U3"),
+        ("detection_rate", "f8"), ("range_rms", "f8"), ("velocity_rms", "f8"), ("velocity_ok", "f8"),
+        ("dsp", "i4"), ("memory_bits", "i8"), ("bram18", "i4")]
+    runs = list(itertools.product(configs, alignments))
+    table = np.zeros(len(runs), dtype=fields)
+    for row, (config, alignment) in zip(table, runs):
+        range_error, velocity = run_chain(trials, **config, alignment=alignment, **chain_options)
+        detected = ~np.isnan(range_error)
+        velocity_error = velocity[detected] - trials["velocity"][detected]
+        for name, value in config.items():
+            row[name] = value
+        row["alignment"] = alignment
+        row["detection_rate"] = detected.mean()
+        row["range_rms"] = np.sqrt(np.mean(range_error[detected] ** 2)) if detected.any() else np.nan
+        row["velocity_rms"] = np.sqrt(np.mean(velocity_error ** 2)) if detected.any() else np.nan
+        row["velocity_ok"] = np.mean(np.abs(velocity_error) <= velocity_tolerance) if detected.any() else 0.0
+        for name, value in resource_estimate(**config).items():
+            row[name] = value
+    return table
+
+
+def format_table(table):
+    names = list(BASELINE)
+    header = " ".join(f"{name:>8.8}" for name in names) + \
+        f" {'align':>5} {'det':>5} {'r_rms':>7} {'v_rms':>7} {'v_ok':>5} {'dsp':>4} {'mem_bits':>9} {'bram18':>6}"
+    rows = [header]
+    for row in table:
+        rows.append(" ".join(f"{row[name]:8d}" for name in names) +
+                    f" {row['alignment']:>5} {row['detection_rate']:5.2f} {row['range_rms']:7.3f} {row['velocity_rms']:7.2f}"
+                    f" {row['velocity_ok']:5.2f} {row['dsp']:4d} {row['memory_bits']:9d} {row['bram18']:6d}")
+    return "\n".join(rows)
+
+
+def _ints(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep fixed-point widths of the receive chain.")
+    for name, value in BASELINE.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=_ints, default=[value],
+                            help=f"comma separated widths (default {value})")
+    parser.add_argument("--alignment", type=lambda text: text.split(","), default=["rtl"],
+                        help=f"comma separated run_chain alignments out of {', '.join(ALIGNMENTS)} (default rtl)")
+    parser.add_argument("--echo-threshold", type=int, default=ECHO_THRESHOLD,
+                        help=f"echo threshold in counts of the kept ADC bits (default {ECHO_THRESHOLD})")
+    parser.add_argument("--trials", type=int, default=256)
+    parser.add_argument("--snr", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    configs = width_grid(**{name: getattr(args, name) for name in BASELINE})
+    trials = make_trials(args.trials, seed=args.seed, snr=args.snr)
+    unknown = [alignment for alignment in args.alignment if alignment not in ALIGNMENTS]
+    if unknown:
+        parser.error(f"unknown alignments {unknown}; choose from {list(ALIGNMENTS)}")
+    print(format_table(explore(configs, trials, alignments=args.alignment, echo_threshold=args.echo_threshold)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .capture import BIN_HIGH, BIN_LOW, FFT_SIZE, doppler_frames
+from .models import goertzel_peak_frequency
+from .waveforms import adc_waveforms, sine_waveform
+
+
+# Bump whenever a model or generator below changes its output; old entries are then ignored.
+MODEL_VERSION = 3
+CACHE_DIR = Path(os.getenv("SONIC_SIGHT_CACHE", Path(__file__).resolve().parent.parent / ".golden_cache"))
+
+
+def sweep_frames(default):
+    """Frames per tone sweep: $SONIC_SIGHT_SWEEP_FRAMES, or the test's default; independent of vectors()."""
+    return int(os.getenv("SONIC_SIGHT_SWEEP_FRAMES", default))
+
+
+def cache_key(name, params):
+    """Stable hash of a vector set's name, parameters and MODEL_VERSION."""
+    description = json.dumps({"name": name, "model_version": MODEL_VERSION, **params},
+                             sort_keys=True, default=float)
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+
+def cached(name, generator, cache_dir=None, **params):
+    """
+    Returns generator(**params) from the on-disk cache, generating and storing it on a miss.
+
+
+    Each vector set is a directory of .npy files (one per array) plus params.json, loaded
+    with mmap_mode="r" so repeated runs only page in what they read. Entries are written to
+    a temporary directory and renamed into place, so parallel test runs racing on the same
+    key never see a partial entry.
+
+
+    Parameters:
+    - name: str, vector set name, part of the key and the directory name.
+    - generator: callable returning a dict of array-likes.
+    - cache_dir: path or None, defaults to $SONIC_SIGHT_CACHE or sim/.golden_cache.
+    - params: keyword arguments for generator, part of the key (JSON-serializable).
+
+
+    Returns:
+    - vectors: dict of read-only memory-mapped ndarrays.
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    entry = cache_dir / f"{name}-{cache_key(name, params)}"
+    if not (entry / "params.json").exists():
+        vectors = generator(**params)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=cache_dir))
+        for key, value in vectors.items():
+            np.save(staging / f"{key}.npy", np.asarray(value))
+        # params.json is written last: its presence marks a complete entry
+        (staging / "params.json").write_text(json.dumps(
+            {"name": name, "model_version": MODEL_VERSION, **params}, indent=2, default=float))
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)  # another process stored it first
+    return {path.stem: np.load(path, mmap_mode="r") for path in sorted(entry.glob("*.npy"))}
+
+
+def clear(cache_dir=None):
+    """Deletes every cached vector set."""
+    shutil.rmtree(Path(cache_dir or CACHE_DIR), ignore_errors=True)
+
+
+# Vector sets used by the cocotb tests
+def _adc_vectors(num_samples, angle, amplitude, frequency, sampling_rate, num_receivers):
+    waveforms, delay_samples = adc_waveforms(num_samples, angle, amplitude, frequency, sampling_rate,
+                                             num_receivers=num_receivers)
+    # expected receive_beamformer output: receivers realigned by their delay and averaged
+    index = np.arange(num_samples)[None, :] - delay_samples[:, None]
+    aligned = np.where(index >= 0, np.take_along_axis(waveforms, np.maximum(index, 0), axis=1), 0)
+    return {
+        "waveforms": waveforms,
+        "delay_samples": delay_samples,
+        "expected_aggregate": aligned.sum(axis=0) // num_receivers,
+    }
+
+
+def adc_vectors(num_samples=10000, angle=0, amplitude=32767, frequency=40000, sampling_rate=1000000, num_receivers=4):
+    """Cached receive-array stimulus: waveforms, delay_samples and expected_aggregate."""
+    return cached("adc", _adc_vectors, num_samples=num_samples, angle=angle, amplitude=amplitude,
+                  frequency=frequency, sampling_rate=sampling_rate, num_receivers=num_receivers)
+
+
+def _tone_vectors(num_samples, amplitude, frequency, sampling_rate, fft_size):
+    waveform = sine_waveform(num_samples, amplitude, frequency, sampling_rate)
+    return {
+        "waveform": waveform,
+        "goertzel_peak_frequency": goertzel_peak_frequency(waveform[:fft_size], frame_size=fft_size,
+                                                           sampling_rate=sampling_rate),
+    }
+
+
+def tone_vectors(num_samples=2048, amplitude=32767, frequency=40000, sampling_rate=1000000, fft_size=2048):
+    """Cached single-tone stimulus: waveform and the Goertzel peak frequency it should give."""
+    return cached("tone", _tone_vectors, num_samples=num_samples, amplitude=amplitude, frequency=frequency,
+                  sampling_rate=sampling_rate, fft_size=fft_size)
+
+
+def _tone_sweep_vectors(num_frames, amplitudes, sampling_rate):
+    # tones spread over the peak search range, each a quarter bin either side of a whole bin
+    # so the expected peak is never a tie between two bins
+    bins = np.round(np.linspace(BIN_LOW + 1, BIN_HIGH - 1, num_frames))
+    bins += np.where(np.arange(num_frames) % 2, 0.25, -0.25)
+    frequency = bins * sampling_rate / FFT_SIZE
+    amplitude = np.resize(amplitudes, num_frames)
+    t = np.arange(FFT_SIZE) / sampling_rate
+    waveforms = (amplitude[:, None] * np.sin(2 * np.pi * frequency[:, None] * t)).astype(np.int64)
+    peak_frequency, velocity_result, towards_observer = doppler_frames(waveforms, sampling_rate)
+    return {
+        "frequency": frequency,
+        "amplitude": amplitude,
+        "waveforms": waveforms,
+        "peak_frequency": peak_frequency,
+        "velocity_result": velocity_result,
+        "towards_observer": towards_observer.astype(np.int64),
+    }
+
+
+def tone_sweep_vectors(num_frames=24, amplitudes=(32767, 8192, 2048), sampling_rate=1000000):
+    """
+    Cached multi-frame stimulus: one FFT_SIZE frame per tone, tones swept across the
+    fft_wrapper peak search range and amplitudes cycled, with the peak frequency and
+    velocity result of each frame from a batched NumPy FFT (capture.doppler_frames).
+    """
+    return cached("tone_sweep", _tone_sweep_vectors, num_frames=num_frames, amplitudes=list(amplitudes),
+                  sampling_rate=sampling_rate)
@@ -0,0 +1,55 @@
+"""
+The system clock, generated in HDL for the cocotb runners.
+
+A Python clock coroutine wakes the scheduler on both edges of every cycle. Instead, each
+runner adds a generated clock_generator module whose `always` block toggles a register
+that is forced onto <toplevel>.clk_in, so the simulator runs the clock on its own and
+tests only await the edges they need (testbench.start_clock() checks it is running).
+
+Icarus has no bind, so it elaborates clock_generator as a second root (-s
+clock_generator), as waves.py does for its dump module. Other simulators bind it into
+the toplevel, where the same hierarchical name reaches the port. Verilator ignores a
+force on a top-level port that cocotb's --public-flat-rw makes writable, so Verilator
+builds get no clock_generator and start_clock() drives the clock with cocotb's Clock.
+"""
+from pathlib import Path
+
+
+CLOCK_PERIOD_NS = 10      # 100 MHz system clock
+
+
+def clock_module(path, hdl_toplevel, clock="clk_in", period_ns=CLOCK_PERIOD_NS, bind=False):
+    """Writes the clock_generator module: clock low from time 0, first rising edge at period_ns / 2."""
+    lines = ["`timescale 1ns/1ps", "module clock_generator();", "    reg clock = 1'b0;",
+             f"    always #{period_ns / 2:g} clock = ~clock;",
+             f"    initial force {hdl_toplevel}.{clock} = clock;", "endmodule", ""]
+    if bind:
+        lines += [f"bind {hdl_toplevel} clock_generator clock_generator_inst ();", ""]
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text("\n".join(lines))
+
+
+def add_clock(runner, sources, build_args, hdl_toplevel, clock="clk_in", period_ns=CLOCK_PERIOD_NS,
+              build_dir="sim_build"):
+    """
+    Adds the HDL clock to a runner's build.
+
+
+    Parameters:
+    - runner: the cocotb runner.
+    - sources, build_args: the build's sources and arguments.
+    - hdl_toplevel, clock: the toplevel and its clock port.
+    - build_dir: where the generated module is written.
+
+
+    Returns:
+    - sources, build_args: new lists with the clock_generator module and its arguments
+      (unchanged for Verilator).
+    """
+    simulator = type(runner).__name__.lower()
+    if simulator == "verilator":
+        return list(sources), list(build_args)
+    path = Path(build_dir).resolve() / "clock_generator.v"
+    clock_module(path, hdl_toplevel, clock, period_ns, bind=simulator != "icarus")
+    extra_args = ["-s", "clock_generator"] if simulator == "icarus" else []
+    return list(sources) + [path], list(build_args) + extra_args
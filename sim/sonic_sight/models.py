@@ -0,0 +1,155 @@
+import numpy as np
+
+
+# Global Constants
+SAMPLING_RATE = 100000
+PULSE_FREQUENCY = 40000
+SPEED_OF_SOUND = 343
+TIME_DELAY = .02 # in seconds
+OBJECT_VELOCITY = 30 # m/s
+BIT_RESOLUTION = 12
+
+
+# Phased Array Simulation
+# Generates an ultrasonic pulse
+def generate_pulse(frequency=PULSE_FREQUENCY, duration=0.001, sampling_rate=SAMPLING_RATE):
+    t = np.linspace(0, duration, int(sampling_rate * duration), endpoint=False)
+    pulse = np.sin(2 * np.pi * frequency * t)
+    return pulse
+
+
+def generate_doppler_shifted_pulse(input_signal, object_velocity=OBJECT_VELOCITY, base_frequency=PULSE_FREQUENCY, speed_of_sound=SPEED_OF_SOUND, sampling_rate=100000):
+    """
+    Takes in an input signal and returns a frequency-modulated version of the pulse
+    based on Doppler shift due to object movement.
+
+
+    Parameters:
+    - input_signal: ndarray, the original signal to be modulated.
+    - base_frequency: float, the base frequency of the wave being transmitted (in Hz).
+    - object_velocity: float, velocity of the object moving through the path (in m/s).
+    - speed_of_sound: float, speed of sound in the medium (in m/s).
+    - sampling_rate: int, the rate at which the signal is sampled (samples per second).
+
+
+    Returns:
+    - modulated_signal: ndarray, the frequency-modulated version of the input signal.
+    """
+    # Calculate the Doppler shift frequency caused by the object's velocity
+    doppler_shift = (object_velocity / speed_of_sound) * base_frequency
+   
+    # Determine effective frequency over time
+    if object_velocity > 0:
+        # Moving towards the observer, frequency increases
+        effective_frequency = base_frequency + doppler_shift
+    else:
+        # Moving away from the observer, frequency decreases
+        effective_frequency = base_frequency - abs(doppler_shift)
+   
+    # Generate time array
+    t = np.linspace(0, len(input_signal) / sampling_rate, len(input_signal), endpoint=False)
+   
+    # Calculate the instantaneous phase with Doppler-modulated frequency
+    instantaneous_phase = 2 * np.pi * effective_frequency * t
+
+
+    # Generate the modulated signal by changing the phase of the original signal
+    modulated_signal = np.sin(instantaneous_phase) * np.abs(input_signal)  # Retain original amplitude
+   
+    return modulated_signal
+
+
+# Frequency Distortion Function
+# Distorts the frequency of the wave to simulate environmental or motion effects
+def distort_frequency(signal, sampling_rate=SAMPLING_RATE, distortion_frequency=1000):
+    # Add a modulation to the original signal by distorting the frequency
+    t = np.linspace(0, len(signal) / sampling_rate, len(signal), endpoint=False)
+    distortion = np.sin(2 * np.pi * distortion_frequency * t)
+    distorted_signal = signal * (1 + 0.1 * distortion)  # Modulate signal with a small distortion
+    return distorted_signal # amplitude modulation
+
+
+# Analog-to-Digital Converter (ADC) Simulation
+# Converts the generated analog pulse into digital values
+def adc_simulation(analog_signal, bit_resolution=BIT_RESOLUTION):
+    max_val = 2**(bit_resolution - 1) - 1
+    digital_signal = np.round(analog_signal * max_val).astype(int)
+    return digital_signal
+
+
+# Time-of-Flight (ToF) Calculation Module
+# Calculates the distance based on time delay
+def calculate_distance(time_delay, speed_of_sound=SPEED_OF_SOUND):
+    distance = (speed_of_sound * time_delay) / 2  # Divide by 2 for round trip
+    return distance
+
+
+# FFT Analysis for Doppler Shift
+# Performs FFT on the signal to detect frequency shifts
+def doppler_shift_analysis(signal, sampling_rate=SAMPLING_RATE):
+    from scipy.fft import fft  # imported on first use, keeps `import sonic_sight` cheap
+
+    window = np.hanning(len(signal))
+    windowed_signal = signal * window
+    fft_result = fft(windowed_signal)
+    freqs = np.fft.fftfreq(len(signal), 1 / sampling_rate)
+    positive_freqs = freqs[freqs >= 0]
+    positive_fft_magnitude = np.abs(fft_result)[freqs >= 0]
+    return positive_freqs, positive_fft_magnitude
+
+
+# Goertzel Filter Bank for Doppler Shift
+# Evaluates only the bins of the Doppler search band (mirrors hdl/goertzel_bank.sv)
+def goertzel_power(signal, bins, frame_size=2048, coeff_frac_bits=None):
+    """
+    Runs a bank of Goertzel resonators over the first frame_size samples of a signal.
+
+
+    Parameters:
+    - signal: ndarray, samples of shape (..., frame_size); leading axes are independent frames.
+    - bins: array-like, FFT bin indices to evaluate.
+    - frame_size: int, number of samples per frame (the FFT size being replaced).
+    - coeff_frac_bits: int or None, if set the recurrence runs in integer arithmetic with
+      2cos(w) quantized to this many fractional bits, bit-exact with goertzel_bank.sv.
+
+
+    Returns:
+    - power: ndarray of shape (..., len(bins)), squared magnitude of each bin.
+    """
+    bins = np.asarray(bins)
+    signal = np.asarray(signal)[..., :frame_size]
+    coeff = 2 * np.cos(2 * np.pi * bins / frame_size)
+    shape = signal.shape[:-1] + bins.shape
+
+    if coeff_frac_bits is None:
+        s1 = np.zeros(shape)
+        s2 = np.zeros(shape)
+        for n in range(frame_size):
+            s1, s2 = signal[..., n, None] + coeff * s1 - s2, s1
+        return s1 * s1 + s2 * s2 - coeff * s1 * s2
+
+    # int64 holds the state and power for 16-bit samples and frames up to 2048
+    coeff = np.floor(coeff * (1 << coeff_frac_bits) + 0.5).astype(np.int64)
+    signal = signal.astype(np.int64)
+    s1 = np.zeros(shape, dtype=np.int64)
+    s2 = np.zeros(shape, dtype=np.int64)
+    for n in range(frame_size):
+        s1, s2 = signal[..., n, None] + ((coeff * s1) >> coeff_frac_bits) - s2, s1
+    return s1 * s1 + s2 * s2 - ((coeff * s1) >> coeff_frac_bits) * s2
+
+
+def goertzel_peak_frequency(signal, bin_low=41, bin_high=119, frame_size=2048, sampling_rate=1000000, coeff_frac_bits=16):
+    """
+    Returns the peak frequency in Hz of the Goertzel search band, computed the same way as
+    goertzel_bank.sv: (peak_bin * sampling_rate) >> log2(frame_size).
+    """
+    bins = np.arange(bin_low, bin_high + 1)
+    power = goertzel_power(signal, bins, frame_size, coeff_frac_bits)
+    peak_bin = bins[np.argmax(power, axis=-1)]
+    return (peak_bin * sampling_rate) >> int(np.log2(frame_size))
+
+
+# Velocity Calculation Module
+# Calculates velocity using Doppler frequency shift
+def calculate_velocity(doppler_frequency, wave_frequency=PULSE_FREQUENCY, speed_of_sound=SPEED_OF_SOUND):
+    return (doppler_frequency / wave_frequency) * speed_of_sound
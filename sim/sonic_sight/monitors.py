@@ -0,0 +1,96 @@
+"""
+Recording monitors: DUT outputs streamed into preallocated NumPy buffers.
+
+A Monitor samples a set of signals, either when the test calls sample() (for example
+right after SampleStrobe.send()) or on its own at every falling clock edge where a valid
+signal is high. Values go straight into int64 ring buffers, and signals up to 32 bits are
+read through the GPI integer accessor instead of handle.value's binary string, so the
+per-sample cost is a few C calls and no parsing. Checks then run once, vectorized, over
+values() at the end of the test, or block by block through on_block.
+"""
+import cocotb
+import numpy as np
+from cocotb.triggers import FallingEdge, RisingEdge
+
+
+_GPI_INT_BITS = 32   # widest signal get_signal_val_long returns whole
+
+
+def _reader(handle):
+    """Zero-argument callable returning the raw unsigned value of handle."""
+    if len(handle) <= _GPI_INT_BITS:
+        return handle._handle.get_signal_val_long
+    return lambda: int(handle.value)
+
+
+class Monitor:
+    """
+    Records signals into ring buffers of capacity samples each.
+
+
+    Parameters:
+    - signals: dict of name -> DUT handle.
+    - capacity: samples kept per signal; older samples are overwritten.
+    - on_block: optional callable(first_index, buffers) called every time capacity new
+      samples have been recorded (and by flush() for the rest), with buffers a dict of
+      name -> int64 ndarray holding that block in order. The arrays are reused afterwards.
+    """
+
+    def __init__(self, signals, capacity, on_block=None):
+        self.widths = {name: len(handle) for name, handle in signals.items()}
+        self.capacity = capacity
+        self.on_block = on_block
+        self.buffers = {name: np.zeros(capacity, dtype=np.int64) for name in signals}
+        self._readers = [(self.buffers[name], _reader(handle)) for name, handle in signals.items()]
+        self.count = 0
+
+    def sample(self):
+        """Records the current value of every signal."""
+        index = self.count % self.capacity
+        for buffer, read in self._readers:
+            buffer[index] = read()
+        self.count += 1
+        if self.on_block is not None and index == self.capacity - 1:
+            self.on_block(self.count - self.capacity, self.buffers)
+
+    def flush(self):
+        """Hands the last, partial block to on_block."""
+        rest = self.count % self.capacity
+        if self.on_block is not None and rest:
+            self.on_block(self.count - rest, {name: buffer[:rest] for name, buffer in self.buffers.items()})
+
+    async def run(self, clock, valid):
+        """Samples at every falling edge of clock where valid is high, sleeping on valid's rising edge in between."""
+        rising, falling = RisingEdge(valid), FallingEdge(clock)
+        read_valid = _reader(valid)
+        while True:
+            await rising
+            await falling
+            while read_valid():
+                self.sample()
+                await falling
+
+    def start(self, clock, valid):
+        """Starts run() in the background."""
+        return cocotb.start_soon(self.run(clock, valid))
+
+    def values(self, name, signed=False):
+        """
+        Recorded values of one signal, oldest first.
+
+
+        Returns:
+        - values: int64 ndarray of the last min(count, capacity) samples, masked to the
+          signal width and sign-extended if signed.
+        """
+        buffer = self.buffers[name]
+        if self.count > self.capacity:
+            values = np.roll(buffer, -(self.count % self.capacity))
+        else:
+            values = buffer[:self.count].copy()
+        width = self.widths[name]
+        if width < 64:
+            values &= (1 << width) - 1
+        if signed and width < 64:
+            values -= (values >> (width - 1)) << width
+        return values
@@ -0,0 +1,114 @@
+import numpy as np
+
+from .models import (
+    PULSE_FREQUENCY,
+    SAMPLING_RATE,
+    TIME_DELAY,
+    adc_simulation,
+    calculate_distance,
+    calculate_velocity,
+    distort_frequency,
+    doppler_shift_analysis,
+    generate_doppler_shifted_pulse,
+    generate_pulse,
+)
+
+
+def main():
+    """Runs the end-to-end pulse model and saves the distance/velocity and spectrum plots."""
+    import matplotlib.pyplot as plt  # plotting only, never needed by the models
+
+    # EMIT WAVE
+    analog_pulse = generate_pulse()
+
+
+    # FREQ OF WAVE DISTORTED BY OBJECT
+    velocity_distorted_pulse = generate_doppler_shifted_pulse(analog_pulse)
+
+
+    # AMPL OF WAVE DISTORTED BY ENVIRORNMENT
+    final_distorted_pulse = distort_frequency(velocity_distorted_pulse, sampling_rate=SAMPLING_RATE)
+
+
+    # RECEIVE DISTORTED WAVE
+    digital_signal = adc_simulation(final_distorted_pulse)
+   
+    # CALCULATE THE DISTANCE
+    distance = calculate_distance(TIME_DELAY)
+
+
+    # Perform FFT analysis
+    freqs, fft_magnitude = doppler_shift_analysis(digital_signal, sampling_rate=SAMPLING_RATE)
+
+
+    # FIND THE PEAK FREQUENCY (which should just be PULSE_FREQUENCY + Doppler Shift)
+    peak_index = np.argmax(fft_magnitude)
+    peak_frequency = freqs[peak_index]
+
+
+    # Calculate Doppler frequency shift and velocity
+    doppler_frequency_shift = peak_frequency - PULSE_FREQUENCY  # Assuming the original pulse frequency is 40 kHz
+    velocity = calculate_velocity(doppler_frequency_shift)
+
+
+    print(f"Doppler Frequency Shift: {doppler_frequency_shift} Hz")
+    print(f"Calculated Velocity: {velocity:.2f} m/s")
+
+
+    # Visualization
+    # Plotting the distance and velocity results
+    distances = [calculate_distance(td) for td in np.linspace(0.01, 0.05, 50)]
+    velocities = [calculate_velocity(df) for df in np.linspace(1, 20, 50)]
+
+
+    plt.figure(figsize=(10, 6))
+    plt.subplot(2, 1, 1)
+    plt.plot(distances)
+    plt.title('Distance over Time')
+    plt.xlabel('Time Step')
+    plt.ylabel('Distance (m)')
+    plt.grid(True)
+
+
+    plt.subplot(2, 1, 2)
+    plt.plot(velocities)
+    plt.title('Velocity over Time')
+    plt.xlabel('Time Step')
+    plt.ylabel('Velocity (m/s)')
+    plt.grid(True)
+
+
+    plt.tight_layout()
+    plt.savefig('simulation_plot.png')
+
+
+
+    # Plot Frequency Spectrum to visualize effect of distortion
+    # side bands appear. Which is natural
+    plt.figure(figsize=(10, 6))
+    plt.plot(freqs, fft_magnitude)
+    plt.title('Frequency Spectrum of Distorted Signal')
+    plt.xlabel('Frequency (Hz)')
+    plt.ylabel('Magnitude')
+    plt.xlim(0, PULSE_FREQUENCY * 1.25)  # Limit x-axis to a reasonable range (e.g., slightly above pulse frequency)
+    plt.grid(True)
+
+
+    plt.tight_layout()
+    plt.savefig('frequency_spectrum.png')
+
+
+    # Plot Time-Domain Signal of Distorted Pulse
+    plt.figure(figsize=(10, 4))
+    t = np.linspace(0, len(final_distorted_pulse) / SAMPLING_RATE, len(final_distorted_pulse))
+    plt.plot(t, final_distorted_pulse)
+    plt.title('Time-Domain Signal of Distorted Pulse')
+    plt.xlabel('Time (s)')
+    plt.ylabel('Amplitude')
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig('time_domain_distorted_pulse.png')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Opt-in per-test profiling of the cocotb simulations: where the time goes, Python or simulator.
+
+With SONIC_SIGHT_PROFILE=1 in the environment of a runner (`SONIC_SIGHT_PROFILE=1 python
+sim/test_pwm.py`), every test records
+
+- wall_seconds and sim_time_ns, as cocotb reports them in results.xml;
+- triggers: scheduler wake-ups, each one a round trip from the simulator into Python;
+- python_cpu_seconds: CPU time spent handling those wake-ups (coroutines, signal reads and
+  writes through the GPI), and simulator_cpu_seconds, the rest of the simulation thread's
+  CPU time;
+- call_graph: folded stacks ("module.function;module.function" -> samples), sampled
+  every SONIC_SIGHT_PROFILE_INTERVAL_MS (default 1 ms) of process CPU time by a SIGPROF
+  timer running only during tests; samples taken while the simulator runs count as "[simulator]". Python runs
+  signal handlers only between bytecodes, so a sample landing in the simulator is taken
+  when it next calls into Python, before a trigger is being handled.
+
+The summary is written to profile.json next to results.xml after every test, and
+
+    python -m sonic_sight.profiling sim_build/profile.json [--record]
+
+prints it per test, with the hottest stacks, and appends it to the profile history.
+
+cocotb 1.9 has no per-test hooks, so install() wraps RegressionManager._start_test and
+_record_result and Scheduler._react; sonic_sight.testbench calls it on import.
+"""
+import argparse
+import collections
+import datetime
+import json
+import os
+import signal
+import subprocess
+import time
+from pathlib import Path
+
+
+HISTORY_PATH = Path(__file__).resolve().parent.parent / "profile_history.jsonl"
+SIMULATOR = "[simulator]"      # call graph entry of samples taken outside Python
+MAX_STACKS = 50                # stacks kept per test in profile.json
+
+_tests = {}          # test name -> summary, in run order
+_current = None      # profile of the running test
+_in_python = False   # the simulation thread is handling a trigger
+_installed = False
+
+
+class TestProfile:
+    """Counters of one running test."""
+
+    def __init__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        self.triggers = 0
+        self.python_cpu = 0.0
+        self.samples = collections.Counter()
+
+    def summary(self, wall_seconds, sim_time_ns):
+        cpu = time.thread_time() - self.cpu
+        python_samples = sum(count for stack, count in self.samples.items() if stack != SIMULATOR)
+        return dict(wall_seconds=wall_seconds, sim_time_ns=sim_time_ns, triggers=self.triggers,
+                    cpu_seconds=cpu, python_cpu_seconds=self.python_cpu,
+                    simulator_cpu_seconds=max(cpu - self.python_cpu, 0.0),
+                    samples=sum(self.samples.values()), python_samples=python_samples,
+                    call_graph=dict(self.samples.most_common(MAX_STACKS)))
+
+
+def enabled():
+    return os.getenv("SONIC_SIGHT_PROFILE", "0") not in ("", "0")
+
+
+def profile_path():
+    """profile.json in the directory of this run's results.xml."""
+    return Path(os.getenv("COCOTB_RESULTS_FILE", "results.xml")).resolve().with_name("profile.json")
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _sample(signum, frame):
+    """SIGPROF handler: folds the interrupted stack into the running test's call graph."""
+    profile = _current
+    if profile is None:
+        return
+    names = []
+    while _in_python and frame is not None and frame.f_code is not _react.__code__:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    profile.samples[";".join(reversed(names)) if names else SIMULATOR] += 1
+
+
+def _react(scheduler, trigger, react):
+    """Scheduler._react counting the trigger and the CPU time spent on it."""
+    global _in_python
+    profile = _current
+    if profile is None:
+        return react(scheduler, trigger)
+    profile.triggers += 1
+    if scheduler._is_reacting:   # queued for the event loop already running
+        return react(scheduler, trigger)
+    start = time.thread_time()
+    _in_python = True
+    try:
+        return react(scheduler, trigger)
+    finally:
+        _in_python = False
+        profile.python_cpu += time.thread_time() - start
+
+
+def install():
+    """Wraps cocotb's test start, result and trigger handling; does nothing unless enabled()."""
+    global _installed
+    if _installed or not enabled():
+        return
+    _installed = True
+    from cocotb.regression import RegressionManager
+    from cocotb.scheduler import Scheduler
+
+    react, start_test, record_result = Scheduler._react, RegressionManager._start_test, RegressionManager._record_result
+
+    def profiled_react(self, trigger):
+        return _react(self, trigger, react)
+
+    def profiled_start_test(self):
+        global _current
+        _current = TestProfile()
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+        return start_test(self)
+
+    def profiled_record_result(self, test, outcome, wall_time_s, sim_time_ns):
+        global _current
+        if _current is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            _tests[test.__qualname__] = _current.summary(wall_time_s, sim_time_ns)
+            _current = None
+            save()
+        return record_result(self, test, outcome, wall_time_s, sim_time_ns)
+
+    interval = float(os.getenv("SONIC_SIGHT_PROFILE_INTERVAL_MS", 1)) / 1000
+    signal.signal(signal.SIGPROF, _sample)
+    signal.siginterrupt(signal.SIGPROF, False)
+    Scheduler._react = profiled_react
+    RegressionManager._start_test = profiled_start_test
+    RegressionManager._record_result = profiled_record_result
+
+
+def save(path=None):
+    """Writes the summaries of the tests run so far."""
+    path = Path(path or profile_path())
+    summary = dict(test_module=os.getenv("MODULE"), toplevel=os.getenv("TOPLEVEL"),
+                   interval_ms=float(os.getenv("SONIC_SIGHT_PROFILE_INTERVAL_MS", 1)), tests=_tests)
+    path.with_suffix(".tmp").write_text(json.dumps(summary, indent=1))
+    os.replace(path.with_suffix(".tmp"), path)
+    return path
+
+
+def format_summary(summary, stacks=5):
+    """One row per test, and its hottest Python stacks."""
+    rows = [f"{'test':<40}{'wall s':>9}{'sim us':>11}{'sim us/s':>10}{'triggers':>10}{'trig/s':>9}"
+            f"{'python s':>10}{'sim s':>8}{'python':>8}"]
+    for name, test in summary["tests"].items():
+        wall = test["wall_seconds"] or float("nan")
+        python = test["python_cpu_seconds"] / test["cpu_seconds"] if test["cpu_seconds"] else float("nan")
+        rows.append(f"{name:<40}{test['wall_seconds']:>9.2f}{test['sim_time_ns'] / 1e3:>11.1f}"
+                    f"{test['sim_time_ns'] / 1e3 / wall:>10.1f}{test['triggers']:>10}{test['triggers'] / wall:>9.0f}"
+                    f"{test['python_cpu_seconds']:>10.2f}{test['simulator_cpu_seconds']:>8.2f}{python:>8.0%}")
+        hot = [(stack, count) for stack, count in test["call_graph"].items() if stack != SIMULATOR][:stacks]
+        for stack, count in hot:
+            rows.append(f"    {count / test['samples']:6.1%}  {' <- '.join(reversed(stack.split(';')[-3:]))}")
+    return "\n".join(rows)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prints per-test profiles of cocotb runs and records them.")
+    parser.add_argument("paths", nargs="+", type=Path, help="profile.json files written with SONIC_SIGHT_PROFILE=1")
+    parser.add_argument("--stacks", type=int, default=5, help="hottest Python stacks listed per test")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--record", action="store_true", help="append these profiles to the history file")
+    args = parser.parse_args(argv)
+
+    tests = {}
+    for path in args.paths:
+        summary = json.loads(path.read_text())
+        print(f"{summary['test_module']} ({summary['toplevel']}):")
+        print(format_summary(summary, args.stacks))
+        for name, test in summary["tests"].items():
+            tests[f"{summary['test_module']}.{name}"] = {key: value for key, value in test.items()
+                                                         if key != "call_graph"}
+    if args.record:
+        record = {"date": datetime.datetime.now().isoformat(timespec="seconds"), "revision": git_revision(),
+                  "tests": tests}
+        with open(args.history, "a") as history:
+            history.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    main()
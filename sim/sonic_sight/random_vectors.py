@@ -0,0 +1,205 @@
+"""
+Seeded constrained-random operands and reference models for the arithmetic modules.
+
+Every vector of a random test is drawn from generator(module, seed), so a seed names an
+exact sequence of operands: the regression splits a range of seeds across processes
+(sim/random_regression.py), and a failing seed replays alone, bit for bit, with
+
+    SONIC_SIGHT_SEED_START=<seed> SONIC_SIGHT_SEEDS=1 SONIC_SIGHT_VECTORS=<n> TESTCASE=<test> \
+        SONIC_SIGHT_BUILD=<build> python sim/<test_module>.py
+
+where <build> is the build directory the seed failed in: a runner that builds the design
+with several parameter sets passes it to its tests and runs only that build when it is set.
+
+Each seed starts from a reset DUT, so its outcome does not depend on the seeds before it.
+The random tests read the vectors per seed from the environment (vectors()) and hand
+one seed's body to run_seeds(), which runs it for every seed of the range in the
+environment (seed_range()) and appends failing seeds to $SONIC_SIGHT_FAILED_SEEDS as
+JSON lines (record_failure()).
+"""
+import json
+import os
+import zlib
+
+import numpy as np
+
+from .array_factor import ELEMENT_SPACING, receive_delays, sin_code
+
+
+TOF_SPEED_OF_SOUND = 34300       # time_of_flight SPEED_OF_SOUND, cm/s
+TOF_DIVISOR = 200000000          # time_of_flight divisor_in, 2 * clock frequency
+
+
+def seed_range(default_seeds=2):
+    """Seeds of this run: $SONIC_SIGHT_SEED_START (0) onwards, $SONIC_SIGHT_SEEDS of them."""
+    start = int(os.getenv("SONIC_SIGHT_SEED_START", 0))
+    return range(start, start + int(os.getenv("SONIC_SIGHT_SEEDS", default_seeds)))
+
+
+def vectors(default):
+    """Vectors per seed: $SONIC_SIGHT_VECTORS, or the test's default."""
+    return int(os.getenv("SONIC_SIGHT_VECTORS", default))
+
+
+def generator(module, seed):
+    """Random generator for one seed of one module; modules draw independent streams from the same seed."""
+    return np.random.default_rng([zlib.crc32(module.encode()), seed])
+
+
+def record_failure(test_module, test, seed, num_vectors, message):
+    """
+    Appends a failing seed to $SONIC_SIGHT_FAILED_SEEDS, if set, and returns a one-line summary.
+
+    The record names the build the seed ran in, $SONIC_SIGHT_BUILD (sim_build).
+    """
+    path = os.getenv("SONIC_SIGHT_FAILED_SEEDS")
+    build = os.getenv("SONIC_SIGHT_BUILD", "sim_build")
+    if path:
+        record = dict(test_module=test_module, test=test, seed=seed, vectors=num_vectors, build=build,
+                      message=message)
+        with open(path, "a") as failures:
+            failures.write(json.dumps(record) + "\n")
+    return f"seed {seed} ({build}): {message.splitlines()[0]}"
+
+
+async def run_seeds(test_module, test, body, num_vectors, default_seeds=2):
+    """
+    Awaits body(seed) for every seed of this run, then fails with every seed that raised AssertionError.
+
+
+    Parameters:
+    - test_module, test: names recorded with each failing seed.
+    - body: async function of one seed.
+    - num_vectors: vectors per seed, recorded with each failing seed.
+    - default_seeds: seeds without $SONIC_SIGHT_SEEDS.
+
+
+    Returns:
+    - seeds: the range of seeds run.
+    """
+    seeds = seed_range(default_seeds)
+    failed = []
+    for seed in seeds:
+        try:
+            await body(seed)
+        except AssertionError as error:
+            failed.append(record_failure(test_module, test, seed, num_vectors, str(error)))
+    assert not failed, f"{len(failed)} failing seeds:\n" + "\n".join(failed)
+    return seeds
+
+
+def check_vectors(expected, actual, context, tolerance=0):
+    """
+    Compares one seed's outputs with the model, raising AssertionError on the first mismatch.
+
+
+    Parameters:
+    - expected, actual: dicts of output name -> ndarray, one entry per vector.
+    - context: dict of input name -> ndarray, reported with the mismatching vector.
+    - tolerance: largest accepted |actual - expected|.
+    """
+    for name, values in expected.items():
+        bad = np.flatnonzero(np.abs(actual[name] - values) > tolerance)
+        if len(bad):
+            row = bad[0]
+            inputs = ", ".join(f"{input_name}={column[row]}" for input_name, column in context.items())
+            raise AssertionError(f"Vector {row}: {name} expected {values[row]}, got {actual[name][row]} "
+                                 f"({inputs}; {len(bad)} mismatches)")
+
+
+def _pick(rng, n, weights):
+    """Constraint class of each vector, drawn with the given relative weights."""
+    weights = np.asarray(weights, dtype=float)
+    return rng.choice(len(weights), size=n, p=weights / weights.sum())
+
+
+def divider_operands(rng, n, width=32, max_quotient=256):
+    """
+    (dividend, divisor) pairs for divider.sv.
+
+    The divider subtracts once per clock, so quotients are bounded by max_quotient to keep
+    every vector short. The classes weigh the corner cases: zero dividend, zero divisor,
+    dividend below the divisor, exact multiples, and general pairs across the full width.
+    """
+    top = (1 << width) - 1
+    kind = _pick(rng, n, [1, 1, 2, 2, 6])
+    quotient = rng.integers(1, max_quotient + 1, n)
+    # log-uniform divisors, so small and full-width operands are both common
+    divisor = np.exp2(rng.uniform(0, np.log2(top // (quotient + 1)), n)).astype(np.int64)
+    remainder = (rng.random(n) * divisor).astype(np.int64)
+    dividend = quotient * divisor + remainder
+    dividend = np.where(kind == 0, 0, dividend)
+    divisor = np.where(kind == 1, 0, divisor)
+    dividend = np.where(kind == 2, remainder, dividend)
+    dividend = np.where(kind == 3, quotient * divisor, dividend)
+    return dividend, divisor
+
+
+def divider_model(dividend, divisor):
+    """
+    divider.sv results: a zero dividend finishes before the divisor is checked, a zero
+    divisor flags error_out with zero outputs.
+
+
+    Returns:
+    - quotient, remainder, error: int64 ndarrays.
+    """
+    error = (divisor == 0) & (dividend != 0)
+    safe = np.where(divisor == 0, 1, divisor)
+    quotient = np.where(divisor == 0, 0, dividend // safe)
+    remainder = np.where(divisor == 0, 0, dividend % safe)
+    return quotient, remainder, error.astype(np.int64)
+
+
+def tof_operands(rng, n):
+    """
+    time_since_emission values for time_of_flight.sv, in clock cycles.
+
+    Mixes in-range round trips (numerator below 2^32), values straddling each centimetre
+    boundary of the divider, and arbitrary 32-bit counts, whose numerator wraps.
+    """
+    kind = _pick(rng, n, [4, 3, 3])
+    in_range = rng.integers(0, (1 << 32) // TOF_SPEED_OF_SOUND, n)
+    centimetre = rng.integers(1, (1 << 32) // TOF_DIVISOR + 1, n)
+    boundary = -(-centimetre * TOF_DIVISOR // TOF_SPEED_OF_SOUND) + rng.integers(-1, 2, n)
+    wrapped = rng.integers(0, 1 << 32, n)
+    return np.select([kind == 0, kind == 1], [in_range, boundary], wrapped)
+
+
+def tof_model(time_since_emission):
+    """range_out of time_of_flight.sv: the numerator is computed in 32 bits and the quotient kept to 16."""
+    numerator = (TOF_SPEED_OF_SOUND * np.asarray(time_since_emission, dtype=np.int64)) & 0xFFFFFFFF
+    return (numerator // TOF_DIVISOR) & 0xFFFF
+
+
+def angle_codes(rng, n, angle_width):
+    """sin_lut angle codes: uniform over the code space, with the saturation edges and zero mixed in."""
+    low, high = -(1 << (angle_width - 1)), (1 << (angle_width - 1)) - 1
+    edges = np.array([low, high, 0, -1, 1])
+    return np.where(rng.random(n) < 0.05, rng.choice(edges, n), rng.integers(low, high + 1, n))
+
+
+def steering_codes(rng, n, sin_width=17):
+    """(sin_value, sign_bit) steering inputs: any code up to sin(90) = 2^(sin_width-1), either side."""
+    full_scale = 1 << (sin_width - 1)
+    sin_value = np.where(rng.random(n) < 0.1, rng.choice([0, full_scale], n), rng.integers(0, full_scale + 1, n))
+    return sin_value, rng.integers(0, 2, n)
+
+
+def receive_steering(rng, sin_width=17, num_receivers=2, element_spacing=ELEMENT_SPACING):
+    """
+    A whole-degree steering angle for receive_beamformer built with the given ELEMENT_SPACING.
+
+
+    Returns:
+    - sin_value, sign_bit: ints, as sin_lut drives them.
+    - delays: ndarray (num_receivers,) of the beamformer's delays in samples.
+    """
+    angle = int(rng.integers(-90, 91))
+    sin_value, sign_bit = sin_code(angle, sin_width)
+    return int(sin_value), int(sign_bit), receive_delays(angle, num_receivers, sin_width, element_spacing=element_spacing)[0]
+
+
+def adc_samples(rng, n, num_receivers=2, bits=16):
+    """Arbitrary adc_in words, (n, num_receivers)."""
+    return rng.integers(0, 1 << bits, (n, num_receivers))
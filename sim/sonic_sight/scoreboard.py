@@ -0,0 +1,111 @@
+"""
+Scoreboard that checks DUT transactions against a vectorized model off the simulation thread.
+
+Tests hand transactions to a Scoreboard, one at a time through put() or a block at a time
+through put_block() (which fits Monitor's on_block). They are queued in blocks to a worker
+thread, which evaluates the reference model on each whole block with NumPy and compares
+it with what the DUT produced, while the simulation keeps running. check() at the end of
+the test waits for the worker and fails with the sample index, expected and actual values
+and the rest of the transaction for the first mismatches.
+
+NumPy releases the GIL inside its kernels, so a thread is enough to overlap the model with
+the simulator; nothing in the worker touches the GPI.
+"""
+import queue
+import threading
+
+import numpy as np
+
+
+class Scoreboard:
+    """
+    Compares DUT output streams with a reference model in a background thread.
+
+
+    Parameters:
+    - model: callable(columns) -> dict of field -> expected ndarray. columns is a dict of
+      field -> ndarray for one block of transactions, with the sample numbers under
+      "index". Entries masked in a numpy.ma array are not checked.
+    - tolerance: largest accepted |actual - expected|, one value or a dict per field.
+    - block: transactions put() collects before queueing them to the worker.
+    - max_reports: mismatches kept for the failure message; all of them are counted.
+    - name: used in the failure message.
+    """
+
+    def __init__(self, model, tolerance=0, block=1024, max_reports=10, name="scoreboard"):
+        self.model = model
+        self.tolerance = tolerance
+        self.block = block
+        self.max_reports = max_reports
+        self.name = name
+        self.checked = 0
+        self.mismatches = 0
+        self.reports = []
+        self._pending = []
+        self._error = None
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name=name, daemon=True)
+        self._worker.start()
+
+    def put(self, index, **fields):
+        """Adds one transaction: its sample number and field=value pairs (outputs and any context)."""
+        fields["index"] = index
+        self._pending.append(fields)
+        if len(self._pending) == self.block:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def put_block(self, first_index, columns):
+        """Adds a block of transactions as field -> array columns, numbered from first_index."""
+        columns = {name: np.array(values) for name, values in columns.items()}
+        length = len(next(iter(columns.values())))
+        columns["index"] = np.arange(first_index, first_index + length)
+        self._queue.put(columns)
+
+    def check(self):
+        """
+        Waits for every queued transaction to be checked.
+
+
+        Returns:
+        - checked: number of transactions compared.
+        """
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+        self._queue.put(None)
+        self._worker.join()
+        if self._error is not None:
+            raise self._error
+        assert self.mismatches == 0, \
+            f"{self.name}: {self.mismatches} mismatches in {self.checked} transactions\n" + "\n".join(self.reports)
+        return self.checked
+
+    def _work(self):
+        while True:
+            block = self._queue.get()
+            if block is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                if isinstance(block, list):
+                    block = {name: np.array([row[name] for row in block]) for name in block[0]}
+                self._compare(block)
+            except Exception as error:  # re-raised from check() on the test's side
+                self._error = error
+
+    def _compare(self, columns):
+        expected = self.model(columns)
+        self.checked += len(columns["index"])
+        for field, values in expected.items():
+            tolerance = self.tolerance.get(field, 0) if isinstance(self.tolerance, dict) else self.tolerance
+            actual = columns[field]
+            bad = np.ma.getdata(np.abs(actual - values) > tolerance) & ~np.ma.getmaskarray(values)
+            bad = np.flatnonzero(bad)
+            self.mismatches += len(bad)
+            for row in bad[:max(self.max_reports - len(self.reports), 0)]:
+                context = ", ".join(f"{name}={columns[name][row]}" for name in columns
+                                    if name not in expected and name != "index")
+                self.reports.append(f"Sample Idx {columns['index'][row]}: {field} expected "
+                                    f"{np.ma.getdata(values)[row]}, got {actual[row]}" + (f" ({context})" if context else ""))
@@ -0,0 +1,231 @@
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .models import PULSE_FREQUENCY, SPEED_OF_SOUND, adc_simulation, calculate_distance, calculate_velocity
+
+
+# Receive chain of top_level.sv
+ADC_RATE = 1000000                      # adc_capture trigger rate
+BURST_SAMPLES = 524288 // 100           # BURST_DURATION in ADC samples; no detection while transmitting
+ECHO_THRESHOLD = 200                    # top_level ECHO_THRESHOLD, aggregated waveform counts
+FFT_SIZE = 2048
+BIN_LOW = 41
+BIN_HIGH = 119
+ELEMENT_SPACING = 0.009                 # m
+NUM_RECEIVERS = 2
+
+TRIAL_DTYPE = np.dtype([
+    ("velocity", "f8"), ("range", "f8"), ("angle", "f8"), ("snr", "f8"), ("seed", "i8"),
+    ("detected", "?"), ("false_alarm", "?"),
+    ("measured_range", "f8"), ("measured_velocity", "f8"),
+])
+
+
+def run_trial(velocity, target_range, angle, snr, seed, echo_threshold=ECHO_THRESHOLD,
+              bin_low=BIN_LOW, bin_high=BIN_HIGH, amplitude=0.5):
+    """
+    Runs one pulse through the modelled receive chain.
+
+    Two receivers see a Doppler-shifted echo (simulation.py convention, positive velocity is
+    towards the observer) of burst length, delayed by the round trip and by the array geometry,
+    plus white noise at snr dB per channel. Samples are quantized like the ADC, keep bits
+    [11:2] and are averaged as receive_beamformer does at boresight. The echo is detected on
+    the first post-burst sample whose magnitude exceeds echo_threshold; the Doppler peak is
+    searched in bins [bin_low, bin_high] of the first FFT_SIZE post-burst samples. The same
+    noise without the echo gives the false-alarm outcome.
+
+
+    Returns:
+    - (detected, false_alarm, measured_range m, measured_velocity m/s); NaN when not detected.
+    """
+    rng = np.random.default_rng(seed)
+    round_trip = int(round(2 * target_range / SPEED_OF_SOUND * ADC_RATE))
+    num_samples = BURST_SAMPLES + max(round_trip + BURST_SAMPLES, FFT_SIZE) + 1
+    t = np.arange(num_samples) / ADC_RATE
+
+    echo_frequency = PULSE_FREQUENCY * (1 + velocity / SPEED_OF_SOUND)
+    element_delay = ELEMENT_SPACING * np.sin(np.radians(angle)) / SPEED_OF_SOUND
+    arrival = t[None, :] - round_trip / ADC_RATE - element_delay * np.arange(NUM_RECEIVERS)[:, None]
+    echo = amplitude * np.sin(2 * np.pi * echo_frequency * arrival) * ((arrival >= 0) & (arrival < BURST_SAMPLES / ADC_RATE))
+    noise = rng.normal(0, amplitude / np.sqrt(2) / 10 ** (snr / 20), echo.shape)
+
+    outcomes = []
+    for received in (echo + noise, noise):
+        codes = adc_simulation(np.clip(received, -1, 1)) >> 2
+        aggregated = codes.sum(axis=0) // NUM_RECEIVERS
+        listening = aggregated[BURST_SAMPLES:]
+        hits = np.flatnonzero(np.abs(listening) > echo_threshold)
+        if len(hits) == 0:
+            outcomes.append((False, np.nan, np.nan))
+            continue
+        measured_range = calculate_distance((BURST_SAMPLES + hits[0]) / ADC_RATE)
+        spectrum = np.abs(np.fft.rfft(listening[:FFT_SIZE]))
+        peak_bin = bin_low + int(np.argmax(spectrum[bin_low:bin_high + 1]))
+        peak_frequency = (peak_bin * ADC_RATE) >> int(np.log2(FFT_SIZE))
+        outcomes.append((True, measured_range, calculate_velocity(peak_frequency - PULSE_FREQUENCY)))
+
+    (detected, measured_range, measured_velocity), (false_alarm, _, _) = outcomes
+    return detected, false_alarm, measured_range, measured_velocity
+
+
+def _run_chunk(trials, options):
+    results = np.zeros(len(trials), dtype=TRIAL_DTYPE)
+    for i, (velocity, target_range, angle, snr, seed) in enumerate(trials):
+        results[i] = (velocity, target_range, angle, snr, seed,
+                      *run_trial(velocity, target_range, angle, snr, seed, **options))
+    return results
+
+
+def trial_grid(velocities, ranges, angles, snrs, seeds):
+    """Every (velocity, range, angle, snr, seed) combination, in a fixed order."""
+    return list(itertools.product(velocities, ranges, angles, snrs, seeds))
+
+
+def sweep(out_dir, velocities, ranges, angles, snrs, seeds, chunk_size=64, workers=None, **options):
+    """
+    Runs the trial grid on a process pool, one result file per chunk of trials.
+
+    Finished chunks are kept in out_dir as chunk-NNNNN.npy, so an interrupted sweep rerun
+    with the same grid only runs the missing chunks. A different grid or options in an
+    existing out_dir is refused rather than mixed.
+
+
+    Returns:
+    - results: structured ndarray of TRIAL_DTYPE, one row per trial.
+    - stats: dict with trials, trials_run, elapsed and trials_per_second for this call.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    config = dict(velocities=list(velocities), ranges=list(ranges), angles=list(angles), snrs=list(snrs),
+                  seeds=list(seeds), chunk_size=chunk_size, options=options)
+    config_path = out_dir / "config.json"
+    if config_path.exists():
+        if json.loads(config_path.read_text()) != json.loads(json.dumps(config)):
+            raise ValueError(f"{out_dir} holds a sweep with a different configuration")
+    else:
+        config_path.write_text(json.dumps(config, indent=2))
+
+    trials = trial_grid(velocities, ranges, angles, snrs, seeds)
+    chunks = [trials[i:i + chunk_size] for i in range(0, len(trials), chunk_size)]
+    paths = [out_dir / f"chunk-{i:05d}.npy" for i in range(len(chunks))]
+    pending = [i for i, path in enumerate(paths) if not path.exists()]
+
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(_run_chunk, chunks[i], options): i for i in pending}
+        for future in concurrent.futures.as_completed(futures):
+            path = paths[futures[future]]
+            np.save(path.with_suffix(".tmp.npy"), future.result())
+            os.replace(path.with_suffix(".tmp.npy"), path)
+    elapsed = time.perf_counter() - start
+
+    trials_run = sum(len(chunks[i]) for i in pending)
+    stats = dict(trials=len(trials), trials_run=trials_run, elapsed=elapsed,
+                 trials_per_second=trials_run / elapsed if elapsed > 0 else 0.0)
+    return np.concatenate([np.load(path) for path in paths]), stats
+
+
+def summarize(results, velocity_tolerance=2.0, range_tolerance=0.05):
+    """
+    Aggregates trials over seeds for every (velocity, range, angle, snr) point.
+
+    Detection probability counts detections whose range is within range_tolerance (m);
+    velocity error statistics are over detected trials.
+    """
+    keys = np.stack([results["velocity"], results["range"], results["angle"], results["snr"]], axis=1)
+    points, group = np.unique(keys, axis=0, return_inverse=True)
+    group = group.reshape(-1)
+    count = np.bincount(group, minlength=len(points))
+
+    range_error = results["measured_range"] - results["range"]
+    velocity_error = results["measured_velocity"] - results["velocity"]
+    detected = results["detected"]
+    hit = detected & (np.abs(range_error) <= range_tolerance)
+    velocity_ok = hit & (np.abs(velocity_error) <= velocity_tolerance)
+
+    def group_mean(values, mask):
+        total = np.bincount(group, weights=np.where(mask, values, 0), minlength=len(points))
+        n = np.bincount(group, weights=mask, minlength=len(points))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / n
+
+    summary = np.zeros(len(points), dtype=[
+        ("velocity", "f8"), ("range", "f8"), ("angle", "f8"), ("snr", "f8"), ("trials", "i8"),
+        ("detection_probability", "f8"), ("false_alarm_rate", "f8"), ("velocity_within_tolerance", "f8"),
+        ("range_bias", "f8"), ("range_rms", "f8"), ("velocity_bias", "f8"), ("velocity_rms", "f8"),
+    ])
+    summary["velocity"], summary["range"], summary["angle"], summary["snr"] = points.T
+    summary["trials"] = count
+    summary["detection_probability"] = np.bincount(group, weights=hit, minlength=len(points)) / count
+    summary["false_alarm_rate"] = np.bincount(group, weights=results["false_alarm"], minlength=len(points)) / count
+    summary["velocity_within_tolerance"] = np.bincount(group, weights=velocity_ok, minlength=len(points)) / count
+    summary["range_bias"] = group_mean(range_error, detected)
+    summary["range_rms"] = np.sqrt(group_mean(range_error ** 2, detected))
+    summary["velocity_bias"] = group_mean(velocity_error, detected)
+    summary["velocity_rms"] = np.sqrt(group_mean(velocity_error ** 2, detected))
+    return summary
+
+
+def format_table(summary):
+    header = (f"{'vel':>6} {'range':>6} {'angle':>6} {'snr':>5} {'n':>5} {'Pd':>5} {'Pfa':>5} {'Pv':>5} "
+              f"{'r_bias':>7} {'r_rms':>7} {'v_bias':>7} {'v_rms':>7}")
+    rows = [header]
+    for row in summary:
+        rows.append(f"{row['velocity']:6.1f} {row['range']:6.2f} {row['angle']:6.1f} {row['snr']:5.1f} "
+                    f"{row['trials']:5d} {row['detection_probability']:5.2f} {row['false_alarm_rate']:5.2f} "
+                    f"{row['velocity_within_tolerance']:5.2f} {row['range_bias']:7.3f} {row['range_rms']:7.3f} "
+                    f"{row['velocity_bias']:7.2f} {row['velocity_rms']:7.2f}")
+    return "\n".join(rows)
+
+
+def _floats(text):
+    return [float(value) for value in text.split(",")]
+
+
+LIST_OPTIONS = ("--velocity", "--range", "--angle", "--snr")
+
+
+def _attach_lists(argv):
+    """Joins "--velocity -20,20" into "--velocity=-20,20"; argparse takes a value starting with '-' for an option."""
+    argv = list(argv)
+    for i in range(len(argv) - 2, -1, -1):
+        if argv[i] in LIST_OPTIONS and argv[i + 1].startswith("-") and argv[i + 1][1:2].isdigit():
+            argv[i:i + 2] = [f"{argv[i]}={argv[i + 1]}"]
+    return argv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep of the modelled receive chain.")
+    parser.add_argument("out_dir", help="result directory; rerun with the same arguments to resume")
+    parser.add_argument("--velocity", type=_floats, default=[-20.0, 0.0, 20.0], help="m/s, comma separated, e.g. --velocity -20,0,20")
+    parser.add_argument("--range", type=_floats, default=[1.0, 2.0, 4.0], help="m, comma separated")
+    parser.add_argument("--angle", type=_floats, default=[0.0, 30.0], help="degrees, comma separated")
+    parser.add_argument("--snr", type=_floats, default=[0.0, 10.0, 20.0], help="dB per channel, comma separated")
+    parser.add_argument("--seeds", type=int, default=20, help="trials per grid point")
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--echo-threshold", type=float, default=ECHO_THRESHOLD)
+    parser.add_argument("--bin-low", type=int, default=BIN_LOW)
+    parser.add_argument("--bin-high", type=int, default=BIN_HIGH)
+    parser.add_argument("--velocity-tolerance", type=float, default=2.0)
+    parser.add_argument("--range-tolerance", type=float, default=0.05)
+    args = parser.parse_args(_attach_lists(sys.argv[1:] if argv is None else argv))
+
+    results, stats = sweep(args.out_dir, args.velocity, args.range, args.angle, args.snr, range(args.seeds),
+                           chunk_size=args.chunk_size, workers=args.workers, echo_threshold=args.echo_threshold,
+                           bin_low=args.bin_low, bin_high=args.bin_high)
+    print(format_table(summarize(results, args.velocity_tolerance, args.range_tolerance)))
+    print(f"{stats['trials']} trials, {stats['trials_run']} run now in {stats['elapsed']:.1f} s "
+          f"({stats['trials_per_second']:.0f} trials/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Shared cocotb drivers: clock, reset, sample-rate strobes and SPI ADCs.
+
+The clock is generated in HDL by the module every runner adds (sonic_sight.hdl_clock),
+so no coroutine wakes on its edges; start_clock() only checks it runs (on Verilator,
+which has no HDL clock, it starts cocotb's Clock first). Samples are paced with one
+Timer per sample period instead of one RisingEdge per clock, and outputs are awaited
+with one edge trigger on the valid signal, so a test coroutine wakes a few times per
+sample instead of once per clock.
+
+Inputs change on falling edges and outputs are read on falling edges. reset(),
+wait_high() and SampleStrobe.send() return on a falling edge, so they chain without
+re-aligning; every wait ends on a clock edge trigger, so the next FallingEdge is never
+ambiguous.
+
+Every test module imports this one, so importing it also installs the per-test profiler
+when SONIC_SIGHT_PROFILE is set (sonic_sight.profiling) and the coverage save at exit
+(sonic_sight.coverage).
+"""
+import cocotb
+import numpy as np
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge, First, RisingEdge, Timer
+from cocotb.utils import get_sim_steps, get_sim_time
+
+from . import coverage, profiling
+from .hdl_clock import CLOCK_PERIOD_NS
+
+profiling.install()
+coverage.install()
+
+
+CYCLES_PER_SAMPLE = 100   # top_level samples the ADCs at 1 MHz
+
+
+async def start_clock(clock, period_ns=CLOCK_PERIOD_NS):
+    """
+    Checks the HDL clock (sonic_sight.hdl_clock) toggles the given wire every period_ns;
+    returns on a falling edge.
+    """
+    if cocotb.SIM_NAME.lower().startswith("verilator"):
+        await cocotb.start(Clock(clock, period_ns, units="ns").start(start_high=False))
+    timeout = Timer(2 * period_ns, units="ns")
+    if await First(FallingEdge(clock), timeout) is timeout:
+        raise AssertionError(f"{clock._name} is not toggling; the runner must add the HDL clock (hdl_clock.add_clock)")
+    start = get_sim_time()      # in simulator steps, exact at any start time
+    await FallingEdge(clock)
+    period = get_sim_time() - start
+    assert period == get_sim_steps(period_ns, "ns"), \
+        f"{clock._name} period is {period} steps, expected {period_ns} ns"
+
+
+async def reset(clock, rst, cycles=1):
+    """
+    Holds rst high for the given number of rising clock edges.
+
+    rst is raised immediately and dropped on the falling edge after the last of those
+    rising edges, where this returns.
+    """
+    rst.value = 1
+    await ClockCycles(clock, cycles)
+    await FallingEdge(clock)
+    rst.value = 0
+
+
+async def wait_high(signal, clock, timeout_cycles, period_ns=CLOCK_PERIOD_NS):
+    """
+    Waits for signal to go high, or timeout_cycles clocks.
+
+    Sleeps on a single RisingEdge(signal)/Timer pair rather than polling every clock, then
+    moves to the next falling edge so the signal and the outputs it qualifies are settled.
+
+
+    Returns:
+    - high: bool, False on timeout.
+    """
+    if signal.value != 1:
+        timeout = Timer(timeout_cycles * period_ns, units="ns")
+        if await First(RisingEdge(signal), timeout) is timeout:
+            return False
+    await FallingEdge(clock)
+    return signal.value == 1
+
+
+async def stream(clock, valid, data, samples):
+    """
+    Drives one sample per clock with valid held high.
+
+    Called on a falling edge; each sample is applied there and captured by the next rising
+    edge. Returns on the falling edge after the last sample, with valid low, so a block
+    costs one wake-up per sample.
+    """
+    valid.value = 1
+    falling = FallingEdge(clock)
+    for sample in samples:
+        data.value = sample
+        await falling
+    valid.value = 0
+
+
+class SampleStrobe:
+    """
+    Drives samples with a one-clock valid strobe at a fixed sample rate.
+
+    send() must be called on a falling edge. It applies the assignments with valid high,
+    drops valid after the rising edge that captures them and returns cycles_per_sample
+    clocks after it was called, again on a falling edge. The idle part of the period is a
+    single Timer, so each sample costs three wake-ups whatever the sample rate.
+
+
+    Parameters:
+    - clock: handle of the DUT clock.
+    - valid: handle of the strobe (data_valid_in, ce, ...).
+    - cycles_per_sample: clocks from one strobe to the next.
+    """
+
+    def __init__(self, clock, valid, cycles_per_sample=CYCLES_PER_SAMPLE, period_ns=CLOCK_PERIOD_NS):
+        self.clock = clock
+        self.valid = valid
+        self.cycles_per_sample = cycles_per_sample
+        self._rising = RisingEdge(clock)
+        self._falling = FallingEdge(clock)
+        # from the capturing rising edge to the last rising edge of the period
+        self._idle = Timer((cycles_per_sample - 1) * period_ns, units="ns") if cycles_per_sample > 1 else None
+
+    async def send(self, *assignments):
+        """
+        Sends one sample.
+
+
+        Parameters:
+        - assignments: (handle, value) pairs applied together with the strobe.
+        """
+        for handle, value in assignments:
+            handle.value = value
+        self.valid.value = 1
+        await self._rising
+        self.valid.value = 0
+        if self._idle is not None:
+            await self._idle
+        await self._falling
+
+
+class AdcStandIn:
+    """
+    SPI ADCs sharing one SCLK and CS, each shifting out one word per conversion, MSB first.
+
+    Every ADC drives its first bit when CS falls and the next one on each falling SCLK
+    edge, so the controller reads a bit on every rising SCLK edge. All channels are driven
+    with one write to the packed cipo vector per bit, and run() records the time CS fell
+    for every conversion.
+
+
+    Parameters:
+    - sclk, cs, cipo: handles of the shared serial clock and chip select and of the
+      packed serial data, bit i for ADC i.
+    - words: int array (conversions, channels), the word each ADC converts each time.
+    - data_width: bits per word.
+    """
+
+    def __init__(self, sclk, cs, cipo, words, data_width=16):
+        self.sclk = sclk
+        self.cs = cs
+        self.cipo = cipo
+        self.words = np.asarray(words, dtype=np.int64)
+        self.data_width = data_width
+        self.start_times = []   # ns, CS falling edge of every conversion
+        shifts = np.arange(data_width - 1, -1, -1)
+        bits = (self.words[:, None, :] >> shifts[None, :, None]) & 1     # conversion, bit, channel
+        self._cipo = (bits << np.arange(self.words.shape[1])).sum(axis=2).tolist()
+
+    async def run(self):
+        """Answers every conversion in words, then holds cipo low."""
+        cs_falling, sclk_falling = FallingEdge(self.cs), FallingEdge(self.sclk)
+        self.cipo.value = 0
+        for conversion in self._cipo:
+            await cs_falling
+            self.start_times.append(get_sim_time("ns"))
+            self.cipo.value = conversion[0]
+            for value in conversion[1:]:
+                await sclk_falling
+                self.cipo.value = value
+        await sclk_falling
+        self.cipo.value = 0
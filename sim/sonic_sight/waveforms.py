@@ -0,0 +1,66 @@
+import numpy as np
+
+
+# Receive array geometry of receive_beamformer.sv
+ELEMENT_SPACING = 9          # mm
+SPEED_OF_SOUND_MM = 343_000  # mm/s
+
+
+def sine_waveform(num_samples, amplitude, frequency, sampling_rate, offset=0.0):
+    """
+    Samples amplitude * (sin(2 pi f t) + offset), truncated towards zero like int().
+
+
+    Parameters:
+    - num_samples: int, number of samples.
+    - amplitude: float, peak amplitude in ADC counts.
+    - frequency: float, tone frequency in Hz.
+    - sampling_rate: float, samples per second.
+    - offset: float, DC offset in units of amplitude (1 gives a nonnegative waveform).
+
+
+    Returns:
+    - waveform: int64 ndarray of shape (num_samples,).
+    """
+    t = np.arange(num_samples) * (1 / sampling_rate)
+    return (amplitude * (np.sin(2 * np.pi * frequency * t) + offset)).astype(np.int64)
+
+
+def receiver_delays(angle, num_receivers=4, sampling_rate=1000000,
+                    element_spacing=ELEMENT_SPACING, speed_of_sound=SPEED_OF_SOUND_MM):
+    """Whole-sample arrival delay of each receiver for a plane wave angle degrees off boresight."""
+    delay = element_spacing * np.arange(num_receivers) * np.sin(np.radians(angle)) / speed_of_sound
+    return np.floor(delay * sampling_rate).astype(np.int64)
+
+
+def adc_waveforms(num_samples=10000, angle=0, amplitude=32767, frequency=40000, sampling_rate=1000000,
+                  num_receivers=4, element_spacing=ELEMENT_SPACING, speed_of_sound=SPEED_OF_SOUND_MM):
+    """
+    Generates nonnegative ADC waveforms for a tone arriving angle degrees off boresight.
+
+
+    Parameters:
+    - num_samples: int, number of samples per receiver.
+    - angle: float, angle off boresight in degrees.
+    - amplitude: int, amplitude of the waveform (32767 for 16-bit precision).
+    - frequency: float, frequency of the waveform in Hz.
+    - sampling_rate: float, sampling rate in Hz.
+    - num_receivers, element_spacing (mm), speed_of_sound (mm/s): array geometry.
+
+
+    Returns:
+    - waveforms: int64 ndarray of shape (num_receivers, num_samples).
+    - delay_samples: int64 ndarray of shape (num_receivers,), delay of each receiver in samples.
+    """
+    delay_samples = receiver_delays(angle, num_receivers, sampling_rate, element_spacing, speed_of_sound)
+    t = np.arange(num_samples) * (1.0 / sampling_rate)
+    delayed_time = t[None, :] - (delay_samples / sampling_rate)[:, None]
+    waveforms = (amplitude * (np.sin(2 * np.pi * frequency * delayed_time) + 1)).astype(np.int64)
+    return waveforms, delay_samples
+
+
+def pack_complex(real, imag=0):
+    """Packs 16-bit real/imaginary samples into the {real, imag} 32-bit words fft_wrapper expects."""
+    real = np.asarray(real, dtype=np.int64)
+    imag = np.broadcast_to(np.asarray(imag, dtype=np.int64), real.shape)
+    return (real << 16) | (imag & 0xFFFF)
@@ -0,0 +1,113 @@
+"""
+Failure-triggered waveform capture for the cocotb runners.
+
+Regression runs build and simulate without waves. After runner.test, rerun_failures
+rebuilds the design into sim_build/waves/<test> with FST dumping and reruns every failed
+test alone, recording only the scope and the time window around the failure:
+
+- WAVES=1 dumps the whole design on every run (the old behaviour), WAVES=0 never dumps.
+- WAVES_SCOPE: dotted instance path below the toplevel, e.g. "fft" (default: everything).
+- WAVES_DEPTH: levels recorded below the scope, 0 for all (default 0).
+- WAVES_BEFORE_NS / WAVES_AFTER_NS: window around the failure time (default 100000 / 1000).
+
+Icarus gets the scope and the window through a generated $dumpvars/$dumpon module.
+Verilator gets the scope through a tracing_on/tracing_off control file and dumps from time
+0 (cocotb's Verilator main has no dump control); other simulators dump everything.
+"""
+import os
+import shutil
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+
+WAVES = os.getenv("WAVES") == "1"   # waves= argument of the regular build and test
+
+
+def failed_tests(results_xml):
+    """
+    Failed testcases of a cocotb results file.
+
+
+    Returns:
+    - failures: list of (testcase name, simulation time of the failure in ns).
+    """
+    failures = []
+    for testcase in ET.parse(results_xml).getroot().iter("testcase"):
+        if testcase.find("failure") is not None or testcase.find("error") is not None:
+            failures.append((testcase.get("name"), float(testcase.get("sim_time_ns", 0))))
+    return failures
+
+
+def dump_window(failure_ns, before_ns=None, after_ns=None):
+    """Start and stop of the recorded window in whole ns, from WAVES_BEFORE_NS/WAVES_AFTER_NS."""
+    before_ns = int(os.getenv("WAVES_BEFORE_NS", 100000) if before_ns is None else before_ns)
+    after_ns = int(os.getenv("WAVES_AFTER_NS", 1000) if after_ns is None else after_ns)
+    return max(int(failure_ns) - before_ns, 0), int(failure_ns) + after_ns
+
+
+def icarus_dump_module(path, dumpfile, scope, depth, start_ns, stop_ns):
+    """Writes the waves_window_dump root module recording scope between start_ns and stop_ns."""
+    lines = ["`timescale 1ns/1ps", "module waves_window_dump();", "initial begin",
+             f'    $dumpfile("{Path(dumpfile).as_posix()}");',
+             f"    $dumpvars({depth}, {scope});"]
+    if start_ns > 0:
+        lines += ["    $dumpoff;", f"    #{start_ns} $dumpon;"]
+    lines += [f"    #{stop_ns - start_ns} $dumpoff;", "end", "endmodule", ""]
+    Path(path).write_text("\n".join(lines))
+
+
+def verilator_trace_config(path, scope, depth):
+    """Writes a Verilator control file tracing only scope (and depth levels below it)."""
+    levels = f" -levels {depth}" if depth else ""
+    Path(path).write_text(f'`verilator_config\ntracing_off -scope "*"\ntracing_on -scope "{scope}*"{levels}\n')
+
+
+def rerun_failures(runner, results_xml, sources, hdl_toplevel, test_module, build_args=(), parameters=None,
+                   timescale=("1ns", "1ps"), test_args=(), build_dir="sim_build", extra_env=None):
+    """
+    Reruns every failed test of results_xml alone with windowed FST dumping.
+
+    Takes the same sources, parameters, arguments and environment as the runner's build
+    and test; the $readmemh files copied into build_dir are copied along. Nothing is rerun
+    with WAVES set.
+
+
+    Returns:
+    - dumps: list of the FST files written, one per failed test.
+    """
+    if os.getenv("WAVES") in ("0", "1"):
+        return []
+    scope = ".".join([hdl_toplevel] + [name for name in os.getenv("WAVES_SCOPE", "").split(".") if name])
+    depth = int(os.getenv("WAVES_DEPTH", 0))
+    simulator = type(runner).__name__.lower()
+    dumps = []
+    for testcase, failure_ns in failed_tests(results_xml):
+        wave_dir = Path(build_dir).resolve() / "waves" / testcase
+        wave_dir.mkdir(parents=True, exist_ok=True)
+        for memory in Path(build_dir).glob("*.hex"):
+            shutil.copy(memory, wave_dir)
+
+        start_ns, stop_ns = dump_window(failure_ns)
+        extra_sources, extra_args, plusargs, waves = [], [], [], False
+        if simulator == "icarus":
+            dumpfile = wave_dir / f"{testcase}.fst"
+            icarus_dump_module(wave_dir / "waves_window_dump.v", dumpfile, scope, depth, start_ns, stop_ns)
+            extra_sources, extra_args, plusargs = [wave_dir / "waves_window_dump.v"], ["-s", "waves_window_dump"], ["-fst"]
+        elif simulator == "verilator":
+            dumpfile = wave_dir / "dump.fst"
+            verilator_trace_config(wave_dir / "waves.vlt", scope, depth)
+            extra_args, waves = ["--trace-fst", "--trace-structs", str(wave_dir / "waves.vlt")], True
+        else:
+            dumpfile, waves = wave_dir, True
+
+        print(f"INFO: {testcase} failed at {failure_ns:.0f} ns, rerunning with waves of {scope} "
+              f"from {start_ns} to {stop_ns} ns")
+        runner.build(sources=list(sources) + extra_sources, hdl_toplevel=hdl_toplevel, always=True,
+                     build_args=list(build_args) + extra_args, parameters=parameters or {},
+                     timescale=timescale, build_dir=wave_dir, waves=waves)
+        runner.test(hdl_toplevel=hdl_toplevel, test_module=test_module, testcase=testcase,
+                    test_args=list(test_args), plusargs=plusargs, extra_env=extra_env or {}, build_dir=wave_dir,
+                    waves=waves)
+        print(f"INFO: waves of {testcase}: {dumpfile}")
+        dumps.append(dumpfile)
+    return dumps
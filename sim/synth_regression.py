@@ -0,0 +1,273 @@
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+HDL_PATH = PROJECT_PATH / "hdl"
+FFT_CORE_PATH = HDL_PATH / "fft-core"
+HISTORY_PATH = Path(__file__).resolve().parent / "synth_history.jsonl"
+
+# Tracked metrics; a module regresses when one grows by more than both tolerances
+METRICS = ["lut", "lutram", "ff", "carry", "dsp", "bram18", "depth"]   # depth: nets on the longest comb. path
+RELATIVE_TOLERANCE = 0.05
+ABSOLUTE_TOLERANCE = 2
+
+
+def find_yosys():
+    """Yosys executable: $YOSYS, yosys or the yowasp-yosys wheel."""
+    for candidate in (os.getenv("YOSYS"), "yosys", "yowasp-yosys"):
+        if candidate and shutil.which(candidate):
+            return shutil.which(candidate)
+    raise SystemExit("ERROR: no yosys found (set $YOSYS, or pip install yowasp-yosys)")
+
+
+def module_files():
+    """Map of module name -> defining file, over hdl/*.sv and the FFT core."""
+    files = {}
+    for path in sorted(HDL_PATH.glob("*.sv")) + sorted(FFT_CORE_PATH.glob("*.v")):
+        for module in re.findall(r"^\s*module\s+(\w+)", path.read_text(), re.M):
+            files[module] = path
+    return files
+
+
+def hdl_modules():
+    """Names of the modules defined in hdl/*.sv, in file order."""
+    return [module for module, path in module_files().items() if path.parent == HDL_PATH]
+
+
+def dependencies(module, files):
+    """Files defining module and everything it instantiates, in a stable order."""
+    needed, pending = set(), [module]
+    while pending:
+        path = files[pending.pop()]
+        if path in needed:
+            continue
+        needed.add(path)
+        text = re.sub(r"//[^\n]*", "", re.sub(r"/\*.*?\*/", "", path.read_text(), flags=re.S))
+        pending += [name for name in re.findall(r"^\s*(\w+)\s*(?:#\s*\(|\w+\s*\()", text, re.M)
+                    if name in files and files[name] not in needed]
+    return sorted(needed)
+
+
+def has_slang(yosys):
+    """Whether the yosys-slang frontend plugin loads; Yosys' own parser lacks unpacked array ports."""
+    process = subprocess.run([yosys, "-q", "-p", "plugin -i slang"], capture_output=True, text=True)
+    return process.returncode == 0
+
+
+UNPACKED_PORT = re.compile(r"\b(?:input|output|inout)\s+(?:wire|logic|reg)?\s*\[[^\]]+\]\s*(\w+)\s*\[[^\]]+\]")
+UNPACKED_DECLARATION = re.compile(r"(\b(?:input|output|inout)\s+(?:wire|logic|reg)?|\b(?:wire|logic|reg))"
+                                  r"\s*(\[[^\]]+\])\s*(\w+)\s*(\[[^\]]+\])")
+
+
+def packed_ports(texts):
+    """
+    Sources with every unpacked array port, and each array connected to one, made packed.
+
+    For Yosys' own parser: "input wire [15:0] adc_in [1:0]" becomes "input wire [1:0][15:0] adc_in",
+    which indexes the same way. Memories never reach a port, so they stay unpacked and still
+    map to RAM.
+
+
+    Parameters:
+    - texts: dict of file name -> source text.
+
+
+    Returns:
+    - texts: dict of file name -> rewritten source text.
+    """
+    ports = {name for text in texts.values() for name in UNPACKED_PORT.findall(text)}
+    if not ports:
+        return texts
+    connection = re.compile(r"\.\s*(?:" + "|".join(ports) + r")\s*\(\s*(\w+)\s*\)")
+    packed = {}
+    for name, text in texts.items():
+        arrays = ports | set(connection.findall(text))
+        packed[name] = UNPACKED_DECLARATION.sub(
+            lambda match: (f"{match.group(1).rstrip()} {match.group(4)}{match.group(2)} {match.group(3)}"
+                           if match.group(3) in arrays else match.group(0)), text)
+    return packed
+
+
+def summarize_cells(cells):
+    """Groups Xilinx 7-series cell counts into the tracked resource metrics."""
+    summary = dict.fromkeys(METRICS[:-1], 0)
+    for cell, count in cells.items():
+        if re.fullmatch(r"LUT\d", cell):
+            summary["lut"] += count
+        elif re.fullmatch(r"RAM\d+[MX]\w*|SRL\w+", cell):
+            summary["lutram"] += count
+        elif re.fullmatch(r"FD[CPRS]E?", cell):
+            summary["ff"] += count
+        elif cell == "CARRY4":
+            summary["carry"] += count
+        elif cell.startswith("DSP48"):
+            summary["dsp"] += count
+        elif cell.startswith("RAMB18"):
+            summary["bram18"] += count
+        elif cell.startswith("RAMB36"):
+            summary["bram18"] += 2 * count
+    return summary
+
+
+def synthesize(module, yosys, frontend="read_verilog", timeout=1800):
+    """
+    Synthesizes one module for the Spartan-7 with Yosys synth_xilinx, flattened, no IO buffers.
+
+    Only the files of the module and its submodules are read. Yosys runs in a scratch
+    directory holding copies of them (with packed ports for Yosys' own parser) and of the
+    FFT core's $readmemh files, like the cocotb sim_build.
+
+
+    Returns:
+    - result: dict with the METRICS, cells (count by cell type) and seconds, or error, or
+      skipped when an unpacked array port is beyond packed_ports and yosys-slang is missing.
+    """
+    texts = {path.name: path.read_text() for path in dependencies(module, module_files())}
+    if frontend == "slang":
+        read = ["plugin -i slang", f"read_slang --top {module} {' '.join(texts)}"]
+    else:
+        texts = packed_ports(texts)
+        unsupported = [name for name, text in texts.items() if UNPACKED_PORT.search(text)]
+        if unsupported:
+            return {"skipped": f"unpacked array port in {', '.join(unsupported)} needs the yosys-slang plugin"}
+        read = [f"read_verilog {'-sv ' if name.endswith('.sv') else ''}{name}" for name in texts]
+    with tempfile.TemporaryDirectory(prefix=f"synth-{module}-") as work:
+        for memory in FFT_CORE_PATH.glob("*.hex"):
+            shutil.copy(memory, work)
+        for name, text in texts.items():
+            (Path(work) / name).write_text(text)
+        script = "; ".join(read + [
+            f"synth_xilinx -family xc7 -top {module} -flatten -noiopad",
+            "tee -q -o stat.json stat -json",
+            "tee -q -o ltp.txt ltp -noff",
+        ])
+        start = time.perf_counter()
+        try:
+            process = subprocess.run([yosys, "-q", "-p", script], cwd=work, capture_output=True,
+                                     text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {"error": f"timed out after {timeout} s"}
+        seconds = time.perf_counter() - start
+        if process.returncode != 0:
+            errors = [line for line in (process.stderr + process.stdout).splitlines() if "ERROR" in line]
+            return {"error": errors[-1].strip() if errors else f"yosys exited with {process.returncode}"}
+
+        stat = json.loads((Path(work) / "stat.json").read_text())
+        cells = stat["design"]["num_cells_by_type"]
+        depth = re.search(r"length=(\d+)", (Path(work) / "ltp.txt").read_text())
+    return {**summarize_cells(cells), "depth": int(depth.group(1)) if depth else 0,
+            "cells": cells, "seconds": round(seconds, 1)}
+
+
+def run_suite(modules, jobs=None, timeout=1800):
+    """Synthesizes modules in parallel, one Yosys process per module."""
+    yosys = find_yosys()
+    frontend = "slang" if has_slang(yosys) else "read_verilog"
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = {module: pool.submit(synthesize, module, yosys, frontend, timeout) for module in modules}
+        return {module: future.result() for module, future in futures.items()}
+
+
+def load_history(path=HISTORY_PATH):
+    if not Path(path).exists():
+        return []
+    return [json.loads(line) for line in Path(path).read_text().splitlines() if line.strip()]
+
+
+def previous_results(history):
+    """Latest recorded result of every module."""
+    latest = {}
+    for record in history:
+        for module, result in record["modules"].items():
+            if "error" not in result and "skipped" not in result:
+                latest[module] = result
+    return latest
+
+
+def find_regressions(results, previous, relative=RELATIVE_TOLERANCE, absolute=ABSOLUTE_TOLERANCE):
+    """
+    Metrics that grew past both tolerances against the previous results.
+
+
+    Returns:
+    - regressions: list of (module, metric, old, new).
+    """
+    regressions = []
+    for module, result in results.items():
+        if "error" in result or "skipped" in result or module not in previous:
+            continue
+        for metric in METRICS:
+            old, new = previous[module].get(metric, 0), result[metric]
+            if new - old > max(absolute, relative * old):
+                regressions.append((module, metric, old, new))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_PATH, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_table(results, previous):
+    header = f"{'module':<24}" + "".join(f"{metric:>14}" for metric in METRICS) + f"{'time':>8}"
+    rows = [header]
+    for module, result in results.items():
+        if "error" in result:
+            rows.append(f"{module:<24}ERROR {result['error']}")
+            continue
+        if "skipped" in result:
+            rows.append(f"{module:<24}SKIPPED {result['skipped']}")
+            continue
+        row = f"{module:<24}"
+        for metric in METRICS:
+            old = previous.get(module, {}).get(metric)
+            change = "" if old is None or old == result[metric] else f" ({result[metric] - old:+d})"
+            row += f"{str(result[metric]) + change:>14}"
+        rows.append(row + f"{result['seconds']:>7.0f}s")
+    return "\n".join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-module Yosys resource and logic depth regression suite.")
+    parser.add_argument("modules", nargs="*", help="modules to synthesize (default: every hdl/*.sv module)")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel Yosys processes (default: CPU count)")
+    parser.add_argument("--timeout", type=int, default=1800, help="seconds per module")
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--record", action="store_true", help="append this run to the history file")
+    parser.add_argument("--relative-tolerance", type=float, default=RELATIVE_TOLERANCE)
+    parser.add_argument("--absolute-tolerance", type=int, default=ABSOLUTE_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    modules = args.modules or hdl_modules()
+    previous = previous_results(load_history(args.history))
+    results = run_suite(modules, args.jobs, args.timeout)
+    print(format_table(results, previous))
+
+    regressions = find_regressions(results, previous, args.relative_tolerance, args.absolute_tolerance)
+    for module, metric, old, new in regressions:
+        print(f"REGRESSION {module}.{metric}: {old} -> {new}")
+    if args.record:
+        record = {"date": datetime.datetime.now().isoformat(timespec="seconds"), "revision": git_revision(),
+                  "modules": results}
+        with open(args.history, "a") as history:
+            history.write(json.dumps(record, sort_keys=True) + "\n")
+    failed = [module for module, result in results.items() if "error" in result]   # skipped modules pass
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
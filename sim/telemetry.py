@@ -0,0 +1,138 @@
+import numpy as np
+
+
+# Telemetry frame format, produced by hdl/telemetry_framer.sv
+SYNC = (0xA5, 0x5A)
+HEADER_SIZE = 10
+FLAG_RANGE_VALID = 0x01
+FLAG_VELOCITY_VALID = 0x02
+FLAG_TOWARDS_OBSERVER = 0x04
+
+
+def frame_dtype(num_samples):
+    """Returns the packed, little-endian structured dtype of one frame carrying num_samples samples."""
+    return np.dtype([
+        ("sync", "u1", (2,)),
+        ("sequence", "u1"),
+        ("flags", "u1"),
+        ("range", "<u2"),           # cm
+        ("velocity", "<u2"),        # m/s (magnitude)
+        ("angle", "i1"),            # degrees off boresight
+        ("num_samples", "u1"),
+        ("samples", "<u2", (num_samples,)),
+        ("checksum", "u1"),
+    ])
+
+
+def frame_size(num_samples):
+    return HEADER_SIZE + 2 * num_samples + 1
+
+
+def encode_frames(range_cm, velocity, angle, flags, samples=None, start_sequence=0):
+    """
+    Builds the byte stream telemetry_framer.sv would send for a batch of frames.
+
+
+    Parameters:
+    - range_cm, velocity, angle, flags: array-like of shape (num_frames,).
+    - samples: array-like of shape (num_frames, num_samples) or None for no samples.
+    - start_sequence: int, sequence number of the first frame.
+
+
+    Returns:
+    - stream: bytes, the concatenated frames.
+    """
+    range_cm = np.atleast_1d(range_cm)
+    num_frames = len(range_cm)
+    if samples is None:
+        samples = np.zeros((num_frames, 0), dtype=np.uint16)
+    samples = np.asarray(samples).reshape(num_frames, -1)
+
+    frames = np.zeros(num_frames, dtype=frame_dtype(samples.shape[1]))
+    frames["sync"] = SYNC
+    frames["sequence"] = (start_sequence + np.arange(num_frames)) & 0xFF
+    frames["flags"] = flags
+    frames["range"] = range_cm
+    frames["velocity"] = velocity
+    frames["angle"] = angle
+    frames["num_samples"] = samples.shape[1]
+    frames["samples"] = samples
+    raw = frames.view(np.uint8).reshape(num_frames, -1)
+    frames["checksum"] = np.bitwise_xor.reduce(raw[:, 2:-1], axis=1)
+    return frames.tobytes()
+
+
+def decode_frames(buffer, num_samples=None):
+    """
+    Parses every complete, checksum-valid frame out of a byte stream.
+
+
+    All frames in one call are assumed to carry the same number of samples (fixed per FPGA
+    build). Garbage between frames is skipped; a trailing partial frame is left unconsumed.
+
+
+    Parameters:
+    - buffer: bytes-like, received stream.
+    - num_samples: int or None, samples per frame; taken from the first valid frame if None.
+
+
+    Returns:
+    - frames: structured ndarray with frame_dtype(num_samples).
+    - consumed: int, number of leading bytes of buffer that can be discarded.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    starts = np.flatnonzero((data[:-1] == SYNC[0]) & (data[1:] == SYNC[1]))
+    if num_samples is None:
+        num_samples = _infer_num_samples(data, starts)
+        if num_samples is None:
+            consumed = int(starts[0]) if len(starts) else max(len(data) - 1, 0)
+            return np.zeros(0, dtype=frame_dtype(0)), consumed
+    size = frame_size(num_samples)
+    dtype = frame_dtype(num_samples)
+
+    complete = starts[starts + size <= len(data)]
+    raw = data[complete[:, None] + np.arange(size)]
+    good = (
+        (raw[:, HEADER_SIZE - 1] == num_samples) &
+        (np.bitwise_xor.reduce(raw[:, 2:-1], axis=1) == raw[:, -1])
+    )
+    complete = complete[good]
+    raw = raw[good]
+
+    # Drop matches that start inside an accepted frame
+    if len(complete) > 1 and np.any(np.diff(complete) < size):
+        keep = np.zeros(len(complete), dtype=bool)
+        next_free = 0
+        for i, start in enumerate(complete):
+            if start >= next_free:
+                keep[i] = True
+                next_free = start + size
+        complete = complete[keep]
+        raw = raw[keep]
+
+    if len(complete):
+        consumed = int(complete[-1]) + size
+    else:
+        # keep a possible frame start at the tail for the next call
+        pending = starts[starts + size > len(data)]
+        consumed = int(pending[0]) if len(pending) else max(len(data) - 1, 0)
+    frames = np.ascontiguousarray(raw).view(dtype).reshape(-1)
+    return frames, consumed
+
+
+def _infer_num_samples(data, starts, max_candidates=64):
+    """Sample count of the first sync match that forms a checksum-valid frame, or None."""
+    for start in starts[:max_candidates]:
+        if start + HEADER_SIZE > len(data):
+            break
+        num_samples = int(data[start + HEADER_SIZE - 1])
+        end = start + frame_size(num_samples)
+        if end <= len(data) and np.bitwise_xor.reduce(data[start + 2:end - 1]) == data[end - 1]:
+            return num_samples
+    return None
+
+
+def signed_velocity(frames):
+    """Velocity in m/s with the sign taken from the towards-observer flag (towards is negative)."""
+    velocity = frames["velocity"].astype(np.int32)
+    return np.where(frames["flags"] & FLAG_TOWARDS_OBSERVER, -velocity, velocity)
@@ -0,0 +1,185 @@
+import cocotb
+import numpy as np
+import os
+import sys
+from pathlib import Path
+from cocotb.triggers import FallingEdge
+from cocotb.runner import get_runner
+
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.random_vectors import adc_samples, check_vectors, generator
+from sonic_sight.testbench import CLOCK_PERIOD_NS, AdcStandIn, reset, start_clock, wait_high
+from sonic_sight.waves import WAVES, rerun_failures
+
+
+def capture_parameters(dut):
+    """(num_channels, data_width, conversion cycles, sample_msb, sample_lsb, fifo_depth) of the build."""
+    period = int(dut.DATA_CLK_PERIOD.value) - int(dut.DATA_CLK_PERIOD.value) % 2
+    data_width = int(dut.DATA_WIDTH.value)
+    return (int(dut.NUM_CHANNELS.value), data_width, data_width * period + 1, int(dut.SAMPLE_MSB.value),
+            int(dut.SAMPLE_LSB.value), int(dut.FIFO_DEPTH.value))
+
+
+def unpack(beats, num_channels, width):
+    """Splits packed samples_out values into (beats, channels)."""
+    beats = np.asarray(beats, dtype=object)[:, None]
+    return ((beats >> (np.arange(num_channels) * width)) & ((1 << width) - 1)).astype(np.int64)
+
+
+async def start_capture(dut, words):
+    """Resets the DUT with an ADC stand-in answering the given words; returns it and the first cycle's time."""
+    await start_clock(dut.clk_in)
+    dut.trigger_in.value = 0
+    dut.ready_in.value = 1
+    adc = AdcStandIn(dut.sclk_out, dut.cs_out, dut.cipo_in, words, int(dut.DATA_WIDTH.value))
+    cocotb.start_soon(adc.run())
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+    # timestamp 0 is the first rising edge after reset
+    return adc, cocotb.utils.get_sim_time("ns") + CLOCK_PERIOD_NS / 2
+
+
+@cocotb.test()
+async def test_adc_capture_aligned(dut):
+    """Back-to-back conversions: every beat holds one conversion of every ADC and the time CS fell for it."""
+    num_channels, data_width, conversion_cycles, sample_msb, sample_lsb, _ = capture_parameters(dut)
+    width = sample_msb - sample_lsb + 1
+    num_conversions = 64
+    words = adc_samples(generator("adc_capture", 0), num_conversions, num_channels, data_width)
+    adc, start = await start_capture(dut, words)
+
+    dut.trigger_in.value = 1
+    beats, timestamps = [], []
+    for _ in range(num_conversions):
+        assert await wait_high(dut.valid_out, dut.clk_in, 2 * conversion_cycles), \
+            f"No beat within {2 * conversion_cycles} cycles after {len(beats)} beats"
+        beats.append(int(dut.samples_out.value))
+        timestamps.append(int(dut.timestamp_out.value))
+        assert dut.overflow_out.value == 0, "Beat dropped with ready_in high"
+        await FallingEdge(dut.clk_in)   # the beat is taken on this rising edge
+    dut.trigger_in.value = 0
+
+    samples = unpack(beats, num_channels, width)
+    expected = (words >> sample_lsb) & ((1 << width) - 1)
+    check_vectors({f"channel{i}": expected[:, i] for i in range(num_channels)},
+                  {f"channel{i}": samples[:, i] for i in range(num_channels)},
+                  {f"word{i}": words[:, i] for i in range(num_channels)})
+    check_vectors({"timestamp": (np.asarray(adc.start_times) - start) / CLOCK_PERIOD_NS},
+                  {"timestamp": np.asarray(timestamps)}, {"beat": np.arange(num_conversions)})
+    assert set(np.diff(timestamps)) == {conversion_cycles}, \
+        f"Conversions not back to back: {sorted(set(np.diff(timestamps)))} cycles apart, expected {conversion_cycles}"
+    cocotb.log.info(f"Aligned capture test passed: {num_conversions} conversions of {num_channels} ADCs, "
+                    f"one every {conversion_cycles} cycles.")
+
+
+@cocotb.test()
+async def test_adc_capture_stall(dut):
+    """With ready_in low the FIFO keeps the first FIFO_DEPTH beats in order and flags every one dropped after."""
+    num_channels, data_width, conversion_cycles, sample_msb, sample_lsb, fifo_depth = capture_parameters(dut)
+    width = sample_msb - sample_lsb + 1
+    num_conversions = fifo_depth + 3
+    words = adc_samples(generator("adc_capture_stall", 0), num_conversions, num_channels, data_width)
+    adc, _ = await start_capture(dut, words)
+
+    dut.ready_in.value = 0
+    dut.trigger_in.value = 1
+    overflows = 0
+    for _ in range((num_conversions + 1) * conversion_cycles):
+        await FallingEdge(dut.clk_in)
+        overflows += int(dut.overflow_out.value)
+        if len(adc.start_times) == num_conversions:
+            dut.trigger_in.value = 0
+    assert overflows == num_conversions - fifo_depth, \
+        f"{overflows} beats flagged dropped, expected {num_conversions - fifo_depth}"
+
+    dut.ready_in.value = 1
+    beats = []
+    while dut.valid_out.value == 1:
+        beats.append(int(dut.samples_out.value))
+        await FallingEdge(dut.clk_in)
+    assert len(beats) == fifo_depth, f"Drained {len(beats)} beats, expected FIFO_DEPTH = {fifo_depth}"
+    expected = (words[:fifo_depth] >> sample_lsb) & ((1 << width) - 1)
+    samples = unpack(beats, num_channels, width)
+    check_vectors({f"channel{i}": expected[:, i] for i in range(num_channels)},
+                  {f"channel{i}": samples[:, i] for i in range(num_channels)},
+                  {"beat": np.arange(fifo_depth)})
+    cocotb.log.info(f"Stall test passed: {fifo_depth} beats kept, {overflows} dropped and flagged.")
+
+
+def runner():
+    """Simulate the adc_capture module using the Python runner."""
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
+    proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
+
+    # Add paths to sys.path for module access if needed
+    sys.path.append(str(proj_path / "sim"))
+    sys.path.append(str(proj_path / "hdl"))
+
+    # HDL source files required for the simulation
+    sources = [
+        proj_path / "hdl" / "adc_capture.sv"
+    ]
+
+    # Build arguments for compiling the design
+    build_test_args = ["-Wall"]  # Add more build arguments if necessary
+
+    # Fastest SCLK (one clock high, one low) and four ADCs
+    parameters = {
+        "NUM_CHANNELS": 4,
+        "DATA_CLK_PERIOD": 2,
+    }
+
+    # Get the appropriate runner based on the chosen simulator
+    runner = get_runner(sim)
+
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "adc_capture")
+
+    # Build step to compile the design with overridden parameters
+    runner.build(
+        sources=sources,
+        hdl_toplevel="adc_capture",  # Top level HDL module
+        always=True,
+        build_args=build_test_args,
+        parameters=parameters,  # Pass parameter overrides here
+        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+        waves=WAVES  # Full dumps only with WAVES=1
+    )
+
+    # Run the test(s)
+    run_test_args = []  # Specify any additional test arguments if needed
+    results = runner.test(
+        hdl_toplevel="adc_capture",  # Top level HDL module
+        test_module="test_adc_capture",  # Python test module containing test(s)
+        test_args=run_test_args,
+        waves=WAVES  # Failed tests are rerun with waves below
+    )
+    rerun_failures(runner, results, sources, "adc_capture", "test_adc_capture", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
+    # top_level's build: two ADCs, odd DATA_CLK_PERIOD rounded down to 4
+    top_level_parameters = {}
+    runner.build(
+        sources=sources,
+        hdl_toplevel="adc_capture",
+        always=True,
+        build_args=build_test_args,
+        parameters=top_level_parameters,
+        timescale=('1ns', '1ps'),
+        build_dir="sim_build_top_level",
+        waves=WAVES
+    )
+    results = runner.test(
+        hdl_toplevel="adc_capture",
+        test_module="test_adc_capture",
+        test_args=run_test_args,
+        build_dir="sim_build_top_level",
+        waves=WAVES
+    )
+    rerun_failures(runner, results, sources, "adc_capture", "test_adc_capture", build_args=build_test_args,
+                   parameters=top_level_parameters, test_args=run_test_args, build_dir="sim_build_top_level")
+
+
+if __name__ == "__main__":
+    runner()
@@ -0,0 +1,48 @@
+import numpy as np
+
+from sonic_sight.array_factor import (ELEMENT_SPACING, SAMPLING_RATE, SPEED_OF_SOUND, beam_patterns, buffer_size,
+                                      main_lobe, receive_delays, sin_code)
+from test_sin_lut import ANGLE_FRAC_BITS, ANGLE_WIDTH, SCALE, TOLERANCE, expected_outputs
+
+
+def test_sin_code_matches_sin_lut_model():
+    """Every sin_lut angle code: whole degrees hit the ROM exactly, the rest stay within the cocotb test's tolerance."""
+    codes = np.arange(-(1 << (ANGLE_WIDTH - 1)), 1 << (ANGLE_WIDTH - 1))
+    sin_value, sign_bit = sin_code(codes / (1 << ANGLE_FRAC_BITS), angle_frac_bits=ANGLE_FRAC_BITS)
+    expected_sin_value, expected_sign_bit = expected_outputs(codes)
+    assert np.array_equal(sign_bit, expected_sign_bit.astype(bool))
+    assert np.abs(sin_value - expected_sin_value).max() < TOLERANCE
+
+    whole = np.arange(-90, 91)
+    sin_value, _ = sin_code(whole)
+    assert np.array_equal(sin_value, np.floor(np.abs(np.sin(np.radians(whole))) * SCALE + 0.5))
+
+
+def test_receive_delays_match_receive_beamformer():
+    """Delays equal receive_beamformer's per-receiver expression for every whole-degree angle and spacing."""
+    angles = np.arange(-90, 91)
+    for num_receivers, element_spacing in ((2, ELEMENT_SPACING), (4, ELEMENT_SPACING), (2, 300)):
+        delays = receive_delays(angles, num_receivers, element_spacing=element_spacing)
+        comp = element_spacing * SAMPLING_RATE // SPEED_OF_SOUND
+        size = buffer_size(num_receivers, element_spacing)
+        for angle, row in zip(angles, delays):
+            sin_theta, sign_bit = (int(value) for value in sin_code(angle))
+            expected = [((comp * ((num_receivers - i - 1) if sign_bit else i) * sin_theta) >> 16) & (size - 1)
+                        for i in range(num_receivers)]
+            assert row.tolist() == expected, f"{num_receivers} receivers at {element_spacing} mm, {angle} degrees"
+        ideal = receive_delays(angles, num_receivers, quantized=False, element_spacing=element_spacing)
+        # both the per-receiver constant and the sin_lut product are truncated
+        assert np.all((ideal - delays >= 0) & (ideal - delays < num_receivers))
+
+
+def test_receive_main_lobe_points_at_steering():
+    """The receive main lobe points where the whole-sample delay steers it; ideal delays point exactly."""
+    steering = np.array([-45.0, -30.0, 0.0, 15.0, 30.0, 45.0])
+    angles = np.arange(-900, 901) / 10
+    ideal = beam_patterns(steering, angles, quantized=False)["receive"]
+    assert np.allclose(main_lobe(ideal, angles, steering), steering[:, None])
+
+    quantized = beam_patterns(steering, angles)["receive"]
+    delay = np.abs(receive_delays(steering)[:, 1] - receive_delays(steering)[:, 0])
+    pointing = np.sign(steering) * np.degrees(np.arcsin(delay * SPEED_OF_SOUND / (ELEMENT_SPACING * SAMPLING_RATE)))
+    assert np.allclose(main_lobe(quantized, angles, steering), pointing[:, None], atol=0.05)
@@ -0,0 +1,15 @@
+import numpy as np
+
+from sonic_sight.capture import FFT_SIZE, open_capture, replay_model, write_capture
+
+
+def test_replay_echo_detectors(tmp_path):
+    """echo_index compares the raw aggregate with ECHO_THRESHOLD as top_level does; onset_index its distance from mid-scale."""
+    codes = np.full((2 * FFT_SIZE, 2), 2048)    # 12-bit mid-scale, adc_in 512
+    codes[FFT_SIZE:] = 400                      # adc_in 100, below ECHO_THRESHOLD and far below mid-scale
+    codes[FFT_SIZE + 100:] = 3600               # adc_in 900
+    write_capture(tmp_path / "steps.sscap", codes, 1000000, bit_width=12, angle=0.0)
+    frames = replay_model(open_capture(tmp_path / "steps.sscap"))
+    assert frames["start"].tolist() == [0, FFT_SIZE]
+    assert frames["echo_index"].tolist() == [0, FFT_SIZE + 100]
+    assert frames["onset_index"].tolist() == [-1, FFT_SIZE]
@@ -0,0 +1,124 @@
+import cocotb
+import numpy as np
+import os
+import sys
+from pathlib import Path
+from cocotb.triggers import FallingEdge
+from cocotb.runner import get_runner
+from sonic_sight import coverage
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.monitors import Monitor
+from sonic_sight.random_vectors import check_vectors, divider_model, divider_operands, generator, run_seeds, vectors
+from sonic_sight.testbench import reset, start_clock, wait_high
+from sonic_sight.waves import WAVES, rerun_failures
+
+MAX_QUOTIENT = 256  # the divider subtracts once per clock
+
+
+async def divide(dut, dividend, divisor, monitor):
+    """Starts one division on a falling edge and records the outputs once data_valid_out rises."""
+    dut.dividend_in.value = dividend
+    dut.divisor_in.value = divisor
+    dut.data_valid_in.value = 1
+    await FallingEdge(dut.clk_in)
+    dut.data_valid_in.value = 0
+    done = await wait_high(dut.data_valid_out, dut.clk_in, MAX_QUOTIENT + 4)
+    assert done, f"No data_valid_out for {dividend} / {divisor}"
+    monitor.sample()
+
+
+async def run_vectors(dut, dividend, divisor):
+    """Divides every pair after a reset and checks them all against the model."""
+    dut.data_valid_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
+    monitor = Monitor({"quotient_out": dut.quotient_out, "remainder_out": dut.remainder_out,
+                       "error_out": dut.error_out}, len(dividend))
+    for a, b in zip(dividend.tolist(), divisor.tolist()):
+        await divide(dut, a, b, monitor)
+
+    quotient, remainder, error = divider_model(dividend, divisor)
+    coverage.DIVIDER.sample(quotient=quotient, remainder_zero=remainder == 0, error=error)
+    check_vectors({"quotient_out": quotient, "remainder_out": remainder, "error_out": error},
+                  {name: monitor.values(name) for name in monitor.buffers},
+                  {"dividend_in": dividend, "divisor_in": divisor})
+
+
+@cocotb.test()
+async def test_divider_basic(dut):
+    """Quotient and remainder of a few fixed pairs, including division by zero."""
+    await start_clock(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+    dividend = np.array([100, 0, 5, 3, 4096, 42])
+    divisor = np.array([7, 0, 0, 10, 64, 42])
+    await run_vectors(dut, dividend, divisor)
+    cocotb.log.info("Basic divider test passed.")
+
+
+@cocotb.test()
+async def test_divider_random(dut):
+    """Constrained-random operands, one reset and one batch of vectors per seed."""
+    await start_clock(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+
+    num_vectors = vectors(64)
+
+    async def run_seed(seed):
+        dividend, divisor = divider_operands(generator("divider", seed), num_vectors, max_quotient=MAX_QUOTIENT)
+        await run_vectors(dut, dividend, divisor)
+
+    seeds = await run_seeds(__name__, "test_divider_random", run_seed, num_vectors)
+    cocotb.log.info(f"Random divider test passed: {len(seeds)} seeds of {num_vectors} vectors.")
+
+
+def runner():
+    """Simulate the divider module using the Python runner."""
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
+    proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
+
+    # Add paths to sys.path for module access if needed
+    sys.path.append(str(proj_path / "sim"))
+    sys.path.append(str(proj_path / "hdl"))
+
+    # HDL source files required for the simulation
+    sources = [
+        proj_path / "hdl" / "divider.sv"
+    ]
+
+    # Build arguments for compiling the design
+    build_test_args = ["-Wall"]  # Add more build arguments if necessary
+
+    # Override parameters at build time
+    parameters = {}
+
+    # Get the appropriate runner based on the chosen simulator
+    runner = get_runner(sim)
+
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "divider")
+
+    # Build step to compile the design with overridden parameters
+    runner.build(
+        sources=sources,
+        hdl_toplevel="divider",  # Top level HDL module
+        always=True,
+        build_args=build_test_args,
+        parameters=parameters,  # Pass parameter overrides here
+        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+        waves=WAVES  # Full dumps only with WAVES=1
+    )
+
+    # Run the test(s)
+    run_test_args = []  # Specify any additional test arguments if needed
+    results = runner.test(
+        hdl_toplevel="divider",  # Top level HDL module
+        test_module="test_divider",  # Python test module containing test(s)
+        test_args=run_test_args,
+        waves=WAVES  # Failed tests are rerun with waves below
+    )
+    rerun_failures(runner, results, sources, "divider", "test_divider", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
+
+if __name__ == "__main__":
+    runner()
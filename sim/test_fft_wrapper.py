@@ -1,43 +1,31 @@
 import cocotb
+import numpy as np
 import os
 import sys
-import math
+import time
 from pathlib import Path
 import shutil
-from cocotb.triggers import Timer, RisingEdge, FallingEdge
+from cocotb.triggers import FallingEdge
 from cocotb.utils import get_sim_time as gst
 from cocotb.runner import get_runner
 
-
-async def generate_clock(clock):
-    """Generates a clock signal on the given wire."""
-    while True:
-        clock.value = 0
-        await Timer(5, units="ns")  # Low for 5 ns
-        clock.value = 1
-        await Timer(5, units="ns")  # High for 5 ns
-
-
-def generate_waveform(num_samples, amplitude, frequency, sampling_rate):
-    """Generate a sinusoidal waveform for testing."""
-    t_step = 1 / sampling_rate
-    return [
-        int(amplitude * math.sin(2 * math.pi * frequency * i * t_step)) for i in range(num_samples)
-    ]
+from sonic_sight import coverage
+from sonic_sight.golden import sweep_frames, tone_sweep_vectors, tone_vectors
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.random_vectors import check_vectors
+from sonic_sight.testbench import SampleStrobe, reset, start_clock, stream, wait_high
+from sonic_sight.waves import WAVES, rerun_failures
 
 
 @cocotb.test()
 async def test_fft_wrapper(dut):
     """Test the fft_wrapper module."""
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
 
     # Reset the DUT
-    dut.rst_in.value = 1
     dut.ce.value = 0
     dut.sample_in.value = 0
-    await RisingEdge(dut.clk_in)
-    await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
     await FallingEdge(dut.clk_in)
 
     # Test parameters
@@ -48,34 +36,25 @@ async def test_fft_wrapper(dut):
     num_samples = fft_size  # Number of samples in one FFT frame
 
     # Generate test waveform
-    waveform = generate_waveform(num_samples, amplitude, test_frequency, sample_rate)
+    waveform = tone_vectors(num_samples, amplitude, test_frequency, sample_rate, fft_size)["waveform"].tolist()
 
-    # Feed waveform samples into the DUT
+    # Feed waveform samples into the DUT, one every 11 clocks
+    strobe = SampleStrobe(dut.clk_in, dut.ce, cycles_per_sample=11)
     for sample in waveform:
         real_part = sample
         imag_part = 0  # No imaginary component in this test
         packed_sample = (real_part << 16) | (imag_part & 0xFFFF)
-        dut.sample_in.value = packed_sample
-        dut.ce.value = 1
-        await RisingEdge(dut.clk_in)
-        dut.ce.value = 0
-        for _ in range(10):
-            await RisingEdge(dut.clk_in)
+        await strobe.send((dut.sample_in, packed_sample))
 
     # Wait for FFT processing to complete
-    peak_detected = False
-    for _ in range(10000):  # Timeout after a large number of clock cycles
-        # dut.ce.value = 1
-        await RisingEdge(dut.clk_in)
-        if dut.peak_valid.value:
-            peak_detected = True
-            break
+    peak_detected = await wait_high(dut.peak_valid, dut.clk_in, 10000)  # Timeout after a large number of clock cycles
 
     assert peak_detected, "FFT did not produce a valid peak frequency output."
 
     # Check the peak frequency
     expected_peak_frequency = test_frequency
     measured_peak_frequency = int(dut.peak_frequency.value)
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(measured_peak_frequency, sample_rate, fft_size))
     tolerance = (sample_rate / fft_size) / 2  # Allowable error: half the bin width
 
     assert abs(measured_peak_frequency - expected_peak_frequency) <= tolerance, \
@@ -83,6 +62,32 @@ async def test_fft_wrapper(dut):
 
     cocotb.log.info(f"Test passed: Peak frequency detected correctly as {measured_peak_frequency} Hz.")
 
+
+@cocotb.test()
+async def test_fft_wrapper_tone_sweep(dut):
+    """Sweeps tones and amplitudes through the FFT, one frame per reset, streamed at one sample per clock."""
+    await start_clock(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+
+    sweep = tone_sweep_vectors(sweep_frames(24))
+    num_frames = len(sweep["waveforms"])
+    measured = np.zeros(num_frames, dtype=np.int64)
+    start, sim_start = time.perf_counter(), gst("ns")
+    for frame, waveform in enumerate(sweep["waveforms"]):
+        # fft_wrapper stops after one peak, so every frame starts from a reset
+        dut.ce.value = 0
+        await reset(dut.clk_in, dut.rst_in)
+        await stream(dut.clk_in, dut.ce, dut.sample_in, ((waveform << 16) & 0xFFFFFFFF).tolist())
+        assert await wait_high(dut.peak_valid, dut.clk_in, 10000), f"Frame {frame}: no peak_valid"
+        measured[frame] = dut.peak_frequency.value
+    elapsed = time.perf_counter() - start
+
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(sweep["peak_frequency"]))
+    check_vectors({"peak_frequency": sweep["peak_frequency"]}, {"peak_frequency": measured},
+                  {"frequency": sweep["frequency"], "amplitude": sweep["amplitude"]})
+    cocotb.log.info(f"Tone sweep passed: {num_frames} frames in {elapsed:.1f} s ({num_frames / elapsed:.2f} frames/s, "
+                    f"{(gst('ns') - sim_start) / num_frames / 1e3:.0f} us simulated per frame).")
+
 def runner():
     """Simulate the transmit_beamformer module using the Python runner."""
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
@@ -112,6 +117,9 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "fft_wrapper")
+
     # Build step to compile the design with overridden parameters
     runner.build(
         sources=sources,
@@ -120,17 +128,19 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,  # Pass parameter overrides here
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="fft_wrapper",  # Top level HDL module
         test_module="test_fft_wrapper",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "fft_wrapper", "test_fft_wrapper", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import numpy as np
+
+from sonic_sight import capture
+from sonic_sight.fixed_point import (ADC_RATE, BASELINE, ECHO_THRESHOLD, FFT_SIZE, PULSE_FREQUENCY, SPEED_OF_SOUND,
+                                     make_trials, offset_binary, run_chain)
+
+
+def test_default_chain_matches_integer_chain():
+    """run_chain's default configuration gives the integer replay chain's echo sample and Doppler peak."""
+    trials = make_trials(num_trials=16, seed=1, max_angle=0.0)     # broadside: no steering delays
+    range_error, velocity = run_chain(trials, **BASELINE)
+
+    codes = offset_binary(trials["received"], BASELINE["adc_bits"])
+    frames, first = [], []
+    for trial_codes in codes:
+        samples = capture.adc_in(trial_codes.T, BASELINE["adc_bits"])
+        aggregated = capture.aggregate(samples, np.zeros(samples.shape[1], dtype=np.int64))
+        echo = int(np.flatnonzero(aggregated > ECHO_THRESHOLD)[0])
+        first.append(echo)
+        frames.append(aggregated[echo:echo + FFT_SIZE])
+    peak_frequency, _, _ = capture.doppler_frames(np.array(frames), ADC_RATE)
+
+    expected_range_error = (np.array(first) - trials["arrival"]) / ADC_RATE * SPEED_OF_SOUND / 2
+    assert np.allclose(range_error, expected_range_error)
+    assert np.allclose(velocity, (peak_frequency - PULSE_FREQUENCY) * SPEED_OF_SOUND / peak_frequency)
+
+
+def test_alignment_echo_detection():
+    """RTL alignment detects the quiet mid-scale input at sample 0; MSB alignment detects the echo itself."""
+    trials = make_trials(num_trials=8, seed=2, amplitude=(0.9, 0.9), snr=60.0, max_angle=0.0)
+    arrival_error = -trials["arrival"] / ADC_RATE * SPEED_OF_SOUND / 2
+
+    range_error, _ = run_chain(trials, **BASELINE)
+    assert np.allclose(range_error, arrival_error)
+
+    range_error, _ = run_chain(trials, **BASELINE, alignment="msb")
+    lag = range_error * 2 / SPEED_OF_SOUND * ADC_RATE     # samples from the arrival to the detection
+    assert np.all((lag >= 0) & (lag < 10)), lag
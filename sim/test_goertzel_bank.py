@@ -0,0 +1,132 @@
+import cocotb
+import os
+import sys
+from pathlib import Path
+from cocotb.triggers import FallingEdge
+from cocotb.runner import get_runner
+
+from sonic_sight.golden import tone_vectors
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.testbench import CYCLES_PER_SAMPLE, SampleStrobe, reset, start_clock, wait_high
+from sonic_sight.waves import WAVES, rerun_failures
+
+NUM_BINS = 119 - 41 + 1
+
+
+@cocotb.test()
+async def test_goertzel_bank(dut):
+    """Test the goertzel_bank module against fft_wrapper's expectations and the Python model."""
+    await start_clock(dut.clk_in)
+
+    # Reset the DUT
+    dut.ce.value = 0
+    dut.sample_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
+    await FallingEdge(dut.clk_in)
+
+    # Test parameters
+    sample_rate = 1000000  # 1 Msps
+    fft_size = 2048       # Frame length being replaced
+    test_frequency = 50000  # Test tone at 50 kHz
+    amplitude = 32767     # Max amplitude for 16-bit signed data
+
+    vectors = tone_vectors(fft_size, amplitude, test_frequency, sample_rate, fft_size)
+    waveform = vectors["waveform"].tolist()
+
+    # Feed waveform samples into the DUT at the top_level sample spacing
+    strobe = SampleStrobe(dut.clk_in, dut.ce, CYCLES_PER_SAMPLE)
+    for sample in waveform:
+        await strobe.send((dut.sample_in, (sample & 0xFFFF) << 16))
+
+    # Result is ready one update pass and a three-clock-per-bin search after the last sample
+    peak_detected = await wait_high(dut.peak_valid, dut.clk_in, 5 * NUM_BINS)
+
+    assert peak_detected, "Goertzel bank did not produce a valid peak frequency output."
+
+    measured_peak_frequency = int(dut.peak_frequency.value)
+    tolerance = (sample_rate / fft_size) / 2  # Allowable error: half the bin width
+    assert abs(measured_peak_frequency - test_frequency) <= tolerance, \
+        f"Expected peak frequency {test_frequency} Hz, got {measured_peak_frequency} Hz."
+
+    model_peak_frequency = int(vectors["goertzel_peak_frequency"])
+    assert measured_peak_frequency == model_peak_frequency, \
+        f"Model peak frequency {model_peak_frequency} Hz, got {measured_peak_frequency} Hz."
+
+    cocotb.log.info(f"Test passed: Peak frequency detected correctly as {measured_peak_frequency} Hz.")
+
+
+@cocotb.test()
+async def test_goertzel_bank_busy(dut):
+    """busy_out covers the NUM_BINS clocks of one sample's update; a ce during them is dropped and flagged."""
+    await start_clock(dut.clk_in)
+    dut.ce.value = 0
+    dut.sample_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
+
+    dut.ce.value = 1
+    await FallingEdge(dut.clk_in)
+    busy_cycles, overflows = 0, 0
+    while dut.busy_out.value == 1:
+        # ce stays high: every strobe while busy is dropped, flagged the clock after
+        busy_cycles += 1
+        await FallingEdge(dut.clk_in)
+        overflows += int(dut.overflow_out.value)
+    dut.ce.value = 0
+
+    assert busy_cycles == NUM_BINS, f"busy_out high for {busy_cycles} clocks, expected NUM_BINS = {NUM_BINS}"
+    assert overflows == NUM_BINS, f"{overflows} samples flagged dropped, expected {NUM_BINS}"
+    cocotb.log.info(f"Busy test passed: {busy_cycles} busy clocks per sample, every ce in them flagged.")
+
+
+def runner():
+    """Simulate the goertzel_bank module using the Python runner."""
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
+    proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
+
+    # Add paths to sys.path for module access if needed
+    sys.path.append(str(proj_path / "sim"))
+    sys.path.append(str(proj_path / "hdl"))
+
+    # HDL source files required for the simulation
+    sources = [
+        proj_path / "hdl" / "goertzel_bank.sv"
+    ]
+
+    # Build arguments for compiling the design
+    build_test_args = ["-Wall"]  # Add more build arguments if necessary
+
+    # Override parameters at build time
+    parameters = {}
+
+    # Get the appropriate runner based on the chosen simulator
+    runner = get_runner(sim)
+
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "goertzel_bank")
+
+    # Build step to compile the design with overridden parameters
+    runner.build(
+        sources=sources,
+        hdl_toplevel="goertzel_bank",  # Top level HDL module
+        always=True,
+        build_args=build_test_args,
+        parameters=parameters,  # Pass parameter overrides here
+        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+        waves=WAVES  # Full dumps only with WAVES=1
+    )
+
+    # Run the test(s)
+    run_test_args = []  # Specify any additional test arguments if needed
+    results = runner.test(
+        hdl_toplevel="goertzel_bank",  # Top level HDL module
+        test_module="test_goertzel_bank",  # Python test module containing test(s)
+        test_args=run_test_args,
+        waves=WAVES  # Failed tests are rerun with waves below
+    )
+    rerun_failures(runner, results, sources, "goertzel_bank", "test_goertzel_bank", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
+
+if __name__ == "__main__":
+    runner()
@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+
+from host_pipeline import TelemetryService
+from telemetry import FLAG_RANGE_VALID, encode_frames
+
+
+def make_stream(num_frames, num_samples=4, start_sequence=0):
+    """num_frames telemetry frames, range i cm for frame i."""
+    samples = np.arange(num_frames * num_samples).reshape(num_frames, num_samples)
+    return encode_frames(np.arange(num_frames), np.zeros(num_frames), np.zeros(num_frames),
+                         np.full(num_frames, FLAG_RANGE_VALID), samples, start_sequence)
+
+
+async def chunks(*pieces):
+    for piece in pieces:
+        yield piece
+
+
+def sequences(batch):
+    return batch["sequence"].astype(int).tolist()
+
+
+def run_service(source, **options):
+    """Runs a service to completion, returning its stats and every published batch's sequence numbers."""
+    async def run():
+        service = TelemetryService(source, processor=sequences, lossless=True, queue_size=64, **options)
+        results = service.subscribe(maxsize=64)
+        await service.run()
+        batches = []
+        while not results.empty():
+            batches.append(results.get_nowait())
+        return service.stats(), batches
+    return asyncio.run(run())
+
+
+def test_framing_across_chunks_and_garbage():
+    """Frames split at every byte offset and separated by garbage are all decoded, garbage counted."""
+    first, second = make_stream(3), make_stream(3, start_sequence=3)
+    garbage = bytes([0xA5, 0x00, 0x13, 0x5A])
+    stream = first + garbage + second
+    pieces = [stream[i:i + 7] for i in range(0, len(stream), 7)]
+    stats, batches = run_service(chunks(*pieces), batch_size=32)
+    assert sum(batches, []) == list(range(6))
+    assert stats["frames_received"] == 6
+    assert stats["bytes_discarded"] == len(garbage)
+    assert stats["frames_lost"] == 0
+
+
+def test_batches_never_exceed_batch_size():
+    """One chunk of 95 frames is split into batches of at most batch_size, in order."""
+    stats, batches = run_service(chunks(make_stream(95)), batch_size=32)
+    assert [len(batch) for batch in batches] == [32, 32, 31]
+    assert sum(batches, []) == list(range(95))
+    assert stats["batches_processed"] == 3
+
+
+def test_batch_timeout_on_a_stalled_link():
+    """Frames already received are published batch_timeout after arrival even if the link goes silent."""
+    async def stalled():
+        yield make_stream(5)
+        await asyncio.Event().wait()    # a live link that never sends again
+
+    async def run():
+        service = TelemetryService(stalled(), processor=sequences, batch_size=32, batch_timeout=0.05)
+        results = service.subscribe()
+        running = asyncio.create_task(service.run())
+        try:
+            return await asyncio.wait_for(results.get(), timeout=2)
+        finally:
+            running.cancel()
+
+    assert asyncio.run(run()) == list(range(5))
+
+
+def test_loss_and_duplicate_counting():
+    """Sequence gaps count lost frames across the 8-bit wrap; repeated sequence numbers count as duplicates."""
+    stream = make_stream(10, start_sequence=250)
+    size = len(stream) // 10
+    frame = [stream[i * size:(i + 1) * size] for i in range(10)]
+    # 250 251 252 [253 254 lost] 255 0 0 (retransmitted) 1 [2 lost] 3
+    received = frame[:3] + frame[5:7] + [frame[6], frame[7], frame[9]]
+    stats, _ = run_service(chunks(*received[:4], b"".join(received[4:])), batch_size=4)
+    assert stats["frames_received"] == len(received)
+    assert stats["frames_lost"] == 3
+    assert stats["frames_duplicated"] == 1
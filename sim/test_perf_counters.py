@@ -0,0 +1,166 @@
+import cocotb
+import os
+import sys
+from pathlib import Path
+from cocotb.triggers import RisingEdge, FallingEdge
+from cocotb.runner import get_runner
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.testbench import reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
+
+NUM_STAGES = 3
+NUM_BUSY = 2
+FIELDS = ["last", "min", "max", "sum_lo", "sum_hi", "count"]
+
+
+async def read_counter(dut, counter):
+    """Reads every statistic of one counter through the readout port."""
+    stats = {}
+    for field, name in enumerate(FIELDS):
+        await FallingEdge(dut.clk_in)
+        dut.read_addr.value = (counter << 3) | field
+        await RisingEdge(dut.clk_in)
+        await FallingEdge(dut.clk_in)
+        stats[name] = int(dut.read_data.value)
+    stats["sum"] = (stats.pop("sum_hi") << 32) | stats.pop("sum_lo")
+    return stats
+
+
+async def read_pulse_count(dut):
+    """Reads the number of pulses seen since reset."""
+    await FallingEdge(dut.clk_in)
+    dut.read_addr.value = (NUM_STAGES + NUM_BUSY) << 3
+    await RisingEdge(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+    return int(dut.read_data.value)
+
+
+async def run_pulse(dut, stage_latencies, busy_cycles, length=100):
+    """Drives one pulse: stage i starts at cycle 2 + i and stops stage_latencies[i] cycles later."""
+    await FallingEdge(dut.clk_in)
+    dut.pulse_start.value = 1
+    await FallingEdge(dut.clk_in)
+    dut.pulse_start.value = 0
+    for cycle in range(length):
+        start = 0
+        stop = 0
+        for i, latency in enumerate(stage_latencies):
+            if cycle == 2 + i:
+                start |= 1 << i
+            if cycle == 2 + i + latency:
+                stop |= 1 << i
+            # repeated events within the pulse must be ignored
+            if cycle == 2 + i + latency + 5:
+                start |= 1 << i
+                stop |= 1 << i
+        busy = 0
+        for j, cycles in enumerate(busy_cycles):
+            if 10 <= cycle < 10 + cycles:
+                busy |= 1 << j
+        dut.start_in.value = start
+        dut.stop_in.value = stop
+        dut.busy_in.value = busy
+        await FallingEdge(dut.clk_in)
+    dut.start_in.value = 0
+    dut.stop_in.value = 0
+    dut.busy_in.value = 0
+
+
+@cocotb.test()
+async def test_perf_counters_statistics(dut):
+    """Latency and busy statistics accumulate over several pulses and read back correctly."""
+    await start_clock(dut.clk_in)
+
+    dut.pulse_start.value = 0
+    dut.start_in.value = 0
+    dut.stop_in.value = 0
+    dut.busy_in.value = 0
+    dut.read_addr.value = 0
+
+    # Reset the DUT
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+
+    pulses = [
+        ([7, 0, 30], [12, 0]),
+        ([3, 4, 50], [20, 5]),
+        ([11, 2, 40], [16, 9]),
+    ]
+    for stage_latencies, busy_cycles in pulses:
+        await run_pulse(dut, stage_latencies, busy_cycles)
+    # busy counters are recorded when the next pulse opens
+    await run_pulse(dut, [1, 1, 1], [0, 0], length=10)
+
+    for i in range(NUM_STAGES):
+        values = [p[0][i] for p in pulses] + [1]
+        stats = await read_counter(dut, i)
+        expected = dict(last=values[-1], min=min(values), max=max(values), sum=sum(values), count=len(values))
+        assert stats == expected, f"Stage {i}: expected {expected}, got {stats}"
+
+    for j in range(NUM_BUSY):
+        values = [p[1][j] for p in pulses]
+        stats = await read_counter(dut, NUM_STAGES + j)
+        expected = dict(last=values[-1], min=min(values), max=max(values), sum=sum(values), count=len(values))
+        assert stats == expected, f"Busy counter {j}: expected {expected}, got {stats}"
+
+    pulse_count = await read_pulse_count(dut)
+    assert pulse_count == len(pulses) + 1, f"Expected {len(pulses) + 1} pulses, got {pulse_count}"
+
+    cocotb.log.info("Perf counter test passed: statistics match the driven events.")
+
+
+def runner():
+    """Simulate the perf_counters module using the Python runner."""
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
+    proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
+
+    # Add paths to sys.path for module access if needed
+    sys.path.append(str(proj_path / "sim"))
+    sys.path.append(str(proj_path / "hdl"))
+
+    # HDL source files required for the simulation
+    sources = [
+        proj_path / "hdl" / "perf_counters.sv"
+    ]
+
+    # Build arguments for compiling the design
+    build_test_args = ["-Wall"]  # Add more build arguments if necessary
+
+    # Override parameters at build time
+    parameters = {
+        "NUM_STAGES": NUM_STAGES,
+        "NUM_BUSY": NUM_BUSY
+    }
+
+    # Get the appropriate runner based on the chosen simulator
+    runner = get_runner(sim)
+
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "perf_counters")
+
+    # Build step to compile the design with overridden parameters
+    runner.build(
+        sources=sources,
+        hdl_toplevel="perf_counters",  # Top level HDL module
+        always=True,
+        build_args=build_test_args,
+        parameters=parameters,  # Pass parameter overrides here
+        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+        waves=WAVES  # Full dumps only with WAVES=1
+    )
+
+    # Run the test(s)
+    run_test_args = []  # Specify any additional test arguments if needed
+    results = runner.test(
+        hdl_toplevel="perf_counters",  # Top level HDL module
+        test_module="test_perf_counters",  # Python test module containing test(s)
+        test_args=run_test_args,
+        waves=WAVES  # Failed tests are rerun with waves below
+    )
+    rerun_failures(runner, results, sources, "perf_counters", "test_perf_counters", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
+
+if __name__ == "__main__":
+    runner()
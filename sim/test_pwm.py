@@ -5,26 +5,19 @@ from pathlib import Path
 from cocotb.triggers import Timer, RisingEdge, FallingEdge
 from cocotb.utils import get_sim_time as gst
 from cocotb.runner import get_runner
-
-async def generate_clock(clock_wire):
-    """Generates a clock signal on the given wire."""
-    while True:
-        clock_wire.value = 0
-        await Timer(5, units="ns")  # Low for 5 ns
-        clock_wire.value = 1
-        await Timer(5, units="ns")  # High for 5 ns
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.testbench import reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
 
 # @cocotb.test()
 async def test_pwm_basic(dut):
     """Basic Test for pwm module - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
 
     # Reset the DUT
-    dut.rst_in.value = 1
     dut.default_offset.value = 0
-    await Timer(20, units="ns")
-    dut.rst_in.value = 0
+    await reset(dut.clk_in, dut.rst_in, cycles=2)
     await Timer(20, units="ns")
 
     # Parameters
@@ -53,7 +46,7 @@ async def test_pwm_basic(dut):
 async def test_pwm_with_offset(dut):
     """Test for pwm module - Verify behavior with default_offset as phase offset."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
 
     # Parameters
     period_cycles = 2500  # Total period in clock cycles
@@ -100,13 +93,11 @@ async def test_pwm_with_offset(dut):
 async def test_pwm_full_period(dut):
     """Test for pwm module - Verify signal repeats correctly over multiple periods."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
 
     # Reset the DUT
-    dut.rst_in.value = 1
     dut.default_offset.value = 0
-    await Timer(20, units="ns")
-    dut.rst_in.value = 0
+    await reset(dut.clk_in, dut.rst_in, cycles=2)
     await Timer(20, units="ns")
 
     # Parameters
@@ -139,16 +130,13 @@ async def test_pwm_full_period(dut):
 async def test_pwm_with_wrap(dut):
     """Basic Test for pwm module - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     dut.default_offset.value = 0
     
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0    
+    await reset(dut.clk_in, dut.rst_in)
 
 
     # Parameters
@@ -201,6 +189,9 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "pwm")
+
     # Build step to compile the design
     runner.build(
         sources=sources,
@@ -209,17 +200,19 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="pwm",  # Top level HDL module
         test_module="test_pwm",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "pwm", "test_pwm", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
 
 if __name__ == "__main__":
     runner()
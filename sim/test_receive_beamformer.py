@@ -1,65 +1,30 @@
 import cocotb
+import numpy as np
 import os
 import sys
-import math
 from pathlib import Path
-from cocotb.triggers import Timer, RisingEdge, FallingEdge
-from cocotb.utils import get_sim_time as gst
+from cocotb.triggers import FallingEdge
 from cocotb.runner import get_runner
 
+from sonic_sight.array_factor import buffer_size, receive_delays, sin_code
+from sonic_sight.capture import aggregate, aggregated_window, replay_source, steering_inputs
+from sonic_sight.golden import adc_vectors
+from sonic_sight import coverage
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.monitors import Monitor
+from sonic_sight.random_vectors import adc_samples, check_vectors, generator, receive_steering, run_seeds, vectors
+from sonic_sight.scoreboard import Scoreboard
+from sonic_sight.testbench import SampleStrobe, reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
+
 NUM_RECEIVERS = 4
 TOLERANCE = 1000
-
-async def generate_clock(clock_wire):
-    """Generates a clock signal on the given wire."""
-    while True:
-        clock_wire.value = 0
-        await Timer(5, units="ns")  # Low for 5 ns
-        clock_wire.value = 1
-        await Timer(5, units="ns")  # High for 5 ns
-
+REPLAY_SAMPLES = 4000
 
 def generate_adc_waveforms(num_samples=10000, angle=0, amplitude=32767, frequency=40000, sampling_rate=1000000):
-    """
-    Generates ADC waveforms for a given angle off boresight, quantized with 16-bit precision.
-    
-    Parameters:
-        num_samples (int): Number of samples to generate.
-        angle (float): Angle off boresight in degrees.
-        amplitude (int): Amplitude of the waveform (default 32767 for 16-bit precision).
-        frequency (int): Frequency of the waveform in Hz.
-        sampling_rate (int): Sampling rate in Hz.
-    
-    Returns:
-        list[list[int]]: A 2D list of waveforms, one for each receiver, with 16-bit quantized values.
-    """
-    # Constants
-    SPEED_OF_SOUND = 343_000  # mm/s
-    ELEMENT_SPACING = 9       # mm
-    NUM_RECEIVERS = 4
-    
-    # Calculate delay per receiver due to angle (sin of the angle affects propagation delay)
-    delay_per_receiver = [
-        ELEMENT_SPACING * i * math.sin(math.radians(angle)) / SPEED_OF_SOUND
-        for i in range(NUM_RECEIVERS)
-    ]
-
-    # Calculate delay in terms of samples
-    delay_samples = [math.floor(delay * sampling_rate) for delay in delay_per_receiver]
-
-    # Generate waveforms
-    waveforms = [[] for _ in range(NUM_RECEIVERS)]
-    t_step = 1.0 / sampling_rate  # Time step for each sample
-
-    for sample_idx in range(num_samples):
-        time = sample_idx * t_step
-        for receiver in range(NUM_RECEIVERS):
-            # Apply time shift (delay) to each receiver
-            delayed_time = time - (delay_samples[receiver] / sampling_rate) # how far back in time do we go
-            value = amplitude * (math.sin(2 * math.pi * frequency * delayed_time) + 1)
-            waveforms[receiver].append(int(value))  # Quantize to a nonnegative integer
-    
-    return waveforms, delay_samples
+    """Nonnegative 16-bit ADC waveforms for 4 receivers, as nested lists for driving the DUT."""
+    vectors = adc_vectors(num_samples, angle, amplitude, frequency, sampling_rate, num_receivers=4)
+    return vectors["waveforms"].tolist(), vectors["delay_samples"].tolist()
 
 
 # @cocotb.test()
@@ -67,7 +32,7 @@ async def test_receive_beamform_basic(dut):
     """Basic functionality test for the receive_beamform module."""
     # tests when all receivers in sync
     # Start clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     for rx in range(4):
         dut.adc_in[rx].value = 0
@@ -77,12 +42,7 @@ async def test_receive_beamform_basic(dut):
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0  
-    
-    await RisingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
 
     # Parameters
     num_samples = 100
@@ -95,33 +55,26 @@ async def test_receive_beamform_basic(dut):
     adc_waveforms, delay_samples = generate_adc_waveforms(num_samples, 0, amplitude, frequency, sampling_rate)  
     
     # Feed ADC inputs into the DUT
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in)  # one sample per 1 MHz sampling period
+    waveforms = np.asarray(adc_waveforms)
+    delays = np.asarray(delay_samples)[:, None]
+
+    def model(columns):
+        # Verify the output waveform once the buffers are full
+        sample_idx = columns["index"]
+        expected = waveforms[np.arange(4)[:, None], sample_idx - delays].sum(axis=0) // 4  # wrong
+        return {"aggregated_waveform": np.ma.masked_where(sample_idx <= buffer_size, expected)}
+
+    scoreboard = Scoreboard(model, tolerance=999, name="receive_beamformer")
+    monitor = Monitor({**{f"adc_in{i}": dut.adc_in[i] for i in range(4)}, "aggregated_waveform": dut.aggregated_waveform},
+                      scoreboard.block, on_block=scoreboard.put_block)
     for sample_idx in range(num_samples):
-        await FallingEdge(dut.clk_in)
-        for i in range(4):  # Assuming 4 receivers
-            # load the receivers
-            dut.adc_in[i].value = adc_waveforms[i][sample_idx]
-        dut.data_valid_in.value = 1  # Indicate data is valid
-        await RisingEdge(dut.clk_in)
-        await FallingEdge(dut.clk_in)
-        
-        dut.data_valid_in.value = 0  # Clear data valid after processing
-        
-        await RisingEdge(dut.clk_in) # need to wait an additonal cycle for proper aggregated waveform
-
-        # Read and verify the output waveform
-        if sample_idx > buffer_size:
-            # Validate aggregated waveform (basic verification)
-            expected_value = sum(
-                adc_waveforms[i][(sample_idx - delay_samples[i])] # wrong
-                for i in range(4)
-            ) // 4  # Divide by 4 to normalize
-            assert abs(int(str(dut.aggregated_waveform.value), 2) - expected_value) < 1000, \
-                f"Sample Idx {sample_idx}: Expected {expected_value}, got {int(str(dut.aggregated_waveform.value), 2)}"
-
-        
-        # Wait for one sampling period
-        for _ in range(98): # remaining clk cycles in sampling period
-            await RisingEdge(dut.clk_in)
+        # load the receivers; the aggregated waveform is read once the period is over
+        await strobe.send(*((dut.adc_in[i], adc_waveforms[i][sample_idx]) for i in range(4)))
+        monitor.sample()
+    monitor.flush()
+    coverage.STEERING.sample(magnitude=coverage.steering_magnitude(int(dut.sin_theta.value)), sign_bit=int(dut.sign_bit.value))
+    scoreboard.check()
 
     cocotb.log.info("Test passed: Basic functionality verified.")
 
@@ -130,7 +83,7 @@ async def test_receive_beamform_full_right(dut):
     """Basic functionality test for the receive_beamform module."""
     # tests when all receivers in sync
     # Start clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     for rx in range(4):
         dut.adc_in[rx].value = 0
@@ -140,12 +93,7 @@ async def test_receive_beamform_full_right(dut):
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0  
-    
-    await RisingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
 
     # Parameters
     num_samples = 100
@@ -158,33 +106,26 @@ async def test_receive_beamform_full_right(dut):
     adc_waveforms, delay_samples = generate_adc_waveforms(num_samples, 90, amplitude, frequency, sampling_rate)  
         
     # Feed ADC inputs into the DUT
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in)  # one sample per 1 MHz sampling period
+    waveforms = np.asarray(adc_waveforms)
+    delays = np.asarray(delay_samples)[:, None]
+
+    def model(columns):
+        # Verify the output waveform once the buffers are full
+        sample_idx = columns["index"]
+        expected = waveforms[np.arange(4)[:, None], sample_idx - delays].sum(axis=0) // 4  # wrong
+        return {"aggregated_waveform": np.ma.masked_where(sample_idx <= buffer_size, expected)}
+
+    scoreboard = Scoreboard(model, tolerance=999, name="receive_beamformer")
+    monitor = Monitor({**{f"adc_in{i}": dut.adc_in[i] for i in range(4)}, "aggregated_waveform": dut.aggregated_waveform},
+                      scoreboard.block, on_block=scoreboard.put_block)
     for sample_idx in range(num_samples):
-        await FallingEdge(dut.clk_in)
-        for i in range(4):  # Assuming 4 receivers
-            # load the receivers
-            dut.adc_in[i].value = adc_waveforms[i][sample_idx]
-        dut.data_valid_in.value = 1  # Indicate data is valid
-        await RisingEdge(dut.clk_in)
-        await FallingEdge(dut.clk_in)
-        
-        dut.data_valid_in.value = 0  # Clear data valid after processing
-        
-        await RisingEdge(dut.clk_in) # need to wait an additonal cycle for proper aggregated waveform
-
-        # Read and verify the output waveform
-        if sample_idx > buffer_size:
-            # Validate aggregated waveform (basic verification)
-            expected_value = sum(
-                adc_waveforms[i][(sample_idx - delay_samples[i])] # wrong
-                for i in range(4)
-            ) // 4  # Divide by 4 to normalize
-            assert abs(int(str(dut.aggregated_waveform.value), 2) - expected_value) < 1000, \
-                f"Sample Idx {sample_idx}: Expected {expected_value}, got {int(str(dut.aggregated_waveform.value), 2)}"
-
-        
-        # Wait for one sampling period
-        for _ in range(98): # remaining clk cycles in sampling period
-            await RisingEdge(dut.clk_in)
+        # load the receivers; the aggregated waveform is read once the period is over
+        await strobe.send(*((dut.adc_in[i], adc_waveforms[i][sample_idx]) for i in range(4)))
+        monitor.sample()
+    monitor.flush()
+    coverage.STEERING.sample(magnitude=coverage.steering_magnitude(int(dut.sin_theta.value)), sign_bit=int(dut.sign_bit.value))
+    scoreboard.check()
 
     cocotb.log.info("Test passed: Basic functionality verified.")
     
@@ -195,7 +136,7 @@ async def test_receive_beamform_45_degrees(dut):
     # maybe there is slight rounding
     # tests when all receivers in sync
     # Start clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     for rx in range(4):
         dut.adc_in[rx].value = 0
@@ -205,12 +146,7 @@ async def test_receive_beamform_45_degrees(dut):
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0  
-    
-    await RisingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
 
     # Parameters
     num_samples = 100
@@ -220,45 +156,134 @@ async def test_receive_beamform_45_degrees(dut):
     buffer_size = 80
 
     # Generate ADC input waveforms
-    adc_waveforms, delay_samples = generate_adc_waveforms(num_samples, 45, amplitude, frequency, sampling_rate)  
-    
-    print(adc_waveforms)
-    
-    print(delay_samples)
+    vectors = adc_vectors(num_samples, 45, amplitude, frequency, sampling_rate, num_receivers=4)
+    adc_waveforms = vectors["waveforms"].tolist()
+    expected_aggregate = vectors["expected_aggregate"]
     
     # Feed ADC inputs into the DUT
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in)  # one sample per 1 MHz sampling period
+    def model(columns):
+        # Verify the output waveform once the buffers are full
+        sample_idx = columns["index"]
+        return {"aggregated_waveform": np.ma.masked_where(sample_idx <= buffer_size, expected_aggregate[sample_idx])}
+
+    scoreboard = Scoreboard(model, tolerance=2999, name="receive_beamformer")
+    monitor = Monitor({**{f"adc_in{i}": dut.adc_in[i] for i in range(4)}, "aggregated_waveform": dut.aggregated_waveform},
+                      scoreboard.block, on_block=scoreboard.put_block)
     for sample_idx in range(num_samples):
-        await FallingEdge(dut.clk_in)
-        for i in range(4):  # Assuming 4 receivers
-            # load the receivers
-            dut.adc_in[i].value = adc_waveforms[i][sample_idx]
-        dut.data_valid_in.value = 1  # Indicate data is valid
-        await RisingEdge(dut.clk_in)
-        await FallingEdge(dut.clk_in)
-        
-        dut.data_valid_in.value = 0  # Clear data valid after processing
-        
-        await RisingEdge(dut.clk_in) # need to wait an additonal cycle for proper aggregated waveform
-
-        # Read and verify the output waveform
-        if sample_idx > buffer_size:
-            # Validate aggregated waveform (basic verification)
-            expected_value = sum(
-                adc_waveforms[i][(sample_idx - delay_samples[i])] # wrong
-                for i in range(4)
-            ) // 4  # Divide by 4 to normalize
-            assert abs(int(str(dut.aggregated_waveform.value), 2) - expected_value) < 3000, \
-                f"Sample Idx {sample_idx}: Expected {expected_value}, got {int(str(dut.aggregated_waveform.value), 2)}"
-
-        
-        # Wait for one sampling period
-        for _ in range(98): # remaining clk cycles in sampling period
-            await RisingEdge(dut.clk_in)
+        # load the receivers; the aggregated waveform is read once the period is over
+        await strobe.send(*((dut.adc_in[i], adc_waveforms[i][sample_idx]) for i in range(4)))
+        monitor.sample()
+    monitor.flush()
+    coverage.STEERING.sample(magnitude=coverage.steering_magnitude(int(dut.sin_theta.value)), sign_bit=int(dut.sign_bit.value))
+    scoreboard.check()
 
     cocotb.log.info("Test passed: Basic functionality verified.")
 
 
 
+@cocotb.test()
+async def test_receive_beamform_capture_replay(dut):
+    """Replays a raw ADC capture ($SONIC_SIGHT_CAPTURE, or a synthetic one) against the model."""
+    await start_clock(dut.clk_in)
+
+    capture = replay_source()
+    start = int(os.getenv("SONIC_SIGHT_CAPTURE_START", 0))
+    stop = min(start + REPLAY_SAMPLES, len(capture))
+    assert capture.channels == 2, f"receive_beamformer takes 2 receivers, capture has {capture.channels}"
+    cocotb.log.info(f"Replaying samples [{start}, {stop}) of {capture}")
+
+    # the DUT is reset right before the first sample, so the model starts from empty buffers
+    expected = aggregated_window(capture, start, stop, after_reset=True)
+    adc_in = (capture.samples[start:stop] >> (capture.bit_width - 10)).tolist()
+
+    dut.sin_theta.value, dut.sign_bit.value = steering_inputs(capture)
+    dut.data_valid_in.value = 0
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in, cycles_per_sample=2)
+    scoreboard = Scoreboard(lambda columns: {"aggregated_waveform": expected[columns["index"] - start]},
+                            name="receive_beamformer replay")
+    monitor = Monitor({**{f"adc_in{i}": dut.adc_in[i] for i in range(len(adc_in[0]))},
+                       "aggregated_waveform": dut.aggregated_waveform},
+                      scoreboard.block, on_block=lambda first, columns: scoreboard.put_block(start + first, columns))
+    for samples in adc_in:
+        await strobe.send(*((dut.adc_in[i], sample) for i, sample in enumerate(samples)))
+        monitor.sample()
+    monitor.flush()
+    coverage.STEERING.sample(magnitude=coverage.steering_magnitude(int(dut.sin_theta.value)), sign_bit=int(dut.sign_bit.value))
+    scoreboard.check()
+
+    cocotb.log.info(f"Test passed: {stop - start} replayed samples match the model.")
+
+
+@cocotb.test()
+async def test_receive_beamform_random(dut):
+    """Constrained-random steering and ADC words, one reset per seed, against the delay-and-sum model."""
+    await start_clock(dut.clk_in)
+    dut.data_valid_in.value = 0
+    await FallingEdge(dut.clk_in)
+
+    element_spacing = int(dut.ELEMENT_SPACING.value)
+    num_vectors = vectors(256 + buffer_size(2, element_spacing))  # every delay sees data past the buffer fill
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in, cycles_per_sample=2)
+
+    async def run_seed(seed):
+        rng = generator("receive_beamformer", seed)
+        sin_theta, sign_bit, delays = receive_steering(rng, element_spacing=element_spacing)
+        samples = adc_samples(rng, num_vectors)
+
+        dut.sin_theta.value, dut.sign_bit.value = sin_theta, sign_bit
+        coverage.STEERING.sample(magnitude=coverage.steering_magnitude(sin_theta), sign_bit=sign_bit)
+        await reset(dut.clk_in, dut.rst_in)
+        monitor = Monitor({"aggregated_waveform": dut.aggregated_waveform}, num_vectors)
+        for row in samples.tolist():
+            await strobe.send(*((dut.adc_in[i], sample) for i, sample in enumerate(row)))
+            monitor.sample()
+        check_vectors({"aggregated_waveform": aggregate(samples, delays)},
+                      {"aggregated_waveform": monitor.values("aggregated_waveform")},
+                      {**{f"adc_in{i}": samples[:, i] for i in range(samples.shape[1])},
+                       "sin_theta": np.full(num_vectors, sin_theta), "sign_bit": np.full(num_vectors, sign_bit)})
+
+    seeds = await run_seeds(__name__, "test_receive_beamform_random", run_seed, num_vectors)
+    cocotb.log.info(f"Random receive_beamformer test passed: {len(seeds)} seeds of {num_vectors} samples.")
+
+
+@cocotb.test()
+async def test_receive_beamform_stale_buffers(dut):
+    """Samples written before a reset never reach the output: after it the buffers read as cleared."""
+    await start_clock(dut.clk_in)
+    dut.data_valid_in.value = 0
+    await FallingEdge(dut.clk_in)
+
+    element_spacing = int(dut.ELEMENT_SPACING.value)
+    size = buffer_size(2, element_spacing)
+    rng = generator("receive_beamformer_stale", 0)
+    strobe = SampleStrobe(dut.clk_in, dut.data_valid_in, cycles_per_sample=1)  # back to back, as after burst_start
+    for angle in (90, -90, 45, 0):
+        sin_theta, sign_bit = sin_code(angle)
+        delays = receive_delays(angle, 2, element_spacing=element_spacing)[0]
+        dut.sin_theta.value, dut.sign_bit.value = int(sin_theta), int(sign_bit)
+        coverage.STEERING.sample(magnitude=abs(angle), sign_bit=int(sign_bit))
+
+        # fill every entry with the previous burst's data, then start a new one
+        await reset(dut.clk_in, dut.rst_in)
+        for row in adc_samples(rng, size).tolist():
+            await strobe.send(*((dut.adc_in[i], sample) for i, sample in enumerate(row)))
+        await reset(dut.clk_in, dut.rst_in)
+
+        samples = adc_samples(rng, int(delays.max()) + 64)
+        monitor = Monitor({"aggregated_waveform": dut.aggregated_waveform}, len(samples))
+        for row in samples.tolist():
+            await strobe.send(*((dut.adc_in[i], sample) for i, sample in enumerate(row)))
+            monitor.sample()
+        check_vectors({"aggregated_waveform": aggregate(samples, delays)},
+                      {"aggregated_waveform": monitor.values("aggregated_waveform")},
+                      {"adc_in0": samples[:, 0], "adc_in1": samples[:, 1], "angle": np.full(len(samples), angle)})
+    cocotb.log.info(f"Stale buffer test passed: BUFFER_SIZE {size}, no sample from before a reset was read.")
+
+
 def runner():
     """Simulate the transmit_beamformer module using the Python runner."""
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
@@ -287,25 +312,66 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
-    # Build step to compile the design with overridden parameters
-    runner.build(
-        sources=sources,
-        hdl_toplevel="receive_beamformer",  # Top level HDL module
-        always=True,
-        build_args=build_test_args,
-        parameters=parameters,  # Pass parameter overrides here
-        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
-    )
-
-    # Run the test(s)
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "receive_beamformer")
+
+    # A replayed seed runs only in the build it failed in (SONIC_SIGHT_BUILD, sonic_sight.random_vectors)
+    build = os.getenv("SONIC_SIGHT_BUILD")
+    testcase = os.getenv("TESTCASE")
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
-        hdl_toplevel="receive_beamformer",  # Top level HDL module
-        test_module="test_receive_beamformer",  # Python test module containing test(s)
-        test_args=run_test_args,
-        waves=True  # Enable waveform dumping
-    )
+
+    if build in (None, "sim_build"):
+        # Build step to compile the design with overridden parameters
+        runner.build(
+            sources=sources,
+            hdl_toplevel="receive_beamformer",  # Top level HDL module
+            always=True,
+            build_args=build_test_args,
+            parameters=parameters,  # Pass parameter overrides here
+            timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+            waves=WAVES  # Full dumps only with WAVES=1
+        )
+
+        # Run the test(s)
+        results = runner.test(
+            hdl_toplevel="receive_beamformer",  # Top level HDL module
+            test_module="test_receive_beamformer",  # Python test module containing test(s)
+            test_args=run_test_args,
+            extra_env={"SONIC_SIGHT_BUILD": "sim_build"},  # named in failing seeds' records
+            waves=WAVES  # Failed tests are rerun with waves below
+        )
+        rerun_failures(runner, results, sources, "receive_beamformer", "test_receive_beamformer", build_args=build_test_args,
+                       parameters=parameters, test_args=run_test_args,
+                       extra_env={"SONIC_SIGHT_BUILD": "sim_build"})
+
+    # Long arrays: at 300 mm spacing the largest delay is 874 samples, so BUFFER_SIZE is 1024.
+    # Only the tests below run in this build, and only those TESTCASE selects.
+    large_buffer_tests = [test for test in ["test_receive_beamform_stale_buffers", "test_receive_beamform_random"]
+                          if not testcase or test in testcase.split(",")]
+    if build in (None, "sim_build_large_buffer") and large_buffer_tests:
+        large_buffer_parameters = {"ELEMENT_SPACING": 300}
+        runner.build(
+            sources=sources,
+            hdl_toplevel="receive_beamformer",
+            always=True,
+            build_args=build_test_args,
+            parameters=large_buffer_parameters,
+            timescale=('1ns', '1ps'),
+            build_dir="sim_build_large_buffer",
+            waves=WAVES
+        )
+        results = runner.test(
+            hdl_toplevel="receive_beamformer",
+            test_module="test_receive_beamformer",
+            testcase=large_buffer_tests,
+            test_args=run_test_args,
+            extra_env={"SONIC_SIGHT_BUILD": "sim_build_large_buffer"},
+            build_dir="sim_build_large_buffer",
+            waves=WAVES
+        )
+        rerun_failures(runner, results, sources, "receive_beamformer", "test_receive_beamformer",
+                       build_args=build_test_args, parameters=large_buffer_parameters, test_args=run_test_args,
+                       build_dir="sim_build_large_buffer", extra_env={"SONIC_SIGHT_BUILD": "sim_build_large_buffer"})
 
 
 if __name__ == "__main__":
@@ -1,40 +1,90 @@
 import cocotb
 import os
 import sys
-import math
+import numpy as np
 from pathlib import Path
-from cocotb.triggers import Timer
+from cocotb.triggers import FallingEdge
 from cocotb.runner import get_runner
+from sonic_sight import coverage
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.monitors import Monitor
+from sonic_sight.random_vectors import angle_codes, generator, run_seeds, vectors
+from sonic_sight.testbench import start_clock
+from sonic_sight.waves import WAVES, rerun_failures
 
-TOLERANCE = 10
+TOLERANCE = 4  # LSBs, interpolation between whole-degree ROM entries
 SCALE = 65536
+ANGLE_WIDTH = 12
+ANGLE_FRAC_BITS = 4  # 1/16 degree steps
+LATENCY = 3
+
+
+def expected_outputs(codes):
+    """Expected (sin_value, sign_bit) arrays for raw angle codes, saturating at +-90 degrees."""
+    angles = np.asarray(codes) / (1 << ANGLE_FRAC_BITS)
+    magnitudes = np.minimum(np.abs(angles), 90)
+    return np.abs(np.sin(np.radians(magnitudes))) * SCALE, (angles < 0).astype(np.int64)
+
+
+async def sweep(dut, codes):
+    """Drives one angle code per clock, records each output LATENCY cycles later and checks them all at the end."""
+    codes = list(codes)
+    monitor = Monitor({"sin_value": dut.sin_value, "sign_bit": dut.sign_bit}, len(codes))
+    for cycle, code in enumerate(codes + [None] * LATENCY):
+        await FallingEdge(dut.clk_in)
+        if cycle >= LATENCY:
+            monitor.sample()
+        if code is not None:
+            dut.angle.value = code
+
+    expected_sin_value, expected_sign_bit = expected_outputs(codes)
+    coverage.STEERING.sample(magnitude=np.minimum(np.abs(codes) / (1 << ANGLE_FRAC_BITS), 90), sign_bit=expected_sign_bit)
+    actual_sin_value = monitor.values("sin_value")
+    actual_sign_bit = monitor.values("sign_bit")
+    bad = np.flatnonzero(actual_sign_bit != expected_sign_bit)
+    assert len(bad) == 0, \
+        f"Angle code {codes[bad[0]]}: Expected sign_bit={expected_sign_bit[bad[0]]}, got {actual_sign_bit[bad[0]]} " \
+        f"({len(bad)} mismatches)"
+    bad = np.flatnonzero(np.abs(actual_sin_value - expected_sin_value) >= TOLERANCE)
+    assert len(bad) == 0, \
+        f"Angle code {codes[bad[0]]}: Expected sin_value={expected_sin_value[bad[0]]:.1f}, got {actual_sin_value[bad[0]]} " \
+        f"({len(bad)} mismatches)"
+
 
 @cocotb.test()
 async def test_sin_lut_basic(dut):
-    """Basic Test for sin_lut module - Verify LUT values and sign behavior."""
-    # Test a range of angles to verify the LUT values and sign bit
-    for angle in range(-90, 90):  # sin angle off boresight
-        dut.angle.value = angle  # Set the angle
-        await Timer(10, units="ns")  # Allow time for output to propagate
-
-        # Expected values
-        expected_sign_bit = 1 if angle < 0 else 0  # Sign bit is high for angles > 90
-        expected_sin_value = abs(int(math.sin(math.radians(angle)) * SCALE))
-        
-        actual_sin_value = int(dut.sin_value.value)
-        actual_sign_bit = dut.sign_bit.value
-
-        # Assertions
-        assert actual_sign_bit == expected_sign_bit, \
-            f"Angle {angle}: Expected sign_bit={expected_sign_bit}, got {actual_sign_bit}"
-        assert abs(actual_sin_value - expected_sin_value) < TOLERANCE, \
-            f"Angle {angle}: Expected sin_value={expected_sin_value}, got {actual_sign_bit}"
-
-    cocotb.log.info("Basic sin_lut test passed: LUT values and sign bits match expected behavior.")
+    """Whole-degree angles off boresight keep their sine values and sign behavior."""
+    await start_clock(dut.clk_in)
+    await sweep(dut, [angle << ANGLE_FRAC_BITS for angle in range(-90, 90)])
+    cocotb.log.info("Basic sin_lut test passed: whole-degree values and sign bits match.")
+
+
+@cocotb.test()
+async def test_sin_lut_exhaustive(dut):
+    """Every representable angle code, including saturated ones, against np.sin."""
+    await start_clock(dut.clk_in)
+    codes = range(-(1 << (ANGLE_WIDTH - 1)), 1 << (ANGLE_WIDTH - 1))
+    await sweep(dut, codes)
+    cocotb.log.info(f"Exhaustive sin_lut sweep passed: {len(codes)} angle codes.")
+
+
+@cocotb.test()
+async def test_sin_lut_random(dut):
+    """Constrained-random angle codes, for ANGLE_WIDTH too wide to sweep exhaustively."""
+    await start_clock(dut.clk_in)
+
+    num_vectors = vectors(256)
+
+    async def run_seed(seed):
+        await sweep(dut, angle_codes(generator("sin_lut", seed), num_vectors, ANGLE_WIDTH).tolist())
+
+    seeds = await run_seeds(__name__, "test_sin_lut_random", run_seed, num_vectors)
+    cocotb.log.info(f"Random sin_lut test passed: {len(seeds)} seeds of {num_vectors} angle codes.")
+
 
 def runner():
     """Simulate the sin_lut module using the Python runner."""
-    
+
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
     sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
     proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
@@ -47,16 +97,22 @@ def runner():
     sources = [
         proj_path / "hdl" / "sin_lut.sv"
     ]
-    
+
     # Build arguments for compiling the design
     build_test_args = ["-Wall"]  # Add more build arguments if necessary
 
     # Design parameters
-    parameters = {}  # Add any parameters if needed
+    parameters = {
+        "ANGLE_WIDTH": ANGLE_WIDTH,
+        "ANGLE_FRAC_BITS": ANGLE_FRAC_BITS
+    }
 
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "sin_lut")
+
     # Build step to compile the design
     runner.build(
         sources=sources,
@@ -65,17 +121,19 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="sin_lut",  # Top level HDL module
         test_module="test_sin_lut",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "sin_lut", "test_sin_lut", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
 
 if __name__ == "__main__":
     runner()
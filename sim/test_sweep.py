@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from sonic_sight.sweep import TRIAL_DTYPE, run_trial, summarize, sweep
+
+
+GRID = dict(velocities=[-20.0, 20.0], ranges=[1.0], angles=[0.0, 30.0], snrs=[20.0], seeds=range(3))
+
+
+def test_sweep_resumes_missing_chunks(tmp_path):
+    """A rerun only runs the chunks missing from out_dir and returns the same rows as a full run."""
+    full, stats = sweep(tmp_path, **GRID, chunk_size=5, workers=1)
+    assert stats["trials"] == stats["trials_run"] == 12
+    assert sorted(path.name for path in tmp_path.glob("chunk-*.npy")) == ["chunk-00000.npy", "chunk-00001.npy",
+                                                                          "chunk-00002.npy"]
+    velocity, target_range, angle, snr, seed = full[7][["velocity", "range", "angle", "snr", "seed"]]
+    assert tuple(full[7])[5:] == pytest.approx(run_trial(velocity, target_range, angle, snr, seed), nan_ok=True)
+
+    (tmp_path / "chunk-00001.npy").unlink()
+    resumed, stats = sweep(tmp_path, **GRID, chunk_size=5, workers=1)
+    assert stats["trials_run"] == 5
+    assert resumed.tobytes() == full.tobytes()
+
+    _, stats = sweep(tmp_path, **GRID, chunk_size=5, workers=1)
+    assert stats["trials_run"] == 0
+    with pytest.raises(ValueError):
+        sweep(tmp_path, **GRID, chunk_size=5, workers=1, echo_threshold=100)
+
+
+def test_summarize_aggregates_over_seeds():
+    """Detection, false alarm and error statistics are per grid point, errors over detected trials only."""
+    results = np.zeros(6, dtype=TRIAL_DTYPE)
+    results["velocity"] = [10, 10, 10, -10, -10, -10]
+    results["range"] = 2.0
+    results["seed"] = [0, 1, 2, 0, 1, 2]
+    results["detected"] = [True, True, False, True, True, True]
+    results["false_alarm"] = [False, True, False, False, False, False]
+    results["measured_range"] = [2.01, 2.10, np.nan, 1.98, 2.02, 2.00]
+    results["measured_velocity"] = [11.0, 13.0, np.nan, -10.0, -9.0, -14.0]
+
+    summary = summarize(results, velocity_tolerance=2.0, range_tolerance=0.05)
+    assert summary["velocity"].tolist() == [-10, 10]
+    assert summary["trials"].tolist() == [3, 3]
+    # the 2.10 m detection is outside range_tolerance: a miss for Pd, but still in the error statistics
+    assert summary["detection_probability"] == pytest.approx([1, 1 / 3])
+    assert summary["false_alarm_rate"] == pytest.approx([0, 1 / 3])
+    assert summary["velocity_within_tolerance"] == pytest.approx([2 / 3, 1 / 3])
+    assert summary["range_bias"] == pytest.approx([0.0, 0.055])
+    assert summary["range_rms"] == pytest.approx([np.sqrt(0.0008 / 3), np.sqrt((0.01 ** 2 + 0.1 ** 2) / 2)])
+    assert summary["velocity_bias"] == pytest.approx([-1.0, 2.0])
+    assert summary["velocity_rms"] == pytest.approx([np.sqrt(17 / 3), np.sqrt(5)])
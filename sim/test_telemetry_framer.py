@@ -0,0 +1,156 @@
+import cocotb
+import os
+import sys
+from pathlib import Path
+from cocotb.triggers import FallingEdge, ClockCycles
+from cocotb.runner import get_runner
+
+from telemetry import decode_frames, FLAG_RANGE_VALID, FLAG_VELOCITY_VALID, FLAG_TOWARDS_OBSERVER
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.testbench import reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
+
+NUM_SAMPLES = 4
+DECIMATION = 3
+CLKS_PER_BIT = 16  # fast line rate keeps the loopback short
+
+
+async def uart_receiver(dut, received):
+    """Simulated serial loopback: samples tx_out at bit centres and appends bytes to received."""
+    while True:
+        await FallingEdge(dut.tx_out)  # start bit
+        await ClockCycles(dut.clk_in, CLKS_PER_BIT + CLKS_PER_BIT // 2)
+        value = 0
+        for bit in range(8):
+            value |= int(dut.tx_out.value) << bit
+            await ClockCycles(dut.clk_in, CLKS_PER_BIT)
+        assert dut.tx_out.value == 1, "Missing stop bit"
+        received.append(value)
+
+
+async def run_pulse(dut, range_cm, velocity, towards, angle, samples):
+    """Triggers a frame for the previous pulse, then feeds this pulse's results and samples."""
+    await FallingEdge(dut.clk_in)
+    dut.trigger_in.value = 1
+    await FallingEdge(dut.clk_in)
+    dut.trigger_in.value = 0
+    for sample in samples:
+        dut.sample_in.value = sample
+        dut.sample_valid_in.value = 1
+        await FallingEdge(dut.clk_in)
+        dut.sample_valid_in.value = 0
+        await ClockCycles(dut.clk_in, 2)
+        await FallingEdge(dut.clk_in)
+    dut.range_valid_in.value = 1
+    dut.range_in.value = range_cm
+    dut.velocity_valid_in.value = 1
+    dut.velocity_in.value = velocity
+    dut.towards_observer_in.value = towards
+    dut.angle_in.value = angle
+    while dut.busy_out.value:
+        await FallingEdge(dut.clk_in)
+
+
+@cocotb.test()
+async def test_telemetry_loopback(dut):
+    """Frames sent over the UART decode back to the latched results and decimated samples."""
+    await start_clock(dut.clk_in)
+
+    for name in ["trigger_in", "range_valid_in", "range_in", "velocity_valid_in", "velocity_in",
+                 "towards_observer_in", "angle_in", "sample_in", "sample_valid_in"]:
+        getattr(dut, name).value = 0
+
+    # Reset the DUT
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+
+    received = bytearray()
+    await cocotb.start(uart_receiver(dut, received))
+
+    pulses = [
+        (120, 30, 1, -20, list(range(1000, 1000 + NUM_SAMPLES * DECIMATION + 5))),
+        (4321, 7, 0, 45, list(range(50000, 50000 + NUM_SAMPLES * DECIMATION))),
+        (9, 0, 1, 0, list(range(7, 7 + 2 * DECIMATION))),  # short pulse, bank partly stale
+    ]
+    for pulse in pulses:
+        await run_pulse(dut, *pulse)
+    # trigger the frame for the last pulse
+    await run_pulse(dut, 0, 0, 0, 0, [])
+    await ClockCycles(dut.clk_in, 20 * CLKS_PER_BIT)
+
+    frames, consumed = decode_frames(bytes(received))
+    assert consumed == len(received), f"Undecoded trailing bytes: {received[consumed:]}"
+    # the first frame reports the (empty) pulse before any results were driven
+    assert len(frames) == len(pulses) + 1, f"Expected {len(pulses) + 1} frames, got {len(frames)}"
+    assert list(frames["sequence"]) == list(range(len(pulses) + 1))
+
+    for frame, (range_cm, velocity, towards, angle, samples) in zip(frames[1:], pulses):
+        expected_flags = FLAG_RANGE_VALID | FLAG_VELOCITY_VALID | (FLAG_TOWARDS_OBSERVER if towards else 0)
+        assert frame["flags"] == expected_flags, f"Frame {frame['sequence']}: flags {frame['flags']}"
+        assert frame["range"] == range_cm, f"Frame {frame['sequence']}: range {frame['range']}"
+        assert frame["velocity"] == velocity, f"Frame {frame['sequence']}: velocity {frame['velocity']}"
+        assert frame["angle"] == angle, f"Frame {frame['sequence']}: angle {frame['angle']}"
+        decimated = samples[::DECIMATION][:NUM_SAMPLES]
+        assert list(frame["samples"][:len(decimated)]) == decimated, \
+            f"Frame {frame['sequence']}: samples {list(frame['samples'])}, expected {decimated}"
+
+    cocotb.log.info(f"Telemetry loopback passed: {len(frames)} frames, {len(received)} bytes.")
+
+
+def runner():
+    """Simulate the telemetry_framer module using the Python runner."""
+    hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
+    sim = os.getenv("SIM", "icarus")  # Set simulator, defaults to Icarus Verilog if not specified
+    proj_path = Path(__file__).resolve().parent.parent  # Path to the project directory
+
+    # Add paths to sys.path for module access if needed
+    sys.path.append(str(proj_path / "sim"))
+    sys.path.append(str(proj_path / "hdl"))
+
+    # HDL source files required for the simulation
+    sources = [
+        proj_path / "hdl" / "telemetry_framer.sv",
+        proj_path / "hdl" / "uart_tx.sv"
+    ]
+
+    # Build arguments for compiling the design
+    build_test_args = ["-Wall"]  # Add more build arguments if necessary
+
+    # Override parameters at build time
+    parameters = {
+        "NUM_SAMPLES": NUM_SAMPLES,
+        "DECIMATION": DECIMATION,
+        "CLKS_PER_BIT": CLKS_PER_BIT
+    }
+
+    # Get the appropriate runner based on the chosen simulator
+    runner = get_runner(sim)
+
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "telemetry_framer")
+
+    # Build step to compile the design with overridden parameters
+    runner.build(
+        sources=sources,
+        hdl_toplevel="telemetry_framer",  # Top level HDL module
+        always=True,
+        build_args=build_test_args,
+        parameters=parameters,  # Pass parameter overrides here
+        timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
+        waves=WAVES  # Full dumps only with WAVES=1
+    )
+
+    # Run the test(s)
+    run_test_args = []  # Specify any additional test arguments if needed
+    results = runner.test(
+        hdl_toplevel="telemetry_framer",  # Top level HDL module
+        test_module="test_telemetry_framer",  # Python test module containing test(s)
+        test_args=run_test_args,
+        waves=WAVES  # Failed tests are rerun with waves below
+    )
+    rerun_failures(runner, results, sources, "telemetry_framer", "test_telemetry_framer", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
+
+if __name__ == "__main__":
+    runner()
@@ -1,31 +1,28 @@
 import cocotb
+import numpy as np
 import os
 import random
 import sys
 import logging
 from pathlib import Path
-from cocotb.triggers import Timer, RisingEdge
+from cocotb.triggers import Timer, RisingEdge, FallingEdge
 from cocotb.utils import get_sim_time as gst
 from cocotb.runner import get_runner
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.monitors import Monitor
+from sonic_sight.random_vectors import check_vectors, generator, run_seeds, tof_model, tof_operands, vectors
+from sonic_sight.testbench import reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
 
-async def generate_clock(clock_wire):
-	while True: # repeat forever
-		clock_wire.value = 0
-		await Timer(5,units="ns")
-		clock_wire.value = 1
-		await Timer(5,units="ns")
-  
 @cocotb.test()
 async def test_time_of_flight_basic(dut):
     """Basic Test for Time of Flight module - Measuring a known distance"""
     # Clock generation
-    await cocotb.start( generate_clock( dut.clk_in ) ) #launches clock
+    await start_clock(dut.clk_in)
     # Reset the design
     dut.echo_detected.value = 0
     await Timer(100, units="ns")
-    dut.rst_in.value = 1
-    await Timer(10, units="ns")
-    dut.rst_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
     await Timer(10, units="ns")
 
     # Wait for some time to simulate the distance
@@ -58,6 +55,45 @@ async def test_time_of_flight_basic(dut):
     
     await Timer(100, units="ns")
 
+
+async def measure(dut, time_since_emission, monitor):
+    """Reports an echo on a falling edge and records range_out once the range divider is done."""
+    dut.time_since_emission.value = time_since_emission
+    dut.echo_detected.value = 1
+    await FallingEdge(dut.clk_in)
+    dut.echo_detected.value = 0
+    for _ in range(32):  # the quotient is at most 21 cm, one clock per centimetre
+        if not dut.divider_busy.value:
+            break
+        await FallingEdge(dut.clk_in)
+    assert not dut.divider_busy.value, f"Range divider still busy for time_since_emission={time_since_emission}"
+    await FallingEdge(dut.clk_in)  # range_out is registered after the divider's valid
+    monitor.sample()
+
+
+@cocotb.test()
+async def test_time_of_flight_random(dut):
+    """Constrained-random echo times, including ones whose 32-bit numerator wraps, one reset per seed."""
+    await start_clock(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+
+    num_vectors = vectors(64)
+
+    async def run_seed(seed):
+        times = tof_operands(generator("time_of_flight", seed), num_vectors)
+        dut.echo_detected.value = 0
+        await reset(dut.clk_in, dut.rst_in)
+        monitor = Monitor({"range_out": dut.range_out, "valid_out": dut.valid_out}, num_vectors)
+        for time_since_emission in times.tolist():
+            await measure(dut, time_since_emission, monitor)
+        check_vectors({"range_out": tof_model(times), "valid_out": np.ones(num_vectors, dtype=np.int64)},
+                      {name: monitor.values(name) for name in monitor.buffers},
+                      {"time_since_emission": times})
+
+    seeds = await run_seeds(__name__, "test_time_of_flight_random", run_seed, num_vectors)
+    cocotb.log.info(f"Random ToF test passed: {len(seeds)} seeds of {num_vectors} vectors.")
+
+
 def runner():
     """Simulate the time_of_flight module using the Python runner."""
     
@@ -84,6 +120,9 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "time_of_flight")
+
     # Build step to compile the design
     runner.build(
         sources=sources,
@@ -92,17 +131,19 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="time_of_flight",  # Top level HDL module
         test_module="test_time_of_flight",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "time_of_flight", "test_time_of_flight", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
 
 if __name__ == "__main__":
     runner()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from sonic_sight import traces
+from sonic_sight.traces import analyze, read_changes
+
+
+VCD = """$timescale 1ns $end
+$scope module top_level $end
+$var wire 1 ! clk_in $end
+$var wire 1 " burst_start $end
+$var wire 1 # echo_detected $end
+$var wire 4 $ state $end
+$scope module tx $end
+$var wire 1 % active_pulse $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+x#
+bxxxx $
+0%
+$end
+#10
+1!
+1"
+b0011 $
+#20
+0!
+0"
+1%
+#30
+1!
+1#
+#40
+0!
+0#
+0%
+#50
+1!
+1"
+#60
+0!
+0"
+1%
+#70
+1!
+#100
+0!
+"""
+
+
+def write_dump(tmp_path):
+    path = tmp_path / "dump.vcd"
+    path.write_text(VCD)
+    return path
+
+
+@pytest.mark.parametrize("block_size", [traces.BLOCK_SIZE, 16])
+def test_read_changes(tmp_path, monkeypatch, block_size):
+    """Changes of the selected signals by suffix, x/z as -1, and the dump's final time, whatever the block size."""
+    monkeypatch.setattr(traces, "BLOCK_SIZE", block_size)
+    timescale, changes, end_time = read_changes(write_dump(tmp_path), ["state", "tx.active_pulse"])
+    assert timescale == 1e-9
+    assert end_time == 100
+    times, values = changes["state"]
+    assert times.tolist() == [0, 10] and values.tolist() == [-1, 3]
+    times, values = changes["tx.active_pulse"]
+    assert times.tolist() == [0, 20, 40, 60] and values.tolist() == [0, 1, 0, 1]
+
+
+def test_analyze(tmp_path):
+    """Latency chain, edges and a duty cycle whose last high interval runs to the end of the dump."""
+    results = analyze(write_dump(tmp_path), chain=["burst_start", "echo_detected"], duty=["active_pulse"],
+                      latency_pairs=[("burst_start", "active_pulse")])
+    assert results["end_time"] == 100
+    assert results["burst_start.rising"].tolist() == [10, 50]
+    assert results["echo_detected.rising"].tolist() == [30]
+    assert results["chain"].tolist() == [[20], [-1]]
+    assert results["burst_start->active_pulse"].tolist() == [10, 10]
+    assert results["active_pulse.high_time"].tolist() == [20, 40]
+    assert np.isclose(results["active_pulse.duty"], 0.6)
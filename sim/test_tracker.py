@@ -0,0 +1,89 @@
+import numpy as np
+
+from tracker import MultiTargetTracker
+
+
+def run(tracker, frames):
+    """Steps the tracker through frames of reports; returns each frame's report -> track ids."""
+    return [tracker.step(np.asarray(reports, dtype=float).reshape(-1, 3)).tolist() for reports in frames]
+
+
+def test_birth_confirmation_and_growth():
+    """Every unassigned report opens a track, slots grow past capacity, tracks confirm after confirm_hits updates."""
+    tracker = MultiTargetTracker(capacity=1, confirm_hits=3)
+    targets = np.array([[1.0, 0.0, 0.0], [3.0, 0.0, 10.0], [6.0, 0.0, -10.0]])
+    assigned = run(tracker, [targets] * 3)
+    assert assigned == [[0, 1, 2]] * 3
+    track_ids, states = tracker.confirmed()
+    assert sorted(track_ids.tolist()) == [0, 1, 2]
+    assert np.allclose(states[np.argsort(track_ids), :3], targets)
+
+
+def test_predict_update_match_scalar_kalman():
+    """The vectorized predict and update give the textbook Kalman filter's state and covariance for each track."""
+    tracker = MultiTargetTracker()
+    first = np.array([[2.0, 1.0, 5.0], [8.0, -2.0, -5.0]])
+    second = np.array([[2.2, 1.1, 5.5], [7.6, -2.3, -5.2]])
+    run(tracker, [first, second])
+
+    F, Q = tracker._transition(tracker.dt)
+    H, R = tracker.H, tracker.R
+    for report, z in zip(first, second):
+        x = np.append(report, 0.0)
+        P = tracker.initial_P.copy()
+        x, P = F @ x, F @ P @ F.T + Q
+        K = P @ H.T @ np.linalg.inv(H @ P @ H.T + R)
+        x, P = x + K @ (z - H @ x), (np.eye(4) - K @ H) @ P
+        slot = np.flatnonzero(tracker.alive & np.isclose(tracker.x[:, 2], x[2]))
+        assert len(slot) == 1
+        assert np.allclose(tracker.x[slot[0]], x)
+        assert np.allclose(tracker.P[slot[0]], P)
+
+
+def test_crossing_targets_keep_their_tracks():
+    """Two targets crossing in range are told apart by their velocities, also where both fall in both gates."""
+    tracker = MultiTargetTracker()
+    t = np.arange(12) * tracker.dt
+    a = np.stack([5.0 + 0.5 * t, np.full_like(t, 0.5), np.zeros_like(t)], axis=1)
+    b = np.stack([5.5 - 0.5 * t, np.full_like(t, -0.5), np.zeros_like(t)], axis=1)
+    # reports in alternating order, so the track ids cannot follow the report order
+    frames = [np.stack([a[k], b[k]]) if k % 2 else np.stack([b[k], a[k]]) for k in range(len(t))]
+    assigned = run(tracker, frames)
+    a_tracks = {frame[1] if k % 2 == 0 else frame[0] for k, frame in enumerate(assigned)}
+    b_tracks = {frame[0] if k % 2 == 0 else frame[1] for k, frame in enumerate(assigned)}
+    assert a_tracks == {1} and b_tracks == {0}
+
+
+def test_missed_detection_coasts():
+    """A track missing one frame coasts on its prediction and takes the next report."""
+    tracker = MultiTargetTracker(max_misses=3)
+    t = np.arange(8) * tracker.dt
+    truth = np.stack([4.0 + 1.0 * t, np.ones_like(t), np.full_like(t, 20.0)], axis=1)
+    frames = [truth[k:k + 1] if k != 4 else np.zeros((0, 3)) for k in range(len(t))]
+    assigned = run(tracker, frames)
+    assert assigned == [[0]] * 4 + [[]] + [[0]] * 3
+    assert tracker.misses[tracker.track_id == 0].tolist() == [0]
+
+
+def test_clutter_outside_gate_opens_its_own_track():
+    """A report outside every gate neither updates a track nor joins it; it starts a new one."""
+    tracker = MultiTargetTracker()
+    target = np.array([[3.0, 0.0, 0.0]])
+    run(tracker, [target] * 3)
+    state = tracker.x[tracker.track_id == 0].copy()
+    assigned = run(tracker, [np.concatenate([target, [[3.0, 0.0, 40.0]]])])    # same range, 40 degrees off
+    assert assigned == [[0, 1]]
+    tracker_x = tracker.x[tracker.track_id == 0]
+    F, _ = tracker._transition(tracker.dt)
+    assert np.allclose(tracker_x[0, :3], (state @ F.T)[0, :3], atol=1e-9)
+
+
+def test_track_deleted_after_max_misses():
+    """A track survives max_misses empty frames and is deleted on the next; a later report opens a new id."""
+    tracker = MultiTargetTracker(max_misses=2, confirm_hits=1)
+    target = np.array([[5.0, 0.0, 0.0]])
+    run(tracker, [target] + [np.zeros((0, 3))] * 2)
+    assert tracker.confirmed()[0].tolist() == [0]
+    run(tracker, [np.zeros((0, 3))])
+    assert tracker.confirmed()[0].tolist() == []
+    assert run(tracker, [target]) == [[1]]
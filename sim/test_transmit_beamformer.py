@@ -2,44 +2,45 @@ import cocotb
 import os
 import sys
 import math
+import numpy as np
 from pathlib import Path
 from cocotb.triggers import Timer, RisingEdge, FallingEdge
 from cocotb.utils import get_sim_time as gst
 from cocotb.runner import get_runner
-
-def calculate_expected_offset(tx_idx, sin_value, sign_bit, period_cycles):
-    """Calculate the expected offset for a transmitter."""
+from sonic_sight import coverage
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.monitors import Monitor
+from sonic_sight.random_vectors import generator, run_seeds, steering_codes, vectors
+from sonic_sight.scoreboard import Scoreboard
+from sonic_sight.testbench import reset, start_clock
+from sonic_sight.waves import WAVES, rerun_failures
+
+def calculate_expected_offset(tx_idx, sin_value, sign_bit, num_transmitters):
+    """Calculate the expected pwm offsets, in clock cycles, for an array of transmitter indices."""
     DELAY_PER_TRANSMITTER_COMP = (9 * 100_000_000) // 343_000  # Example calculation
-    base_offset = (DELAY_PER_TRANSMITTER_COMP * tx_idx * sin_value) >> 15  # SIN_WIDTH = 16
-    if sign_bit:
-        base_offset = period_cycles - base_offset
-    return base_offset % period_cycles
+    position = (num_transmitters - 1 - tx_idx) if sign_bit else tx_idx
+    return DELAY_PER_TRANSMITTER_COMP * position * sin_value // 65536  # SIN_WIDTH = 16, 1.0 = 65536
 
 
-async def generate_clock(clock_wire):
-    """Generates a clock signal on the given wire."""
-    while True:
-        clock_wire.value = 0
-        await Timer(5, units="ns")  # Low for 5 ns
-        clock_wire.value = 1
-        await Timer(5, units="ns")  # High for 5 ns
+def expected_tx_out(global_cycles, sin_value, sign_bit, num_transmitters, period_cycles=2500, duty_cycle_on=1250):
+    """Expected packed tx_out words for an array of cycles counted from delays_ready."""
+    offsets = calculate_expected_offset(np.arange(num_transmitters), sin_value, sign_bit, num_transmitters)
+    in_period_cycle = (global_cycles[:, None] + offsets) % period_cycles
+    return ((in_period_cycle < duty_cycle_on).astype(np.int64) << np.arange(num_transmitters)).sum(axis=1)
 
 
 # @cocotb.test()
 async def test_transmit_basic(dut):
     """Basic Test for pwm module - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     dut.sin_value.value = 0
     dut.sign_bit = 0
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0    
+    await reset(dut.clk_in, dut.rst_in)
 
 
     # Parameters
@@ -71,17 +72,14 @@ async def test_transmit_basic(dut):
 async def test_transmit_basic_full_beamforming(dut):
     """Basic Test for pwm module - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     dut.sin_value.value = 65536
     dut.sign_bit.value = 0
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0    
+    await reset(dut.clk_in, dut.rst_in)
 
 
     # Parameters
@@ -129,79 +127,136 @@ async def test_transmit_basic_full_beamforming(dut):
 async def test_transmit_basic_partial_beamforming(dut):
     """Basic Test for pwm module - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
     
     dut.sin_value.value = 59395 # 65 degrees off boresight
     dut.sign_bit.value = 0
 
     # Reset the DUT
     await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 1
-    await FallingEdge(dut.clk_in)
-    
-    dut.rst_in.value = 0    
+    await reset(dut.clk_in, dut.rst_in)
+
+    # pwm counters are loaded with the new delay table once it has been computed
+    await RisingEdge(dut.delays_ready)
 
 
-    # Parameters
-    period_cycles = 2500  # PERIOD_IN_CLOCK_CYCLES
-    duty_cycle_on = 1250  # DUTY_CYCLE_ON
-    
     max_sin_value = 65536
-    
-    num_transmitters = len(dut.tx_out)
-    
-    offset_comp = 9 * 100000000 // 343000
-    
     sin_value = int(math.sin(math.radians(65)) * max_sin_value)
-    
 
-    for global_cycle in range(2*period_cycles):
-        await RisingEdge(dut.clk_in)
-         
-        for tx in range(num_transmitters):
-            
-            if (dut.sign_bit.value):
-                offset = offset_comp * (num_transmitters - tx) * sin_value // max_sin_value
-            else:
-                offset = offset_comp * tx * sin_value // max_sin_value
-                
-            in_period_cycle = (global_cycle + offset) % period_cycles
-                
-            if in_period_cycle < duty_cycle_on:
-                expected_high = True
-            else:
-                expected_high = False
-                    
-            if expected_high:
-                assert dut.tx_out[tx].value == 1, \
-                    f"Transmitter #{tx}\n\
-                        Global Cycle {global_cycle}: \n\
-                        In Period Cycle {in_period_cycle}: \n\
-                            Expected high, got low"
-            else:
-                assert dut.tx_out[tx].value == 0, \
-                    f"Transmitter #{tx}\n\
-                        Global Cycle {global_cycle}: \n\
-                        In Period Cycle {in_period_cycle}: \n\
-                            Expected low, got high"
+    await check_edges(dut, sin_value, 0, 2 * 2500)  # two PERIOD_IN_CLOCK_CYCLES
 
 
     cocotb.log.info("Basic PWM test passed: Correct duty cycle.")
 
 
 
+async def check_edges(dut, sin_value, sign_bit, cycles):
+    """Checks every transmitter against the edge-timing model for the given steering input."""
+    num_transmitters = len(dut.tx_out)
+    scoreboard = Scoreboard(
+        lambda columns: {"tx_out": expected_tx_out(columns["index"], sin_value, sign_bit, num_transmitters)},
+        name=f"transmit_beamformer sin_value {sin_value} sign_bit {sign_bit}")
+    monitor = Monitor({"sin_value": dut.sin_value, "sign_bit": dut.sign_bit, "tx_out": dut.tx_out},
+                      scoreboard.block, on_block=scoreboard.put_block)
+
+    coverage.STEERING.sample(magnitude=coverage.steering_magnitude(sin_value), sign_bit=sign_bit)
+    for global_cycle in range(cycles):
+        await RisingEdge(dut.clk_in)
+        monitor.sample()
+    monitor.flush()
+    scoreboard.check()
+
+
+@cocotb.test()
+async def test_transmit_angle_change(dut):
+    """The delay table follows steering changes, and all elements realign on the new table."""
+    await start_clock(dut.clk_in)
+
+    dut.sin_value.value = 27697  # 25 degrees
+    dut.sign_bit.value = 1
+
+    # Reset the DUT
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+    await RisingEdge(dut.delays_ready)
+    await check_edges(dut, 27697, 1, 3000)
+
+    # steer to the other side without a reset
+    await FallingEdge(dut.clk_in)
+    dut.sin_value.value = 46340  # 45 degrees
+    dut.sign_bit.value = 0
+    await FallingEdge(dut.clk_in)
+    assert dut.delays_ready.value == 0, "delays_ready should drop while the table is rebuilt"
+    await RisingEdge(dut.delays_ready)
+    await check_edges(dut, 46340, 0, 3000)
+
+    cocotb.log.info("Angle change test passed: delay table rebuilt and elements realigned.")
+
+
+@cocotb.test()
+async def test_transmit_burst_restart(dut):
+    """A reset with unchanged steering (every burst_start) keeps tx_out low until the counters are reloaded."""
+    await start_clock(dut.clk_in)
+
+    dut.sin_value.value = 46340  # 45 degrees
+    dut.sign_bit.value = 0
+    await FallingEdge(dut.clk_in)
+    await reset(dut.clk_in, dut.rst_in)
+    await RisingEdge(dut.delays_ready)
+    await check_edges(dut, 46340, 0, 1000)
+
+    for burst in range(2):
+        await FallingEdge(dut.clk_in)
+        await reset(dut.clk_in, dut.rst_in)
+        cycles = 0
+        while dut.delays_ready.value == 0:
+            assert dut.tx_out.value == 0, f"Burst {burst}: tx_out {dut.tx_out.value} {cycles} cycles after reset, before delays_ready"
+            await FallingEdge(dut.clk_in)
+            cycles += 1
+        await check_edges(dut, 46340, 0, 2500)
+
+    cocotb.log.info(f"Burst restart test passed: tx_out held low for {cycles} cycles, then every element realigned.")
+
+
+@cocotb.test()
+async def test_transmit_random_steering(dut):
+    """Constrained-random steering inputs, one reset per seed and one period checked per steering change."""
+    await start_clock(dut.clk_in)
+
+    num_vectors = vectors(2)
+
+    async def run_seed(seed):
+        sin_values, sign_bits = steering_codes(generator("transmit_beamformer", seed), num_vectors)
+        dut.sin_value.value = 0
+        dut.sign_bit.value = 0
+        await FallingEdge(dut.clk_in)
+        await reset(dut.clk_in, dut.rst_in)
+        steering = (0, 0)
+        for sin_value, sign_bit in zip(sin_values.tolist(), sign_bits.tolist()):
+            if (sin_value, sign_bit) == steering:
+                continue  # no new table, so nothing realigns to check against
+            steering = (sin_value, sign_bit)
+            # steer without a reset, as the angle change test does
+            await FallingEdge(dut.clk_in)
+            dut.sin_value.value = sin_value
+            dut.sign_bit.value = sign_bit
+            await RisingEdge(dut.delays_ready)
+            await check_edges(dut, sin_value, sign_bit, 2500)  # one PERIOD_IN_CLOCK_CYCLES
+
+    seeds = await run_seeds(__name__, "test_transmit_random_steering", run_seed, num_vectors, default_seeds=1)
+    cocotb.log.info(f"Random steering test passed: {len(seeds)} seeds of {num_vectors} steering inputs.")
+
+
 # @cocotb.test()
 async def test_transmit_beamformer_basic(dut):
     """Basic Test for transmit_beamformer - Verify correct signal generation."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk))
+    await start_clock(dut.clk)
 
     # Reset the DUT
-    dut.rst_in.value = 1
     dut.sin_value.value = 65535  # Set sin_value to max positive
     dut.sign_bit.value = 0  # Test rightward propagation
-    await Timer(20, units="ns")
-    dut.rst_in.value = 0
+    await reset(dut.clk, dut.rst_in, cycles=2)
     await Timer(20, units="ns")
 
     # Parameters
@@ -243,12 +298,10 @@ async def test_transmit_beamformer_basic(dut):
 async def test_transmit_beamformer_with_sign_change(dut):
     """Test transmit_beamformer - Verify behavior with sign_bit change."""
     # Start the clock
-    await cocotb.start(generate_clock(dut.clk))
+    await start_clock(dut.clk)
 
     # Reset the DUT
-    dut.rst_in.value = 1
-    await Timer(20, units="ns")
-    dut.rst_in.value = 0
+    await reset(dut.clk, dut.rst_in, cycles=2)
     await Timer(20, units="ns")
 
     # Test leftward propagation
@@ -297,7 +350,7 @@ def runner():
 
     # Override parameters at build time
     parameters = {
-        # "NUM_TRANSMITTERS": 4,       # Example: Change the number of transmitters
+        "NUM_TRANSMITTERS": 16,      # wider than one wavelength, offsets wrap around the period
         # "ELEMENT_SPACING": 10,       # Example: Increase element spacing
         # "TARGET_FREQ": 40000         # Example: Set a different target frequency
     }
@@ -305,6 +358,9 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "transmit_beamformer")
+
     # Build step to compile the design with overridden parameters
     runner.build(
         sources=sources,
@@ -313,17 +369,19 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,  # Pass parameter overrides here
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="transmit_beamformer",  # Top level HDL module
         test_module="test_transmit_beamformer",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "transmit_beamformer", "test_transmit_beamformer", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,21 @@
 import cocotb
+import numpy as np
 import os
 import sys
-import math
+import time
 from pathlib import Path
 import shutil
-from cocotb.triggers import Timer, RisingEdge, FallingEdge
+from cocotb.triggers import FallingEdge
 from cocotb.utils import get_sim_time as gst
 from cocotb.runner import get_runner
 
-async def generate_clock(clock):
-    """Generates a clock signal on the given wire."""
-    while True:
-        clock.value = 0
-        await Timer(5, units="ns")  # Low for 5 ns
-        clock.value = 1
-        await Timer(5, units="ns")  # High for 5 ns
-
-def generate_receiver_waveform(num_samples, amplitude, frequency, sampling_rate):
-    """Generate a sinusoidal waveform to simulate receiver input."""
-    t_step = 1 / sampling_rate
-    return [int(amplitude * math.sin(2 * math.pi * frequency * i * t_step)) for i in range(num_samples)]
+from sonic_sight.capture import FFT_SIZE, aggregated_window, doppler, replay_model, replay_source
+from sonic_sight import coverage
+from sonic_sight.golden import sweep_frames, tone_sweep_vectors, tone_vectors
+from sonic_sight.hdl_clock import add_clock
+from sonic_sight.random_vectors import check_vectors
+from sonic_sight.testbench import CYCLES_PER_SAMPLE, SampleStrobe, reset, start_clock, stream, wait_high
+from sonic_sight.waves import WAVES, rerun_failures
 
 def calculate_expected_velocity(delta_f, peak_frequency, speed_of_sound=343):
     """Calculate the expected velocity using the Doppler formula."""
@@ -30,15 +26,12 @@ def calculate_expected_velocity(delta_f, peak_frequency, speed_of_sound=343):
 async def test_velocity_with_defined_velocity(dut):
     """Test the velocity module with a defined velocity."""
     # Start clock
-    await cocotb.start(generate_clock(dut.clk_in))
+    await start_clock(dut.clk_in)
 
     # Reset DUT
-    dut.rst_in.value = 1
     dut.receiver_data.value = 0
     dut.receiver_data_valid_in.value = 0
-    await RisingEdge(dut.clk_in)
-    await FallingEdge(dut.clk_in)
-    dut.rst_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
     await FallingEdge(dut.clk_in)
 
     # Parameters
@@ -53,26 +46,16 @@ async def test_velocity_with_defined_velocity(dut):
     test_frequency = (emitted_frequency * speed_of_sound) / (speed_of_sound - desired_velocity) # Test frequency for an approaching object
 
     # Generate test waveform
-    waveform = generate_receiver_waveform(num_samples, amplitude, test_frequency, sampling_rate)
+    waveform = tone_vectors(num_samples, amplitude, test_frequency, sampling_rate, num_samples)["waveform"].tolist()
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(test_frequency, sampling_rate, num_samples))
 
-    # Feed waveform into DUT
+    # Feed waveform into DUT, allowing 10 clocks of processing per sample
+    strobe = SampleStrobe(dut.clk_in, dut.receiver_data_valid_in, cycles_per_sample=11)
     for sample in waveform:
-        dut.receiver_data_valid_in.value = 1
-        dut.receiver_data.value = sample
-        await RisingEdge(dut.clk_in)
-        dut.receiver_data_valid_in.value = 0
-
-        # Allow time for processing
-        for _ in range(10):
-            await RisingEdge(dut.clk_in)
+        await strobe.send((dut.receiver_data, sample))
 
     # Wait for FFT processing to complete
-    doppler_ready = False
-    for _ in range(10000):  # Timeout after a large number of clock cycles
-        await RisingEdge(dut.clk_in)
-        if dut.doppler_ready.value:
-            doppler_ready = True
-            break
+    doppler_ready = await wait_high(dut.doppler_ready, dut.clk_in, 10000)  # Timeout after a large number of clock cycles
 
     assert doppler_ready, "FFT did not produce a valid peak frequency output."
 
@@ -93,6 +76,112 @@ async def test_velocity_with_defined_velocity(dut):
 
 
 
+@cocotb.test()
+async def test_velocity_top_level_rate(dut):
+    """One frame at top_level's sample spacing through the build's Doppler engine (USE_GOERTZEL or fft_wrapper)."""
+    await start_clock(dut.clk_in)
+
+    dut.receiver_data.value = 0
+    dut.receiver_data_valid_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
+
+    # 52167 Hz, an approaching target at 80 m/s: bin 106.84, clear of a tie with its neighbour
+    vectors = tone_vectors(FFT_SIZE, 32767, 40000 * 343 / (343 - 80), 1000000, FFT_SIZE)
+    waveform = vectors["waveform"]
+    expected_frequency, expected_velocity, expected_towards = doppler(waveform)
+    # the Goertzel bank searches the same bins, so both engines must pick the FFT model's peak
+    assert int(vectors["goertzel_peak_frequency"]) == expected_frequency, \
+        f"Goertzel model peak {int(vectors['goertzel_peak_frequency'])} Hz, FFT model peak {expected_frequency} Hz"
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(expected_frequency))
+
+    # goertzel_bank needs NUM_BINS + 1 = 80 clocks per sample; a dropped sample would stall the frame
+    strobe = SampleStrobe(dut.clk_in, dut.receiver_data_valid_in, CYCLES_PER_SAMPLE)
+    for sample in (waveform & 0xFFFF).tolist():
+        await strobe.send((dut.receiver_data, sample))
+
+    engine = "goertzel_bank" if int(dut.USE_GOERTZEL.value) else "fft_wrapper"
+    assert await wait_high(dut.doppler_ready, dut.clk_in, 10000), f"{engine}: no doppler_ready after the frame"
+    measured_velocity = int(dut.velocity_result.value)
+    measured_towards = int(dut.stored_towards_observer.value)
+    assert measured_velocity == expected_velocity, \
+        f"{engine}: expected velocity {expected_velocity} m/s ({expected_frequency} Hz), got {measured_velocity}"
+    assert measured_towards == expected_towards, \
+        f"{engine}: expected towards_observer {int(expected_towards)}, got {measured_towards}"
+    cocotb.log.info(f"Top-level rate test passed with {engine}: {measured_velocity} m/s.")
+
+
+@cocotb.test()
+async def test_velocity_capture_replay(dut):
+    """Replays one beamformed frame of a raw ADC capture and compares with the model's Doppler result."""
+    await start_clock(dut.clk_in)
+
+    capture = replay_source()
+    if os.getenv("SONIC_SIGHT_CAPTURE_START"):
+        start = int(os.getenv("SONIC_SIGHT_CAPTURE_START"))
+    else:
+        # the frame after the one in which the first echo starts (the model's onset detector:
+        # top_level's fires on the quiet mid-scale input already)
+        frames = replay_model(capture)
+        onsets = frames["start"][frames["onset_index"] >= 0]
+        assert len(onsets), f"No echo found in {capture}"
+        start = int(onsets[0]) + FFT_SIZE
+    frame = aggregated_window(capture, start, start + FFT_SIZE)
+    expected_frequency, expected_velocity, expected_towards = doppler(frame, capture.sample_rate)
+    cocotb.log.info(f"Replaying frame [{start}, {start + FFT_SIZE}) of {capture}")
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(expected_frequency, capture.sample_rate, FFT_SIZE))
+
+    dut.receiver_data.value = 0
+    dut.receiver_data_valid_in.value = 0
+    await reset(dut.clk_in, dut.rst_in)
+    await FallingEdge(dut.clk_in)
+
+    strobe = SampleStrobe(dut.clk_in, dut.receiver_data_valid_in, cycles_per_sample=11)
+    for sample in frame.tolist():
+        await strobe.send((dut.receiver_data, sample))
+
+    doppler_ready = await wait_high(dut.doppler_ready, dut.clk_in, 10000)
+    assert doppler_ready, "FFT did not produce a valid peak frequency output."
+
+    measured_velocity = int(dut.velocity_result.value)
+    measured_towards = int(dut.stored_towards_observer.value)
+    cocotb.log.info(f"Model: {expected_frequency} Hz, {expected_velocity} m/s; measured {measured_velocity} m/s")
+    assert abs(measured_velocity - expected_velocity) < 2, \
+        f"Expected velocity {expected_velocity}, but got {measured_velocity}"
+    assert measured_towards == expected_towards, \
+        f"Expected towards_observer {int(expected_towards)}, but got {measured_towards}"
+
+    cocotb.log.info("Test passed: Replayed frame matches the model's velocity.")
+
+
+@cocotb.test()
+async def test_velocity_tone_sweep(dut):
+    """Sweeps tones and amplitudes through the Doppler chain, one frame per reset, at one sample per clock."""
+    await start_clock(dut.clk_in)
+    await FallingEdge(dut.clk_in)
+
+    sweep = tone_sweep_vectors(sweep_frames(24))
+    num_frames = len(sweep["waveforms"])
+    measured = {"velocity_result": np.zeros(num_frames, dtype=np.int64),
+                "towards_observer": np.zeros(num_frames, dtype=np.int64)}
+    start, sim_start = time.perf_counter(), gst("ns")
+    for frame, waveform in enumerate(sweep["waveforms"]):
+        # the FFT stops after one peak, so every frame starts from a reset
+        dut.receiver_data_valid_in.value = 0
+        await reset(dut.clk_in, dut.rst_in)
+        await stream(dut.clk_in, dut.receiver_data_valid_in, dut.receiver_data, (waveform & 0xFFFF).tolist())
+        assert await wait_high(dut.doppler_ready, dut.clk_in, 10000), f"Frame {frame}: no doppler_ready"
+        measured["velocity_result"][frame] = dut.velocity_result.value
+        measured["towards_observer"][frame] = dut.stored_towards_observer.value
+    elapsed = time.perf_counter() - start
+
+    coverage.FFT_PEAK.sample(bin=coverage.peak_bin(sweep["peak_frequency"]))
+    check_vectors({name: sweep[name] for name in measured}, measured,
+                  {"frequency": sweep["frequency"], "amplitude": sweep["amplitude"],
+                   "peak_frequency": sweep["peak_frequency"]})
+    cocotb.log.info(f"Tone sweep passed: {num_frames} frames in {elapsed:.1f} s ({num_frames / elapsed:.2f} frames/s, "
+                    f"{(gst('ns') - sim_start) / num_frames / 1e3:.0f} us simulated per frame).")
+
+
 def runner():
     """Simulate the transmit_beamformer module using the Python runner."""
     hdl_toplevel_lang = os.getenv("HDL_TOPLEVEL_LANG", "verilog")
@@ -108,7 +197,8 @@ def runner():
     sources = [
         proj_path / "hdl" / "velocity.sv",
         proj_path / "hdl" / "divider.sv",
-        proj_path / "hdl" / "fft_wrapper.sv"
+        proj_path / "hdl" / "fft_wrapper.sv",
+        proj_path / "hdl" / "goertzel_bank.sv"
     ]
     
     sources += list((proj_path / "hdl" / "fft-core").glob("*.v"))
@@ -125,6 +215,9 @@ def runner():
     # Get the appropriate runner based on the chosen simulator
     runner = get_runner(sim)
 
+    # The simulator toggles clk_in itself; tests only check it (sonic_sight.hdl_clock)
+    sources, build_test_args = add_clock(runner, sources, build_test_args, "velocity")
+
     # Build step to compile the design with overridden parameters
     runner.build(
         sources=sources,
@@ -133,18 +226,47 @@ def runner():
         build_args=build_test_args,
         parameters=parameters,  # Pass parameter overrides here
         timescale=('1ns', '1ps'),  # Timescale settings (1ns time unit, 1ps precision)
-        waves=True  # Generate waveform files for debugging
+        waves=WAVES  # Full dumps only with WAVES=1
     )
 
     # Run the test(s)
     run_test_args = []  # Specify any additional test arguments if needed
-    runner.test(
+    results = runner.test(
         hdl_toplevel="velocity",  # Top level HDL module
         test_module="test_velocity",  # Python test module containing test(s)
         test_args=run_test_args,
-        waves=True  # Enable waveform dumping
+        waves=WAVES  # Failed tests are rerun with waves below
     )
+    rerun_failures(runner, results, sources, "velocity", "test_velocity", build_args=build_test_args,
+                   parameters=parameters, test_args=run_test_args)
+
 
+    # The Goertzel Doppler engine at top_level's sample spacing; the other tests strobe
+    # faster than its NUM_BINS + 1 clocks per sample
+    testcase = os.getenv("TESTCASE")
+    goertzel_tests = [test for test in ["test_velocity_top_level_rate"] if not testcase or test in testcase.split(",")]
+    if goertzel_tests:
+        goertzel_parameters = {"USE_GOERTZEL": 1}
+        runner.build(
+            sources=sources,
+            hdl_toplevel="velocity",
+            always=True,
+            build_args=build_test_args,
+            parameters=goertzel_parameters,
+            timescale=('1ns', '1ps'),
+            build_dir="sim_build_goertzel",
+            waves=WAVES
+        )
+        results = runner.test(
+            hdl_toplevel="velocity",
+            test_module="test_velocity",
+            testcase=goertzel_tests,
+            test_args=run_test_args,
+            build_dir="sim_build_goertzel",
+            waves=WAVES
+        )
+        rerun_failures(runner, results, sources, "velocity", "test_velocity", build_args=build_test_args,
+                       parameters=goertzel_parameters, test_args=run_test_args, build_dir="sim_build_goertzel")
 
 if __name__ == "__main__":
     runner()